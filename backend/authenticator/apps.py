@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AuthenticatorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authenticator'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .perf import install_query_timer
+
+        # ✅ Bill query time to the current request (PerfMiddleware)
+        connection_created.connect(install_query_timer, dispatch_uid="perf_query_timer")
@@ -0,0 +1,86 @@
+import asyncio
+import contextlib
+import threading
+import time
+import weakref
+
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from .perf import record_cache_call
+
+# Connections of a redis.asyncio client are bound to the event loop that opened
+# them. Daphne runs one long-lived loop on the main thread (consumers, outbox
+# relay, timer loops): its client is opened once and cached per (loop, URL).
+# Async views under a sync server or the test client run in a throwaway
+# asyncio.run() loop on a worker thread; they get a client for the duration of
+# the call that is closed on exit, so no pool outlives its loop.
+_clients = weakref.WeakKeyDictionary()
+
+
+def _connect(url):
+    return aioredis.Redis.from_url(url)
+
+
+@contextlib.asynccontextmanager
+async def connection():
+    """
+    Raw redis.asyncio client on the cache's Redis DB (same keys as
+    get_redis_connection("default")):
+
+        async with async_redis.connection() as redis:
+            await redis.get(key)
+    """
+    url = settings.CACHES["default"]["LOCATION"]
+    if threading.current_thread() is not threading.main_thread():
+        async with _connect(url) as redis:
+            yield redis
+        return
+
+    per_loop = _clients.setdefault(asyncio.get_running_loop(), {})
+    if url not in per_loop:
+        per_loop[url] = _connect(url)
+    yield per_loop[url]
+
+
+async def _timed(op, awaitable):
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        record_cache_call(op, (time.perf_counter() - started) * 1000)
+
+
+class AsyncCache:
+    """
+    Native async counterpart of `django.core.cache.cache` for async views.
+
+    Keys and values go through the django-redis client's make_key() and
+    encode()/decode(), so both sides read each other's writes (the timer loop
+    and the sync views keep using `cache`). Calls are timed like
+    InstrumentedRedisCache's.
+    """
+
+    @staticmethod
+    async def get(key, default=None):
+        async with connection() as redis:
+            value = await _timed("get", redis.get(cache.client.make_key(key)))
+        return default if value is None else cache.client.decode(value)
+
+    @staticmethod
+    async def set(key, value, timeout=DEFAULT_TIMEOUT):
+        """Same timeout semantics as cache.set(): default TIMEOUT, None = forever, <= 0 = delete."""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = cache.default_timeout
+        key = cache.client.make_key(key)
+        async with connection() as redis:
+            if timeout is not None and timeout <= 0:
+                await _timed("delete", redis.delete(key))
+                return
+            px = None if timeout is None else int(timeout * 1000)
+            await _timed("set", redis.set(key, cache.client.encode(value), px=px))
+
+
+async_cache = AsyncCache()
@@ -1,46 +1,79 @@
 import asyncio
 import json
-import psutil
+import logging
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.utils.timezone import now
 from django.core.cache import cache
 from asgiref.sync import sync_to_async
+from . import join_tickets, org_feed
+from .log import bind_request_id
 from .meeting_timer import ensure_timer_loop
+from .org_access import user_in_org, user_shares_meeting
+from .outbox import relay as outbox_relay
+from .perf import InstrumentedConsumerMixin, recorder
+from .profiling import StackSampler, tracemalloc_session, write_profile
 import time
 
-def log_memory_usage(tag=""):
-    process = psutil.Process()
-    mem_mb = process.memory_info().rss / 1024 / 1024
-    print(f"[MEMORY] {tag} — RSS Memory: {mem_mb:.2f} MB")
+logger = logging.getLogger(__name__)
 
 
-import asyncio
-import json
-from asgiref.sync import sync_to_async
-from channels.generic.websocket import AsyncWebsocketConsumer
-from django.core.cache import cache
-from django.utils.timezone import now
-import psutil
+def _is_instructor(user, org_id, room_name):
+    if user_in_org(user, org_id):
+        return True
+    return room_name is not None and user_shares_meeting(user, org_id, room_name)
 
 
-def log_memory_usage(tag=""):
-    process = psutil.Process()
-    mem_mb = process.memory_info().rss / 1024 / 1024
-    print(f"[MEMORY] {tag} — RSS Memory: {mem_mb:.2f} MB")
+async def connection_role(scope, consumer, org_id, room_name=None):
+    """
+    Who is connecting: a join ticket for this org/room (checked in-process by
+    JoinTicketMiddleware) gives its role; otherwise only instructors get in,
+    i.e. session users who own or belong to the org, or (with room_name) whom
+    the meeting is shared with — same rule as check_meeting_access.
+    None = reject. Without room_name (org feed) tickets don't count.
+    """
+    claims = scope.get("join_ticket")
+    if room_name is not None and join_tickets.grants(claims, org_id, room_name):
+        recorder.inc("ws_auth_total", consumer=consumer, method="ticket", outcome="ok")
+        return claims["role"]
+
+    user = scope.get("user")
+    if user is not None and user.is_authenticated and await sync_to_async(_is_instructor)(user, org_id, room_name):
+        recorder.inc("ws_auth_total", consumer=consumer, method="session", outcome="ok")
+        return join_tickets.ROLE_INSTRUCTOR
 
-class MeetingSyncConsumer(AsyncWebsocketConsumer):
+    recorder.inc("ws_auth_total", consumer=consumer, method="ticket" if claims else "session", outcome="denied")
+    return None
+
+
+class MeetingSyncConsumer(InstrumentedConsumerMixin, AsyncWebsocketConsumer):
     """
     WebSocket consumer that ensures a persistent video timer loop
     per group (meeting). The loop lives independently of connections
     and runs until the meeting is explicitly deleted.
+
+    Participants connect with the signed ticket join_room issued
+    (?ticket=...); instructors with their session. Anyone else is closed
+    with 4403.
     """
 
+    role = None
+
     async def connect(self):
         self.org_id = self.scope["url_route"]["kwargs"]["org_id"]
         self.room_name = self.scope["url_route"]["kwargs"]["room_name"]
+        self.role = await connection_role(self.scope, "meeting", self.org_id, self.room_name)
+        if self.role is None:
+            logger.info("⛔ Rejected meeting socket for %s/%s (no ticket / not an instructor)", self.org_id, self.room_name)
+            await self.close(code=4403)
+            return
+
         self.room_group_name = f"meeting_{self.org_id}_{self.room_name}"
+        self.perf_group = self.room_group_name
+        bind_request_id()  # ✅ one id per connection, for every log line of its handlers
+        outbox_relay.ensure_running()  # ✅ view broadcasts reach this process's groups through the relay
 
-        print(f"[MeetingSync] 🔗 Connected to {self.room_group_name}")
+        logger.debug("[MeetingSync] 🔗 Connected to %s", self.room_group_name)
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
 
@@ -52,11 +85,13 @@ class MeetingSyncConsumer(AsyncWebsocketConsumer):
             self.room_group_name, self.org_id, self.room_name, self.channel_layer
         )
 
-        print(f"✅ Persistent loop ensured for {self.room_group_name}")
+        logger.debug("✅ Persistent loop ensured for %s", self.room_group_name)
 
     async def disconnect(self, close_code):
         """Client disconnects — does NOT stop the loop."""
-        print(f"🔌 Client {self.channel_name} left {self.room_group_name}")
+        if self.role is None:
+            return
+        logger.debug("🔌 Client %s left %s", self.channel_name, self.room_group_name)
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
 
     async def ensure_meeting_and_video_state(self):
@@ -64,7 +99,7 @@ class MeetingSyncConsumer(AsyncWebsocketConsumer):
         cache_key = f"active_meeting:{self.org_id}:{self.room_name}"
         meeting_state = await sync_to_async(cache.get)(cache_key)
         if not isinstance(meeting_state, dict):
-            print(f"⚠️ No active meeting found, creating one: {cache_key}")
+            logger.info("⚠️ No active meeting found, creating one: %s", cache_key)
             meeting_state = {
                 "org_id": int(self.org_id),
                 "room_name": str(self.room_name),
@@ -86,7 +121,7 @@ class MeetingSyncConsumer(AsyncWebsocketConsumer):
             "type": "initial_meeting_state",
             "state": {**meeting_state, **video_state},
         }))
-        print(f"✅ Sent initial state for {self.room_group_name}")
+        logger.debug("✅ Sent initial state for %s", self.room_group_name)
 
     # ======================================================
     # Message Handlers
@@ -102,31 +137,154 @@ class MeetingSyncConsumer(AsyncWebsocketConsumer):
             "type": "meeting_state_changed",
             "state": event["state"],
         }))
+
+    async def question_start(self, event):
+        """Pushed by the timer when playback enters a question segment."""
+        await self.send(text_data=json.dumps(event))
+
+    async def question_end(self, event):
+        """Pushed by the timer when playback leaves a question segment."""
+        await self.send(text_data=json.dumps(event))
+
+    async def bot_answer(self, event):
+        """Pushed by the timer when playback crosses a bot's answer_time."""
+        await self.send(text_data=json.dumps(event))
         
-class OrganizationUpdateConsumer(AsyncWebsocketConsumer):
+class OrganizationUpdateConsumer(InstrumentedConsumerMixin, AsyncWebsocketConsumer):
+    """
+    Org change feed. Every org_update carries the event's `seq`; a client that
+    reconnects with `?since=<last seq it saw>` first gets the events it missed
+    (from the org_feed stream), then live ones. The replay ends with
+    {"type": "org_feed_state", "seq": head, "resync": bool}; resync=True means
+    the gap could not be replayed and the client has to refetch its lists.
+    """
+
     async def connect(self):
         self.org_id = self.scope["url_route"]["kwargs"]["org_id"]
-        self.group_name = f"org_{self.org_id}_updates"
+        self.group_name = None
+        if await connection_role(self.scope, "org", self.org_id) is None:
+            await self.close(code=4403)
+            return
+
+        self.group_name = org_feed.group_name(self.org_id)
+        self.perf_group = self.group_name
+        self.last_seq = 0
+        bind_request_id()
+        outbox_relay.ensure_running()
 
-        print(f"[OrgConsumer] 🔗 {self.channel_name} joined {self.group_name}")
+        logger.debug("[OrgConsumer] 🔗 %s joined %s", self.channel_name, self.group_name)
+        # ✅ Join before reading the feed: live events queue up behind connect() and are deduped by seq
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        await self.replay_missed(self.parse_since())
+
+    def parse_since(self):
+        params = parse_qs(self.scope.get("query_string", b"").decode())
+        try:
+            return int(params["since"][0])
+        except (KeyError, ValueError):
+            return None
+
+    async def replay_missed(self, since):
+        try:
+            events, head, complete = await org_feed.replay(self.org_id, since)
+        except Exception as e:
+            logger.warning("⚠️ Org feed replay failed for org %s: %s", self.org_id, e)
+            events, head, complete = [], 0, since is None
+
+        for event in events:
+            await self.send(text_data=json.dumps(event))
+        if since is not None and complete:
+            self.last_seq = head  # last seq replayed (or since): later ones still come live
+        await self.send(text_data=json.dumps({"type": "org_feed_state", "seq": head, "resync": not complete}))
+        if events:
+            logger.debug("[OrgConsumer] ⏩ Replayed %s events since %s to %s", len(events), since, self.channel_name)
 
     async def disconnect(self, close_code):
-        print(f"[OrgConsumer] 🔌 {self.channel_name} leaving {self.group_name}")
+        if self.group_name is None:
+            return
+        logger.debug("[OrgConsumer] 🔌 %s leaving %s", self.channel_name, self.group_name)
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
     async def receive(self, text_data):
         try:
             msg = json.loads(text_data)
-            print(f"[OrgConsumer] Message from client: {msg}")
+            logger.debug("[OrgConsumer] Message from client: %s", msg)
         except json.JSONDecodeError:
-            print("❌ Invalid JSON from client")
+            logger.warning("❌ Invalid JSON from client")
 
     async def org_update(self, event):
+        seq = event.get("seq")
+        if seq is not None and seq <= self.last_seq:
+            return  # already sent by the replay
         await self.send(text_data=json.dumps({
             "type": "org_update",
+            "seq": seq,
             "category": event.get("category", "general"),
             "action": event.get("action", "update"),
             "payload": event.get("payload", {}),
+            "data": event.get("data"),
         }))
+
+
+class ProfilingConsumer(AsyncWebsocketConsumer):
+    """
+    Staff-only profiling console for the daphne process (timer loops and
+    consumers live here, not in gunicorn). Send JSON commands:
+
+        {"action": "tracemalloc_start", "frames": 25}
+        {"action": "tracemalloc_snapshot", "limit": 25}   → top sites + growth since the last snapshot
+        {"action": "tracemalloc_stop"}
+        {"action": "cpu", "seconds": 10}                  → samples the event loop thread
+
+    Every result is also written to PROFILE_DIR (see /auth/profiles/).
+    """
+
+    MAX_CPU_SECONDS = 60
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if not (user and user.is_authenticated and user.is_staff):
+            await self.close(code=4403)
+            return
+        bind_request_id()
+        logger.warning("🧪 Profiling console opened by user %s", user.pk)
+        await self.accept()
+
+    async def receive(self, text_data):
+        try:
+            msg = json.loads(text_data)
+        except json.JSONDecodeError:
+            await self.send(text_data=json.dumps({"error": "Invalid JSON"}))
+            return
+
+        action = msg.get("action")
+        try:
+            if action == "tracemalloc_start":
+                tracemalloc_session.start(int(msg.get("frames", 25)))
+                result = {"tracing": True}
+            elif action == "tracemalloc_snapshot":
+                result = await sync_to_async(tracemalloc_session.snapshot, thread_sensitive=False)(
+                    limit=int(msg.get("limit", 25))
+                )
+            elif action == "tracemalloc_stop":
+                tracemalloc_session.stop()
+                result = {"tracing": False}
+            elif action == "cpu":
+                result = await self.profile_cpu(min(float(msg.get("seconds", 10)), self.MAX_CPU_SECONDS))
+            else:
+                result = {"error": f"Unknown action: {action}"}
+        except Exception as e:
+            logger.exception("❌ Profiling command failed: %s", e)
+            result = {"error": str(e)}
+
+        await self.send(text_data=json.dumps({"action": action, **result}))
+
+    async def profile_cpu(self, seconds):
+        sampler = StackSampler().start()  # this (event loop) thread
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            sampler.stop()
+        name = write_profile("cpu", "daphne-loop", sampler.collapsed(), ".folded")
+        return {"file": name, "samples": sampler.samples}
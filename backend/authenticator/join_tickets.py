@@ -0,0 +1,64 @@
+import time
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from django.conf import settings
+from django.core import signing
+
+ROLE_PARTICIPANT = "participant"
+ROLE_INSTRUCTOR = "instructor"
+
+MAX_AGE = getattr(settings, "JOIN_TICKET_MAX_AGE", 4 * 60 * 60)
+_SALT = "authenticator.join_ticket"
+
+
+# ======================================================
+# Tickets
+# ======================================================
+def issue(participant_id, org_id, room_name, role=ROLE_PARTICIPANT, max_age=None):
+    """
+    Signed (HMAC-SHA256 over SECRET_KEY) ticket for /ws/meeting/<org>/<room>/.
+    Returns (ticket, expires_at epoch seconds).
+    """
+    expires_at = int(time.time()) + (MAX_AGE if max_age is None else max_age)
+    claims = {"pid": str(participant_id), "org": int(org_id), "room": str(room_name), "role": role, "exp": expires_at}
+    return signing.dumps(claims, salt=_SALT, compress=False), expires_at
+
+
+def verify(ticket):
+    """Claims of a valid, unexpired ticket, else None. No DB or cache access."""
+    try:
+        claims = signing.loads(ticket, salt=_SALT)
+    except signing.BadSignature:
+        return None
+    if not isinstance(claims, dict) or claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def grants(claims, org_id, room_name):
+    return bool(claims) and claims["org"] == int(org_id) and claims["room"] == str(room_name)
+
+
+# ======================================================
+# ASGI middleware (websocket routes)
+# ======================================================
+class JoinTicketMiddleware:
+    """
+    Verifies `?ticket=` in-process and hands the claims to the consumer as
+    scope["join_ticket"], skipping the session and user lookups. Connections
+    without a valid ticket (instructors, staff) go through the regular
+    session AuthMiddlewareStack with scope["join_ticket"] = None; the
+    consumers decide who gets in.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.session_auth = AuthMiddlewareStack(inner)
+
+    async def __call__(self, scope, receive, send):
+        params = parse_qs(scope.get("query_string", b"").decode())
+        claims = verify(params["ticket"][0]) if params.get("ticket") else None
+        if claims:
+            return await self.inner(dict(scope, join_ticket=claims), receive, send)
+        return await self.session_auth(dict(scope, join_ticket=None), receive, send)
@@ -0,0 +1,157 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+import orjson
+
+# Correlates every log line of one HTTP request / websocket connection / timer loop
+request_id_var = ContextVar("request_id", default="-")
+
+# LogRecord attributes that aren't user-supplied `extra=` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+def new_request_id():
+    return uuid.uuid4().hex[:16]
+
+
+def bind_request_id(request_id=None):
+    """Set the request id for the current context (task/thread). Returns the token for reset()."""
+    return request_id_var.set(request_id or new_request_id())
+
+
+# ======================================================
+# Filters / formatters (referenced from settings.LOGGING)
+# ======================================================
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+def _extra_fields(record):
+    return {key: value for key, value in vars(record).items() if key not in _RESERVED and not key.startswith("_")}
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local runs; `extra=` fields are appended as key=value."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record):
+        line = super().format(record)
+        extra = _extra_fields(record)
+        if extra:
+            line += " " + " ".join(f"{key}={value}" for key, value in extra.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, request_id, msg, any `extra=` fields, exc."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class BackgroundStreamHandler(logging.handlers.QueueHandler):
+    """
+    Formats on the calling thread and hands the line to a listener thread
+    that writes it to stdout, so a slow stdout never blocks daphne's event
+    loop or a gunicorn worker. The queue is bounded: when it is full, records
+    are dropped (and counted) instead of growing memory.
+    """
+
+    def __init__(self, maxsize=10000, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        self.stream = stream
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_listener(self):
+        # Started lazily (and again after a fork) — threads don't survive fork()
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            target = logging.StreamHandler(self.stream or sys.stdout)
+            self._listener = logging.handlers.QueueListener(self.queue, target)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self._listener.stop)
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# ======================================================
+# Hot-path helpers
+# ======================================================
+class RateLimitedLogger:
+    """
+    At most one record per `interval` seconds per key (e.g. per room). The
+    next record that gets through carries `suppressed=<n>` for the ones
+    dropped in between. Costs one isEnabledFor() check when the level is off.
+    """
+
+    def __init__(self, logger, interval):
+        self.logger = logger
+        self.interval = interval
+        self._last = {}  # key → (monotonic time of last emit, suppressed count)
+        self._lock = threading.Lock()
+
+    def log(self, level, key, msg, *args):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            last, suppressed = self._last.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self._last[key] = (last, suppressed + 1)
+                return
+            self._last[key] = (now, 0)
+        self.logger.log(level, msg, *args, extra={"suppressed": suppressed} if suppressed else None)
+
+    def forget(self, key):
+        with self._lock:
+            self._last.pop(key, None)
+
+    def debug(self, key, msg, *args):
+        self.log(logging.DEBUG, key, msg, *args)
+
+    def info(self, key, msg, *args):
+        self.log(logging.INFO, key, msg, *args)
+
+    def warning(self, key, msg, *args):
+        self.log(logging.WARNING, key, msg, *args)
+
+
+def sampled(rate):
+    """True for roughly `rate` (0..1) of calls — gate for per-message debug logs."""
+    return rate >= 1 or random.random() < rate
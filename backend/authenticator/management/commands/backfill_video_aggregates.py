@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from authenticator.models import Video
+from authenticator.utils.video_aggregates import VideoAggregates
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Video.total_length / segment_count / question_count from segments "
+        "and roll them up into Meeting.video_length_sec / questions_count."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, help="Only this organization's videos.")
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only videos that have never been aggregated (segment_count = 0). Cheap enough to run on every deploy.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        videos = Video.objects.all()
+        if options["org"]:
+            videos = videos.filter(organization_id=options["org"])
+        if options["missing"]:
+            videos = videos.filter(segment_count=0)
+
+        count = VideoAggregates.backfill(videos, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Recomputed aggregates for {count} video(s)"))
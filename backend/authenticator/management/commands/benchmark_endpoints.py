@@ -0,0 +1,463 @@
+import contextlib
+import gc
+import json
+import logging
+import random
+import subprocess
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils.timezone import now
+from django_redis import get_redis_connection
+
+from authenticator.models import (
+    Bot,
+    Meeting,
+    Organization,
+    Participant,
+    ParticipantAnswer,
+    ParticipantResponse,
+    QuestionCard,
+    Survey,
+    Video,
+    VideoSegment,
+)
+from authenticator.utils.video_aggregates import VideoAggregates
+
+BENCH_ORG = "bench-org"
+BENCH_ROOM = "bench-room"
+
+# Per endpoint: max SQL queries on a cold call (empty cache) and max warm p95 latency.
+# Query counts are deterministic for a given dataset; latency budgets assume a dev
+# laptop and can be scaled with --latency-factor (or skipped with --no-latency).
+BUDGETS = {
+    "organizations":                  {"queries": 4, "p95_ms": 60},
+    "org meetings":                   {"queries": 5, "p95_ms": 60},
+    "org owner check":                {"queries": 3, "p95_ms": 40},
+    "user info":                      {"queries": 3, "p95_ms": 40},
+    "user stats":                     {"queries": 8, "p95_ms": 60},
+    # Unpaginated full listing: serializes every video and segment of the org
+    # (2,000 / 17,600 at --scale 1), so it grows with the dataset. Measured p95
+    # 860-1035ms; the summary page below is the bounded alternative.
+    "org videos":                     {"queries": 6, "p95_ms": 1500},
+    "org videos (summary page)":      {"queries": 4, "p95_ms": 80},
+    "meeting videos":                 {"queries": 7, "p95_ms": 150},
+    "video by id":                    {"queries": 7, "p95_ms": 60},
+    "video segments":                 {"queries": 5, "p95_ms": 60},
+    "question cards":                 {"queries": 5, "p95_ms": 400},
+    "question card by id":            {"queries": 3, "p95_ms": 40},
+    "question by id":                 {"queries": 2, "p95_ms": 40},
+    "surveys":                        {"queries": 5, "p95_ms": 60},
+    "survey by id":                   {"queries": 3, "p95_ms": 40},
+    "bots":                           {"queries": 5, "p95_ms": 60},
+    "bot by id":                      {"queries": 6, "p95_ms": 40},
+    "meeting id":                     {"queries": 4, "p95_ms": 40},
+    "meeting owner":                  {"queries": 3, "p95_ms": 40},
+    "meeting access":                 {"queries": 4, "p95_ms": 40},
+    "active meeting":                 {"queries": 0, "p95_ms": 40},
+    "active meeting with segments":   {"queries": 4, "p95_ms": 60},
+    "active bots video names":        {"queries": 2, "p95_ms": 40},
+    "bot answers":                    {"queries": 2, "p95_ms": 60},
+    "video state":                    {"queries": 0, "p95_ms": 40},
+    "meeting end state":              {"queries": 0, "p95_ms": 40},
+    "active survey id":               {"queries": 0, "p95_ms": 40},
+    "video question answers":         {"queries": 2, "p95_ms": 60},
+}
+
+
+def endpoints(ids):
+    """(label, path) for every list/detail endpoint, against the seeded benchmark org."""
+    org, room = ids["org"], BENCH_ROOM
+    return [
+        ("organizations", "/auth/organizations/"),
+        ("org meetings", f"/auth/get_org_meetings/{org}/"),
+        ("org owner check", f"/auth/organization/{org}/check-owner/"),
+        ("user info", "/auth/userinfo/"),
+        ("user stats", "/auth/get_user_stats/"),
+        ("org videos", f"/auth/get_org_videos/{org}/"),
+        ("org videos (summary page)", f"/auth/get_org_videos/{org}/?fields=summary&limit=50"),
+        ("meeting videos", f"/auth/get_user_videos/{org}/{room}/"),
+        ("video by id", f"/auth/get_video_by_id/{ids['video']}/"),
+        ("video segments", f"/auth/get_video_segments/{ids['video']}/"),
+        ("question cards", f"/auth/get_all_question_cards/{org}/"),
+        ("question card by id", f"/auth/get_question_card_by_id/{ids['card']}/"),
+        ("question by id", f"/auth/get_question_by_id/{ids['card']}/"),
+        ("surveys", f"/auth/get_all_surveys/{org}/"),
+        ("survey by id", f"/auth/get_survey_by_id/{ids['survey']}/"),
+        ("bots", f"/auth/get_all_bots/{org}/"),
+        ("bot by id", f"/auth/get_bot_by_id/{ids['bot']}/"),
+        ("meeting id", f"/auth/get_meeting_id/{org}/{room}/"),
+        ("meeting owner", f"/auth/get_meeting_owner/{org}/{room}/"),
+        ("meeting access", f"/auth/check_access/{org}/{room}/"),
+        ("active meeting", f"/auth/get_active_meeting/{org}/{room}/"),
+        ("active meeting with segments", f"/auth/get_active_meeting_with_segments/{org}/{room}/"),
+        ("active bots video names", f"/auth/get_active_bots_video_name/{org}/{room}/"),
+        ("bot answers", f"/auth/get_bot_answers/{org}/{room}/"),
+        ("video state", f"/auth/get_video_state/{org}/{room}/"),
+        ("meeting end state", f"/auth/get_meeting_state/{org}/{room}/"),
+        ("active survey id", f"/auth/get_active_survey_id/{org}/{room}/"),
+        ("video question answers", f"/auth/get_all_video_question_answers/{org}/{room}/"),
+    ]
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def isolated_caches(db):
+    """Point the default cache (and raw django-redis clients) at a Redis DB of its own."""
+    caches = {alias: dict(conf) for alias, conf in settings.CACHES.items()}
+    location = caches["default"].get("LOCATION", "")
+    if isinstance(location, str) and location.startswith(("redis://", "rediss://")):
+        base, _, _ = location.rpartition("/")
+        caches["default"]["LOCATION"] = f"{base}/{db}"
+    return caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a realistic dataset into a throwaway test database, call every list/detail "
+        "endpoint through the test client (one cold call + --repeat warm calls), record "
+        "query counts and latency percentiles, and fail if a budget is exceeded. "
+        "The cache runs on its own Redis DB (--cache-db), which is flushed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0,
+                            help="Dataset multiplier (1.0 ≈ 2,000 videos / 16,000 segments in the main org).")
+        parser.add_argument("--repeat", type=int, default=20, help="Warm calls per endpoint (default 20).")
+        parser.add_argument("--only", action="append", default=[], help="Only endpoints whose label contains this.")
+        parser.add_argument("--cache-db", type=int, default=15, help="Redis DB used (and flushed) for the run.")
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the test database and its seeded data.")
+        parser.add_argument("--latency-factor", type=float, default=1.0, help="Multiply latency budgets.")
+        parser.add_argument("--no-latency", action="store_true", help="Only enforce query budgets.")
+        parser.add_argument("--output", help="Write results as JSON (for comparing commits).")
+        parser.add_argument("--compare", help="Previous --output file to diff against.")
+        parser.add_argument("--verbose", action="store_true", help="Keep the views' own logging.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"])
+        try:
+            with override_settings(CACHES=isolated_caches(options["cache_db"])):
+                get_redis_connection("default").flushdb()
+                ids = self.seed(options["scale"])
+                results = self.run(ids, options)
+                get_redis_connection("default").flushdb()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        failures = self.report(results, options)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump({
+                    "commit": git_commit(),
+                    "scale": options["scale"],
+                    "repeat": options["repeat"],
+                    "vendor": connection.vendor,
+                    "results": results,
+                }, f, indent=2)
+            self.stdout.write(f"📝 Wrote {options['output']}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoint(s) over budget: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("✓ All endpoints within budget"))
+
+    # ======================================================
+    # Dataset
+    # ======================================================
+    def seed(self, scale):
+        existing = Organization.objects.filter(name=BENCH_ORG).first()
+        if existing:
+            self.stdout.write("♻️ Reusing seeded benchmark data")
+            return self.bench_ids(existing)
+
+        rng = random.Random(42)
+        started = time.perf_counter()
+        User = get_user_model()
+
+        owner = User.objects.create_user(username="bench-owner", email="owner@bench.local", password=None)
+        members = [
+            User.objects.create_user(username=f"bench-member-{i}", email=f"member{i}@bench.local", password=None)
+            for i in range(20)
+        ]
+        org = Organization.objects.create(owner=owner, name=BENCH_ORG)
+        org.members.add(owner, *members)
+        other = Organization.objects.create(owner=members[0], name="bench-other-org")
+        other.members.add(members[0])
+
+        meetings = Meeting.objects.bulk_create([
+            Meeting(
+                organization=org, owner=owner, name=BENCH_ROOM if i == 0 else f"bench-meeting-{i}",
+                image_url="", description="", questions_count=0, video_length_sec=0, tags=["bench"],
+                shared_with=[f"member{j}@bench.local" for j in range(i % 5)],
+            )
+            for i in range(max(1, int(40 * scale)))
+        ])
+        meetings = list(Meeting.objects.filter(organization=org).order_by("id"))
+
+        cards = QuestionCard.objects.bulk_create([
+            QuestionCard(
+                user=owner, organization=org, meeting=rng.choice(meetings), question=f"Question {i}?",
+                answers=["A", "B", "C", "D"], difficulty=rng.choice(["easy", "medium", "hard"]), type="mc",
+                correct_answers=[rng.choice("ABCD")],
+            )
+            for i in range(max(20, int(1000 * scale)))
+        ])
+        cards = list(QuestionCard.objects.filter(organization=org).order_by("id"))
+
+        videos = []
+        for org_obj, count in ((org, int(2000 * scale)), (other, int(200 * scale))):
+            videos += [
+                Video(
+                    organization=org_obj, meeting=meetings[i % len(meetings)] if org_obj == org else None,
+                    url=f"videos/bench-{org_obj.id}-{i}.mp4", name=f"Video {i}", tags=["bench"],
+                )
+                for i in range(max(1, count))
+            ]
+        Video.objects.bulk_create(videos, batch_size=1000)
+        videos = list(Video.objects.filter(organization=org).order_by("id"))
+
+        segments = []
+        for video in Video.objects.all().only("id", "organization_id"):
+            for position in range(8):
+                card = rng.choice(cards) if position in (2, 5) and video.organization_id == org.id else None
+                segments.append(VideoSegment(
+                    video_id=video.id, source_start=position * 30.0, source_end=position * 30.0 + 30.0,
+                    question_card=card, position=position,
+                ))
+        VideoSegment.objects.bulk_create(segments, batch_size=2000)
+        VideoAggregates.backfill()
+
+        room = meetings[0]
+        room_video = next(v for v in videos if v.meeting_id == room.id)
+        room_cards = list(
+            VideoSegment.objects.filter(video=room_video, question_card__isnull=False)
+            .values_list("question_card_id", "source_start")
+        )
+        bots = Bot.objects.bulk_create([
+            Bot(
+                user=owner, organization=org, meeting=room, name=f"Bot {i}", memory="Average student.",
+                video_url=f"bots/bot-{i}.mp4",
+                answers=[
+                    {"question_id": card.id, "answers": [rng.choice("ABCD")], "answer_time": 5.0}
+                    for card in cards[:20]
+                ] + [
+                    {"question_id": card_id, "answers": ["A"], "answer_time": start + 5}
+                    for card_id, start in room_cards
+                ],
+            )
+            for i in range(12)
+        ])
+        bots = list(Bot.objects.filter(organization=org).order_by("id"))
+
+        surveys = Survey.objects.bulk_create([
+            Survey(user=owner, organization=org, meeting=room, items=[{"question": f"Item {j}"} for j in range(10)])
+            for _ in range(max(3, int(20 * scale)))
+        ])
+
+        Participant.objects.bulk_create([
+            Participant(meeting=meetings[i % len(meetings)], name=f"P{i}", email=f"p{i}@bench.local")
+            for i in range(max(10, int(400 * scale)))
+        ])
+
+        responses = ParticipantResponse.objects.bulk_create([
+            ParticipantResponse(
+                meeting=room, name=f"Student {i}", participant_id=str(uuid.UUID(int=rng.getrandbits(128))),
+                answers={
+                    str(card.id): {"answers": {"answers": [rng.choice("ABCD")]}, "timestamp": now().isoformat()}
+                    for card in cards[:20]
+                },
+            )
+            for i in range(max(10, int(300 * scale)))
+        ])
+        responses = list(ParticipantResponse.objects.filter(meeting=room))
+        ParticipantAnswer.objects.bulk_create([
+            ParticipantAnswer(
+                meeting=room, participant=response, question_card=card, question_key=str(card.id),
+                answer={"answers": [rng.choice("ABCD")]}, answered_at=now(), is_correct=rng.random() < 0.6,
+            )
+            for response in responses
+            for card in cards[:20]
+        ], batch_size=2000)
+
+        self.stdout.write(
+            f"🌱 Seeded {len(videos):,} videos, {len(segments):,} segments, {len(cards):,} cards, "
+            f"{len(bots)} bots, {len(surveys)} surveys, {len(responses)} participants "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        return self.bench_ids(org)
+
+    def bench_ids(self, org):
+        owner = org.owner
+        room = Meeting.objects.get(organization=org, name=BENCH_ROOM)
+        room_video = Video.objects.filter(meeting=room).order_by("id").first()
+        bot_ids = list(Bot.objects.filter(organization=org).order_by("id").values_list("id", flat=True))
+        room_cards = list(
+            VideoSegment.objects.filter(video=room_video, question_card__isnull=False)
+            .values_list("question_card_id", flat=True)
+        )
+        return {
+            "owner": owner.id,
+            "org": org.id,
+            "room_video": room_video.id,
+            "video": Video.objects.filter(organization=org).order_by("-id").values_list("id", flat=True).first(),
+            "card": QuestionCard.objects.filter(organization=org).values_list("id", flat=True).first(),
+            "survey": Survey.objects.filter(organization=org).values_list("id", flat=True).first(),
+            "bot": bot_ids[0],
+            "bot_ids": bot_ids,
+            "room_cards": room_cards,
+            "participants": list(
+                ParticipantResponse.objects.filter(meeting=room).order_by("id")
+                .values_list("participant_id", flat=True)[:100]
+            ),
+        }
+
+    def prime_room(self, ids):
+        """Live-room state the meeting endpoints read from the cache."""
+        cache.set(f"active_meeting:{ids['org']}:{BENCH_ROOM}", {
+            "org_id": ids["org"],
+            "room_name": BENCH_ROOM,
+            "active_bot_ids": ids["bot_ids"],
+            "active_video_id": ids["room_video"],
+            "active_survey_id": ids["survey"],
+            "last_updated": now().isoformat(),
+        }, timeout=None)
+        cache.set(f"video_state:{ids['org']}:{BENCH_ROOM}", {"stopped": True, "current_time": 0.0}, timeout=None)
+        cache.set_many({
+            f"video_question:{ids['org']}:{BENCH_ROOM}:{participant_id}:{question_id}:answers": [
+                {"timestamp": now().isoformat(), "answers": {"answers": ["A"]}}
+            ]
+            for participant_id in ids["participants"]
+            for question_id in ids["room_cards"]
+        }, timeout=None)
+
+    # ======================================================
+    # Run
+    # ======================================================
+    def run(self, ids, options):
+        client = Client()
+        client.force_login(get_user_model().objects.get(id=ids["owner"]))
+        session_cookie = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+        selected = [
+            (label, path) for label, path in endpoints(ids)
+            if not options["only"] or any(o.lower() in label.lower() for o in options["only"])
+        ]
+        results = {}
+        for label, path in selected:
+            # ❄️ Cold: empty cache (only the session and live-room state are restored)
+            get_redis_connection("default").flushdb()
+            client.force_login(get_user_model().objects.get(id=ids["owner"]))
+            self.prime_room(ids)
+            cold_ms, cold_queries, status, size = self.call(client, path, options)
+
+            gc.collect()  # don't bill the previous endpoint's garbage to this one
+            warm_ms, warm_queries = [], 0
+            for _ in range(options["repeat"]):
+                ms, queries, _, _ = self.call(client, path, options)
+                warm_ms.append(ms)
+                warm_queries = max(warm_queries, queries)
+
+            results[label] = {
+                "path": path,
+                "status": status,
+                "bytes": size,
+                "cold_queries": cold_queries,
+                "warm_queries": warm_queries,
+                "cold_ms": round(cold_ms, 1),
+                "p50_ms": round(percentile(warm_ms, 50), 1) if warm_ms else None,
+                "p95_ms": round(percentile(warm_ms, 95), 1) if warm_ms else None,
+                "max_ms": round(max(warm_ms), 1) if warm_ms else None,
+            }
+        return results
+
+    def call(self, client, path, options):
+        with self.quiet(options), CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(path)
+            content = response.content
+            elapsed = (time.perf_counter() - started) * 1000
+        return elapsed, len(queries), response.status_code, len(content)
+
+    @contextlib.contextmanager
+    def quiet(self, options):
+        """Drop the app's INFO/DEBUG logging unless --verbose (warnings still show)."""
+        if options["verbose"]:
+            yield
+            return
+        logging.disable(logging.INFO)
+        try:
+            yield
+        finally:
+            logging.disable(logging.NOTSET)
+
+    # ======================================================
+    # Report
+    # ======================================================
+    def report(self, results, options):
+        previous = {}
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+            previous = baseline.get("results", {})
+            self.stdout.write(f"Comparing with {options['compare']} (commit {baseline.get('commit')})")
+
+        failures = []
+        self.stdout.write(f"{'endpoint':<30} {'st':>3} {'q cold':>6} {'q warm':>6} {'cold':>8} {'p50':>8} {'p95':>8}  budget")
+        for label, r in results.items():
+            budget = BUDGETS.get(label, {})
+            problems = []
+            if r["status"] != 200:
+                problems.append(f"status {r['status']}")
+            if "queries" in budget and r["cold_queries"] > budget["queries"]:
+                problems.append(f"{r['cold_queries']} queries > {budget['queries']}")
+            if not options["no_latency"] and "p95_ms" in budget and r["p95_ms"] is not None:
+                limit = budget["p95_ms"] * options["latency_factor"]
+                if r["p95_ms"] > limit:
+                    problems.append(f"p95 {r['p95_ms']}ms > {limit:.0f}ms")
+
+            line = (
+                f"{label:<30} {r['status']:>3} {r['cold_queries']:>6} {r['warm_queries']:>6} "
+                f"{r['cold_ms']:>6.1f}ms {r['p50_ms'] or 0:>6.1f}ms {r['p95_ms'] or 0:>6.1f}ms  "
+                f"≤{budget.get('queries', '-')}q ≤{budget.get('p95_ms', '-')}ms"
+            )
+            before = previous.get(label)
+            if before:
+                line += (
+                    f"  Δq {r['cold_queries'] - before['cold_queries']:+d}"
+                    f"  Δp50 {(r['p50_ms'] or 0) - (before.get('p50_ms') or 0):+.1f}ms"
+                )
+
+            if problems:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f"✗ {line}  ← {'; '.join(problems)}"))
+            else:
+                self.stdout.write(f"✓ {line}")
+        return failures
@@ -0,0 +1,82 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import RequestFactory
+
+from authenticator.models import QuestionCard, Video
+from authenticator.serializers import (
+    dumps,
+    serialize_question_card_detail,
+    serialize_video,
+)
+
+
+def stdlib_dumps(data):
+    """What JsonResponse writes today."""
+    return json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+class Command(BaseCommand):
+    help = (
+        "Encode the largest list payloads (org videos, question cards) with the stdlib "
+        "encoder and with orjson, check both decode to the same value, and report timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, help="Only use this organization's data.")
+        parser.add_argument("--repeat", type=int, default=50, help="Encodes per payload (default 50).")
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get("/")
+
+        videos = Video.objects.select_related("meeting").prefetch_related("segments__question_card")
+        cards = QuestionCard.objects.select_related("user")
+        if options["org"]:
+            videos = videos.filter(organization_id=options["org"])
+            cards = cards.filter(organization_id=options["org"])
+
+        payloads = {
+            "org videos": {
+                "videos": [
+                    serialize_video(request, v, individual=False, include_meeting_name=True)
+                    for v in videos.order_by("-created_at")
+                ],
+                "cached": False,
+            },
+            "question cards": {
+                "questions": [serialize_question_card_detail(q) for q in cards.order_by("-created_at")],
+            },
+        }
+
+        mismatches = []
+        for label, data in payloads.items():
+            old_bytes = stdlib_dumps(data)
+            new_bytes = dumps(data)
+
+            # Same decoded value *and* the same key order
+            old_value = json.loads(old_bytes)
+            new_value = json.loads(new_bytes)
+            if old_value != new_value or json.dumps(old_value) != json.dumps(new_value):
+                mismatches.append(label)
+
+            old_time = self._time(stdlib_dumps, data, options["repeat"])
+            new_time = self._time(dumps, data, options["repeat"])
+
+            self.stdout.write(
+                f"{label}: {len(old_bytes):,} B → {len(new_bytes):,} B | "
+                f"stdlib {old_time * 1e6:.0f} µs, orjson {new_time * 1e6:.0f} µs "
+                f"({old_time / new_time if new_time else 0:.1f}x)"
+            )
+
+        if mismatches:
+            raise CommandError(f"Decoded output differs for: {', '.join(mismatches)}")
+        self.stdout.write(self.style.SUCCESS("✓ orjson output decodes identically to JsonResponse output"))
+
+    @staticmethod
+    def _time(encode, data, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            encode(data)
+        return (time.perf_counter() - start) / max(repeat, 1)
@@ -0,0 +1,375 @@
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import time
+import uuid
+
+import psutil
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils.dateparse import parse_datetime
+
+from authenticator import join_tickets
+from authenticator.meeting_timer import stop_timer_loop
+from authenticator.models import Meeting, Organization, ParticipantResponse
+
+LAYERS = {
+    "memory": lambda url: {"BACKEND": "channels.layers.InMemoryChannelLayer", "CONFIG": {"capacity": 1000}},
+    "redis": lambda url: {"BACKEND": "channels_redis.core.RedisChannelLayer", "CONFIG": {"hosts": [url]}},
+}
+
+
+def percentiles(values, points=(50, 90, 99)):
+    if not values:
+        return {f"p{p}": None for p in points} | {"max": None}
+    ordered = sorted(values)
+    out = {f"p{p}": round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 1) for p in points}
+    out["max"] = round(ordered[-1], 1)
+    return out
+
+
+class WsClient:
+    """One simulated participant on /ws/meeting/<org>/<room>/, joining with a signed ticket."""
+
+    def __init__(self, application, org_id, room_name, stats, participant_id=None):
+        self.room_name = room_name
+        self.stats = stats
+        ticket, _ = join_tickets.issue(participant_id or uuid.uuid4().hex, org_id, room_name)
+        self.comm = ApplicationCommunicator(application, {
+            "type": "websocket",
+            "path": f"/ws/meeting/{org_id}/{room_name}/",
+            "raw_path": f"/ws/meeting/{org_id}/{room_name}/".encode(),
+            "query_string": f"ticket={ticket}".encode(),
+            "headers": [(b"host", b"localhost")],
+            "subprotocols": [],
+        })
+        self.reader = None
+
+    async def connect(self, timeout):
+        await self.comm.send_input({"type": "websocket.connect"})
+        message = await self.comm.receive_output(timeout)
+        if message["type"] != "websocket.accept":
+            raise RuntimeError(f"Connection rejected: {message}")
+        self.reader = asyncio.create_task(self.read())
+
+    async def read(self):
+        while True:
+            message = await self.comm.receive_output(timeout=3600)
+            if message["type"] == "websocket.close":
+                self.stats.closed += 1
+                return
+            if message["type"] == "websocket.send" and message.get("text"):
+                self.stats.record(self.room_name, json.loads(message["text"]), time.time())
+
+    async def close(self):
+        if self.reader:
+            self.reader.cancel()
+        with contextlib.suppress(Exception):
+            await self.comm.send_input({"type": "websocket.disconnect", "code": 1000})
+            await self.comm.wait(timeout=1)
+
+
+class Stats:
+    def __init__(self):
+        self.messages = {}            # type → count
+        self.latencies_ms = []        # receive time − state.last_updated
+        self.receipts = {}            # (room, message key) → [receive times]
+        self.http_ms = {}             # label → [ms]
+        self.http_errors = {}         # label → count
+        self.connect_ms = []
+        self.in_flight = set()        # answer submissions still running
+        self.connect_errors = 0
+        self.closed = 0
+        self.cpu = []
+        self.rss_mb = []
+
+    def record(self, room_name, data, received_at):
+        kind = data.get("type", "?")
+        self.messages[kind] = self.messages.get(kind, 0) + 1
+
+        if kind == "sync_update":
+            state = data.get("state") or {}
+            sent = parse_datetime(state.get("last_updated") or "")
+            if sent:
+                self.latencies_ms.append((received_at - sent.timestamp()) * 1000)
+            key = (kind, state.get("last_updated"), state.get("current_time"))
+        elif kind in ("question_start", "question_end", "bot_answer"):
+            key = (kind, data.get("segment_id") or data.get("bot_id"), data.get("position"))
+        else:
+            return
+        self.receipts.setdefault((room_name, key), []).append(received_at)
+
+    def http(self, label, ms, ok):
+        self.http_ms.setdefault(label, []).append(ms)
+        if not ok:
+            self.http_errors[label] = self.http_errors.get(label, 0) + 1
+
+    def drift_ms(self):
+        """Spread between the first and last client receiving the same broadcast."""
+        return [(max(times) - min(times)) * 1000 for times in self.receipts.values() if len(times) > 1]
+
+
+async def http_post(application, path, body=None):
+    comm = ApplicationCommunicator(application, {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "POST",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"content-type", b"application/json")],
+    })
+    await comm.send_input({"type": "http.request", "body": json.dumps(body or {}).encode(), "more_body": False})
+    start = await comm.receive_output(timeout=30)
+    while True:
+        chunk = await comm.receive_output(timeout=30)
+        if not chunk.get("more_body"):
+            break
+    # Let Django's handler finish its disconnect listener
+    await comm.send_input({"type": "http.disconnect"})
+    with contextlib.suppress(Exception):
+        await comm.wait(timeout=1)
+    return start["status"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test MeetingSyncConsumer and the room timer in-process: open many simulated "
+        "participant websocket clients (each with its own join ticket) across rooms, drive "
+        "playback controls (and optionally answer submissions) over the ASGI HTTP path, then report broadcast latency, drift between "
+        "clients, CPU and RSS. Clients run in the same process as the app, so CPU/RSS are an "
+        "upper bound for one daphne process serving the same load. The in-memory layer scans "
+        "every channel on each send, so use --layer redis when sizing beyond ~1k clients."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=20)
+        parser.add_argument("--clients", type=int, default=50, help="Clients per room (default 50).")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds of playback after ramp-up.")
+        parser.add_argument("--layer", choices=["memory", "redis", "settings"], default="memory")
+        parser.add_argument("--redis-url", default="redis://localhost:6379/2", help="Channel layer for --layer redis.")
+        parser.add_argument("--org", type=int, default=0, help="org_id used in room keys (default 0).")
+        parser.add_argument("--ramp", type=int, default=500, help="Connections opened per second.")
+        parser.add_argument("--control-interval", type=float, default=10.0,
+                            help="Seconds between playback controls (pause/resume/seek) per room.")
+        parser.add_argument("--answer-rate", type=float, default=0.0,
+                            help="Answer submissions per second across all clients. Creates a throwaway "
+                                 "org, meetings and participants, deleted afterwards.")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+        parser.add_argument("--verbose", action="store_true", help="Keep the app's own logging.")
+
+    def handle(self, *args, **options):
+        if options["rooms"] < 1 or options["clients"] < 1:
+            raise CommandError("--rooms and --clients must be positive")
+
+        layers = None
+        if options["layer"] != "settings":
+            layers = {"default": LAYERS[options["layer"]](options["redis_url"])}
+
+        run_id = uuid.uuid4().hex[:6]
+        rooms = [f"loadtest-{run_id}-{i}" for i in range(options["rooms"])]
+        seeded = self.seed(rooms, options) if options["answer_rate"] > 0 else None
+        org_id = seeded["org_id"] if seeded else options["org"]
+
+        stats = Stats()
+        try:
+            with contextlib.ExitStack() as stack:
+                stack.enter_context(override_settings(**({"CHANNEL_LAYERS": layers} if layers else {})))
+                if not options["verbose"]:
+                    logging.disable(logging.INFO)
+                    stack.callback(logging.disable, logging.NOTSET)
+                from illusion_classroom.asgi import application
+                wall = asyncio.run(self.run(application, org_id, rooms, seeded, stats, options))
+        finally:
+            for room_name in rooms:
+                cache.delete_many([f"active_meeting:{org_id}:{room_name}", f"video_state:{org_id}:{room_name}"])
+            if seeded:
+                get_user_model().objects.filter(id=seeded["user_id"]).delete()
+
+        self.report(stats, wall, options)
+
+    # ======================================================
+    # Setup
+    # ======================================================
+    def seed(self, rooms, options):
+        """Throwaway owner/org/meetings/participants so answer submissions hit the real DB path."""
+        user = get_user_model().objects.create_user(
+            username=f"loadtest-{uuid.uuid4().hex[:8]}", email="loadtest@localhost", password=None
+        )
+        org = Organization.objects.create(owner=user, name="loadtest")
+        participants = {}
+        for room_name in rooms:
+            meeting = Meeting.objects.create(
+                organization=org, owner=user, name=room_name, image_url="", description="",
+                questions_count=0, video_length_sec=0, tags=[],
+            )
+            ids = [uuid.uuid4().hex for _ in range(options["clients"])]
+            ParticipantResponse.objects.bulk_create([
+                ParticipantResponse(meeting=meeting, name=f"p{i}", participant_id=pid)
+                for i, pid in enumerate(ids)
+            ])
+            participants[room_name] = ids
+        return {"user_id": user.id, "org_id": org.id, "participants": participants}
+
+    # ======================================================
+    # Run
+    # ======================================================
+    async def run(self, application, org_id, rooms, seeded, stats, options):
+        clients = []
+        process = psutil.Process()
+        process.cpu_percent(None)
+        sampler = asyncio.create_task(self.sample(process, stats))
+
+        # 🔗 Ramp up
+        batch = max(1, options["ramp"])
+        pending = [(room_name, n) for n in range(options["clients"]) for room_name in rooms]
+        for i in range(0, len(pending), batch):
+            started = time.monotonic()
+            group = [
+                WsClient(application, org_id, room_name, stats,
+                         seeded["participants"][room_name][n] if seeded else None)
+                for room_name, n in pending[i:i + batch]
+            ]
+            results = await asyncio.gather(*(self.connect(c, stats) for c in group))
+            clients.extend(c for c, ok in zip(group, results) if ok)
+            await asyncio.sleep(max(0.0, 1.0 - (time.monotonic() - started)))
+
+        # ▶️ Playback + controls
+        await asyncio.gather(*(self.control(application, org_id, room_name, "start", stats) for room_name in rooms))
+        began = time.monotonic()
+        drivers = [asyncio.create_task(self.drive(application, org_id, room_name, stats, options)) for room_name in rooms]
+        if seeded:
+            drivers.append(asyncio.create_task(self.answer(application, org_id, seeded, stats, options)))
+
+        await asyncio.sleep(options["duration"])
+        wall = time.monotonic() - began
+
+        for task in drivers + [sampler]:
+            task.cancel()
+        await asyncio.gather(*stats.in_flight, return_exceptions=True)
+        await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+        for room_name in rooms:
+            await stop_timer_loop(f"meeting_{org_id}_{room_name}")
+        return wall
+
+    async def connect(self, client, stats):
+        started = time.monotonic()
+        try:
+            await client.connect(timeout=10)
+            stats.connect_ms.append((time.monotonic() - started) * 1000)
+            return True
+        except Exception:
+            stats.connect_errors += 1
+            return False
+
+    async def control(self, application, org_id, room_name, action, stats, body=None):
+        path = f"/auth/{action}_video_state/{org_id}/{room_name}/"
+        started = time.monotonic()
+        try:
+            status = await http_post(application, path, body)
+        except Exception:
+            status = None
+        stats.http(action, (time.monotonic() - started) * 1000, status == 200)
+
+    async def drive(self, application, org_id, room_name, stats, options):
+        """Per room: pause / resume / seek every --control-interval seconds (jittered)."""
+        playing = True
+        await asyncio.sleep(random.uniform(0, options["control_interval"]))
+        while True:
+            choice = random.random()
+            if choice < 0.25:
+                await self.control(application, org_id, room_name, "update", stats,
+                                   {"current_time": round(random.uniform(0, 600), 1)})
+            else:
+                await self.control(application, org_id, room_name, "pause" if playing else "start", stats)
+                playing = not playing
+            await asyncio.sleep(options["control_interval"])
+
+    async def answer(self, application, org_id, seeded, stats, options):
+        rooms = list(seeded["participants"])
+        while True:
+            room_name = random.choice(rooms)
+            participant_id = random.choice(seeded["participants"][room_name])
+            path = f"/auth/store_video_question_answers/{org_id}/{room_name}/{random.randint(1, 20)}/"
+            task = asyncio.create_task(self.post_answer(application, path, participant_id, stats))
+            stats.in_flight.add(task)
+            task.add_done_callback(stats.in_flight.discard)
+            await asyncio.sleep(random.expovariate(options["answer_rate"]))
+
+    async def post_answer(self, application, path, participant_id, stats):
+        started = time.monotonic()
+        try:
+            status = await http_post(application, path, {
+                "participant_id": participant_id,
+                "answers": {"answers": [random.choice("ABCD")]},
+            })
+        except Exception:
+            status = None
+        stats.http("answer", (time.monotonic() - started) * 1000, status == 200)
+
+    async def sample(self, process, stats):
+        while True:
+            await asyncio.sleep(0.5)
+            stats.cpu.append(process.cpu_percent(None))
+            stats.rss_mb.append(process.memory_info().rss / 1024 / 1024)
+
+    # ======================================================
+    # Report
+    # ======================================================
+    def report(self, stats, wall, options):
+        connected = len(stats.connect_ms)
+        report = {
+            "rooms": options["rooms"],
+            "clients": connected,
+            "connect_errors": stats.connect_errors,
+            "layer": options["layer"],
+            "duration_s": round(wall, 1),
+            "connect_ms": percentiles(stats.connect_ms),
+            "messages": stats.messages,
+            "messages_per_s": round(sum(stats.messages.values()) / wall, 1) if wall else 0,
+            "broadcast_latency_ms": percentiles(stats.latencies_ms),
+            "client_drift_ms": percentiles(stats.drift_ms()),
+            "http_ms": {label: percentiles(ms) for label, ms in stats.http_ms.items()},
+            "http_errors": stats.http_errors,
+            "cpu_percent": {
+                "avg": round(sum(stats.cpu) / len(stats.cpu), 1) if stats.cpu else None,
+                "max": max(stats.cpu, default=None),
+            },
+            "rss_mb": {
+                "start": round(stats.rss_mb[0], 1) if stats.rss_mb else None,
+                "peak": round(max(stats.rss_mb), 1) if stats.rss_mb else None,
+            },
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"{report['rooms']} rooms × {options['clients']} clients → {connected} connected "
+            f"({stats.connect_errors} failed), {report['layer']} layer, {report['duration_s']}s"
+        )
+        self.stdout.write(f"connect          {self.fmt(report['connect_ms'])}")
+        self.stdout.write(f"broadcast lat.   {self.fmt(report['broadcast_latency_ms'])}")
+        self.stdout.write(f"client drift     {self.fmt(report['client_drift_ms'])}")
+        for label, values in report["http_ms"].items():
+            errors = stats.http_errors.get(label, 0)
+            self.stdout.write(f"http {label:<11} {self.fmt(values)} ({len(stats.http_ms[label])} calls, {errors} errors)")
+        self.stdout.write(
+            f"messages         {sum(stats.messages.values()):,} ({report['messages_per_s']:,}/s) {stats.messages}"
+        )
+        self.stdout.write(
+            f"cpu              avg {report['cpu_percent']['avg']}% max {report['cpu_percent']['max']}%"
+        )
+        self.stdout.write(f"rss              start {report['rss_mb']['start']} MB peak {report['rss_mb']['peak']} MB")
+
+    @staticmethod
+    def fmt(values):
+        if values["max"] is None:
+            return "n/a"
+        return " ".join(f"{k} {v:.1f}ms" for k, v in values.items())
@@ -1,43 +1,110 @@
 import asyncio
+import logging
+
 from django.core.cache import cache
 from django.utils.timezone import now
 from asgiref.sync import sync_to_async
 
+from .log import RateLimitedLogger, bind_request_id
+from .perf import recorder
+from .playback_schedule import PlaybackSchedule
+
+logger = logging.getLogger(__name__)
+tick_log = RateLimitedLogger(logger, interval=30)  # one tick line per room per 30 s at DEBUG
+
 active_loops = {}  # { room_group_name: asyncio.Task }
 
+TICK_SECONDS = 1.0
+ERROR_BACKOFF_SECONDS = 1.0
+
+
+@recorder.add_gauges
+def _timer_gauges():
+    return [("timer_loops_active", {}, sum(1 for task in list(active_loops.values()) if not task.done()))]
+
 
 async def ensure_timer_loop(room_group_name, org_id, room_name, channel_layer):
     """
     Ensures a timer loop exists for a given meeting room.
-    If one already exists, it is reused. If not, it is created.
+    If one is running, it is reused; if not (or its task has exited), one is created.
+
+    Besides the 1 s video_state tick, the loop sleeps until the next question
+    boundary or bot answer_time of the active meeting (see PlaybackSchedule) so
+    question_start / question_end / bot_answer go out on time instead of at the
+    next tick. Nothing is scheduled while the video is paused.
     """
-    if room_group_name in active_loops:
-        print(f"⏸ Timer loop already running for {room_group_name}")
+    task = active_loops.get(room_group_name)
+    if task is not None and not task.done():
+        logger.debug("⏸ Timer loop already running for %s", room_group_name)
         return
+    if task is not None:
+        logger.warning("⚠️ Timer loop for %s had exited, restarting it", room_group_name)
 
-    print(f"✅ Starting persistent timer loop for {room_group_name}")
+    logger.info("✅ Starting persistent timer loop for %s", room_group_name)
     video_key = f"video_state:{org_id}:{room_name}"
 
     async def loop():
+        bind_request_id(f"timer-{room_group_name}")
+        clock = asyncio.get_running_loop()
+        schedule = PlaybackSchedule(org_id, room_name)
+        next_tick = clock.time() + TICK_SECONDS
+        anchor = None  # (playback position, clock time) while the video is playing
+
         try:
             while True:
-                await asyncio.sleep(1.0)
-                state = await sync_to_async(cache.get)(video_key)
-                if not isinstance(state, dict):
-                    continue
-
-                if not state.get("stopped", True):
-                    print("HELLO")
-                    state["current_time"] = float(state.get("current_time", 0.0)) + 1.0
-                    state["last_updated"] = now().isoformat()
-                    await sync_to_async(cache.set)(video_key, state, timeout=None)
-                    await channel_layer.group_send(
-                        room_group_name,
-                        {"type": "video_state_update", "state": state},
-                    )
-                    print(f"📡 [{room_group_name}] time={state['current_time']:.2f}s")
+                try:
+                    # ⏰ Wake for the next tick, or earlier for a question boundary
+                    wake_at = next_tick
+                    if anchor:
+                        position = anchor[0] + (clock.time() - anchor[1])
+                        boundary = schedule.next_boundary(position)
+                        if boundary is not None:
+                            wake_at = min(wake_at, anchor[1] + (boundary - anchor[0]))
+                    await asyncio.sleep(max(0.0, wake_at - clock.time()))
+
+                    if clock.time() >= next_tick:
+                        next_tick += TICK_SECONDS
+                        if next_tick < clock.time():
+                            next_tick = clock.time() + TICK_SECONDS
+
+                        state = await sync_to_async(cache.get)(video_key)
+                        if not isinstance(state, dict):
+                            anchor = None
+                            continue
+
+                        if not state.get("stopped", True):
+                            state["current_time"] = float(state.get("current_time", 0.0)) + 1.0
+                            state["last_updated"] = now().isoformat()
+                            await sync_to_async(cache.set)(video_key, state, timeout=None)
+                            await channel_layer.group_send(
+                                room_group_name,
+                                {"type": "video_state_update", "state": state},
+                            )
+                            tick_log.debug(room_group_name, "📡 [%s] time=%.2fs", room_group_name, state["current_time"])
+                            anchor = (state["current_time"], clock.time())
+                        else:
+                            anchor = None
+
+                        # 🗓️ Pick up a new video / edited timeline (bundle version bump)
+                        await sync_to_async(schedule.refresh)()
+                        position = float(state.get("current_time", 0.0))
+                    elif anchor:
+                        position = anchor[0] + (clock.time() - anchor[1])
+                    else:
+                        continue
+
+                    for event in schedule.advance(position):
+                        await channel_layer.group_send(room_group_name, event)
+                        logger.debug("❓ [%s] %s @ %ss", room_group_name, event["type"], event["position"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # ✅ A DB / Redis / channel-layer hiccup must not stop the room's clock for good
+                    logger.exception("❌ Timer loop error for %s: %s", room_group_name, e)
+                    await asyncio.sleep(ERROR_BACKOFF_SECONDS)
         except asyncio.CancelledError:
-            print(f"🧹 Timer loop cancelled for {room_group_name}")
+            logger.info("🧹 Timer loop cancelled for %s", room_group_name)
+            tick_log.forget(room_group_name)
             return
 
     loop_task = asyncio.get_running_loop().create_task(loop())
@@ -49,4 +116,4 @@ async def stop_timer_loop(room_group_name):
     task = active_loops.pop(room_group_name, None)
     if task:
         task.cancel()
-        print(f"🧹 Stopped timer loop for {room_group_name}")
\ No newline at end of file
+        logger.info("🧹 Stopped timer loop for %s", room_group_name)
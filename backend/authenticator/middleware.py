@@ -0,0 +1,189 @@
+import random
+import re
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.crypto import constant_time_compare
+
+from .log import new_request_id, request_id_var
+from .perf import RequestStats, current_stats, recorder
+from .profiling import StackSampler, write_profile
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _request_id(request):
+    # ✅ Reuse nginx's $request_id (or the client's) so log lines join up across hops
+    incoming = request.headers.get(REQUEST_ID_HEADER, "")
+    return incoming if _VALID_REQUEST_ID.match(incoming) else new_request_id()
+
+
+class RequestIdMiddleware:
+    """
+    Binds a request id to every log record emitted while handling the request
+    and echoes it back in the X-Request-ID response header. Works for sync
+    and async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request.request_id = _request_id(request)
+        token = request_id_var.set(request.request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
+
+    async def __acall__(self, request):
+        request.request_id = _request_id(request)
+        token = request_id_var.set(request.request_id)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
+
+
+def _route_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.url_name or getattr(match.func, "__name__", "<view>")
+
+
+def _response_size(response):
+    if getattr(response, "streaming", False):
+        return int(response.get("Content-Length") or 0)
+    return len(response.content)
+
+
+class PerfMiddleware:
+    """
+    Per-request wall time, DB queries/time (connection execute_wrapper) and
+    cache calls/time (InstrumentedRedisCache), aggregated per URL name by
+    perf.recorder and reported in a Server-Timing header. Place it right
+    after RequestIdMiddleware so the wall time covers the other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, "PERF_SERVER_TIMING", True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self._finish(request, response, stats, started)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self._finish(request, response, stats, started)
+
+    def _finish(self, request, response, stats, started):
+        wall_ms = (time.perf_counter() - started) * 1000
+        recorder.record_http(_route_name(request), wall_ms, response.status_code, _response_size(response), stats)
+        if self.server_timing:
+            response["Server-Timing"] = (
+                f'app;dur={wall_ms:.1f}, '
+                f'db;dur={stats.db_ms:.1f};desc="{stats.db_queries} queries", '
+                f'cache;dur={stats.cache_ms:.1f};desc="{stats.cache_calls} calls"'
+            )
+        return response
+
+
+PROFILE_HEADER = "X-Profile"
+
+
+class ProfileMiddleware:
+    """
+    Opt-in statistical profiling: a PROFILE_SAMPLE_RATE fraction of requests,
+    plus any request carrying `X-Profile: <PROFILE_TOKEN>`, run under a
+    StackSampler. The collapsed stacks are written to PROFILE_DIR and the file
+    name is returned in the X-Profile-File header (download it from
+    /auth/profiles/<name>/). With neither setting configured the middleware
+    removes itself at startup.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.rate = getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+        self.token = getattr(settings, "PROFILE_TOKEN", "")
+        if self.rate <= 0 and not self.token:
+            raise MiddlewareNotUsed
+        self.interval = getattr(settings, "PROFILE_INTERVAL_MS", 5) / 1000
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _wanted(self, request):
+        header = request.headers.get(PROFILE_HEADER)
+        if header and self.token and constant_time_compare(header, self.token):
+            return True
+        return self.rate > 0 and random.random() < self.rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._wanted(request):
+            return self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), self.interval).start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        return self._finish(request, response, sampler)
+
+    async def __acall__(self, request):
+        if not self._wanted(request):
+            return await self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), self.interval).start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            sampler.stop()
+        return self._finish(request, response, sampler)
+
+    def _finish(self, request, response, sampler):
+        if sampler.samples:
+            label = f"{_route_name(request)}_{getattr(request, 'request_id', '-')}"
+            response["X-Profile-File"] = write_profile("cpu", label, sampler.collapsed(), ".folded")
+        return response
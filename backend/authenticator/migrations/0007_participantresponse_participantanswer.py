@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authenticator', '0006_remove_bot_identifier'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='questioncard',
+            name='correct_answers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name='ParticipantResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('participant_id', models.CharField(max_length=100)),
+                ('answers', models.JSONField(blank=True, default=dict)),
+                ('last_answered_at', models.DateTimeField(auto_now=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('meeting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='authenticator.meeting')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ParticipantAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_key', models.CharField(max_length=100)),
+                ('answer', models.JSONField(blank=True, default=dict)),
+                ('answered_at', models.DateTimeField()),
+                ('is_correct', models.BooleanField(blank=True, null=True)),
+                ('meeting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participant_answers', to='authenticator.meeting')),
+                ('question_card', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='participant_answers', to='authenticator.questioncard')),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_rows', to='authenticator.participantresponse')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['question_card', 'answered_at'], name='pa_question_answered_idx'), models.Index(fields=['meeting', 'question_card'], name='pa_meeting_question_idx'), models.Index(fields=['question_card', 'is_correct'], name='pa_question_correct_idx')],
+                'constraints': [models.UniqueConstraint(fields=('participant', 'question_key'), name='uniq_participant_answer_per_question')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:20
+
+from django.db import migrations
+
+from authenticator.utils.answer_grading import AnswerGrader
+
+BATCH_SIZE = 1000
+
+
+def backfill_participant_answers(apps, schema_editor):
+    """Copy every entry of ParticipantResponse.answers into ParticipantAnswer rows."""
+    ParticipantResponse = apps.get_model("authenticator", "ParticipantResponse")
+    ParticipantAnswer = apps.get_model("authenticator", "ParticipantAnswer")
+    QuestionCard = apps.get_model("authenticator", "QuestionCard")
+
+    # Resolve every referenced card up front (id -> correct_answers)
+    cards = dict(QuestionCard.objects.values_list("id", "correct_answers"))
+
+    batch = []
+    for response in ParticipantResponse.objects.only("id", "meeting_id", "answers").iterator():
+        for key, entry in (response.answers or {}).items():
+            card_id = int(key) if str(key).isdigit() and int(key) in cards else None
+            submitted = entry.get("answers") if isinstance(entry, dict) else entry
+            batch.append(ParticipantAnswer(
+                meeting_id=response.meeting_id,
+                participant_id=response.id,
+                question_card_id=card_id,
+                question_key=str(key),
+                answer=submitted if isinstance(submitted, dict) else {"answers": submitted},
+                answered_at=AnswerGrader.answered_at(entry),
+                is_correct=AnswerGrader.grade(cards.get(card_id), submitted),
+            ))
+
+        if len(batch) >= BATCH_SIZE:
+            ParticipantAnswer.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    if batch:
+        ParticipantAnswer.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authenticator', '0007_participantresponse_participantanswer'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_participant_answers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,141 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+
+# Frozen copy of the answer-row rebuild as of this migration, so later changes
+# to authenticator.utils.answer_grading can't change what it does.
+SKIP_TAG = "[EXCEPTION:SKIP]"
+
+
+def _normalize(values):
+    if values is None:
+        return set()
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    return {str(v).replace(SKIP_TAG, "").strip() for v in values}
+
+
+def _grade(correct_answers, submitted):
+    correct = _normalize(correct_answers)
+    if not correct:
+        return None
+    chosen = submitted.get("answers") if isinstance(submitted, dict) else submitted
+    return _normalize(chosen) == correct
+
+
+def _answered_at(entry):
+    raw = entry.get("timestamp") if isinstance(entry, dict) else None
+    parsed = parse_datetime(raw) if isinstance(raw, str) else None
+    return parsed or now()
+
+
+def _answer_rows(ParticipantAnswer, response, cards):
+    rows = []
+    for key, entry in (response.answers or {}).items():
+        card_id = int(key) if str(key).isdigit() and int(key) in cards else None
+        submitted = entry.get("answers") if isinstance(entry, dict) else entry
+        rows.append(ParticipantAnswer(
+            meeting_id=response.meeting_id,
+            participant_id=response.id,
+            question_card_id=card_id,
+            question_key=str(key),
+            answer=submitted if isinstance(submitted, dict) else {"answers": submitted},
+            answered_at=_answered_at(entry),
+            is_correct=_grade(cards.get(card_id), submitted),
+        ))
+    return rows
+
+
+def dedupe_before_constraints(apps, schema_editor):
+    """
+    Resolve legacy duplicates so the unique constraints below can be created:
+      - meetings sharing a name inside one org get their id appended to the name
+      - duplicate (meeting, participant_id) responses are merged into the oldest row
+    """
+    Meeting = apps.get_model("authenticator", "Meeting")
+    ParticipantResponse = apps.get_model("authenticator", "ParticipantResponse")
+    ParticipantAnswer = apps.get_model("authenticator", "ParticipantAnswer")
+    QuestionCard = apps.get_model("authenticator", "QuestionCard")
+
+    dup_meetings = (
+        Meeting.objects.values("organization_id", "name")
+        .annotate(n=Count("id")).filter(n__gt=1)
+    )
+    for dup in dup_meetings:
+        extras = Meeting.objects.filter(
+            organization_id=dup["organization_id"], name=dup["name"]
+        ).order_by("id")[1:]
+        for meeting in extras:
+            meeting.name = f"{meeting.name} ({meeting.id})"
+            meeting.save(update_fields=["name"])
+
+    dup_responses = (
+        ParticipantResponse.objects.values("meeting_id", "participant_id")
+        .annotate(n=Count("id")).filter(n__gt=1)
+    )
+    for dup in dup_responses:
+        responses = list(ParticipantResponse.objects.filter(
+            meeting_id=dup["meeting_id"], participant_id=dup["participant_id"]
+        ).order_by("id"))
+        keeper, extras = responses[0], responses[1:]
+
+        for extra in extras:
+            keeper.answers = {**(keeper.answers or {}), **(extra.answers or {})}
+            keeper.name = extra.name or keeper.name
+        keeper.save(update_fields=["answers", "name"])
+        ParticipantResponse.objects.filter(id__in=[e.id for e in extras]).delete()
+
+        # Rebuild the keeper's normalized rows from the merged JSON
+        ParticipantAnswer.objects.filter(participant_id=keeper.id).delete()
+        cards = dict(QuestionCard.objects.filter(
+            id__in=[int(k) for k in keeper.answers if str(k).isdigit()]
+        ).values_list("id", "correct_answers"))
+        ParticipantAnswer.objects.bulk_create(_answer_rows(ParticipantAnswer, keeper, cards))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authenticator', '0008_backfill_participantanswer'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_before_constraints, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['owner', 'name'], name='meeting_owner_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['organization', '-created_at'], name='meeting_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questioncard',
+            index=models.Index(fields=['organization', '-created_at'], name='qcard_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['organization', '-created_at'], name='video_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['meeting', '-created_at'], name='video_meeting_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videosegment',
+            index=models.Index(fields=['video', 'source_start'], name='segment_video_start_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='meeting',
+            constraint=models.UniqueConstraint(fields=('organization', 'name'), name='uniq_meeting_name_per_org'),
+        ),
+        migrations.AddConstraint(
+            model_name='participantresponse',
+            constraint=models.UniqueConstraint(fields=('meeting', 'participant_id'), name='uniq_participant_per_meeting'),
+        ),
+    ]
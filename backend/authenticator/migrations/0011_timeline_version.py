@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authenticator', '0010_video_aggregates'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='videosegment',
+            options={'ordering': ['position', 'id']},
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='videosegment',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
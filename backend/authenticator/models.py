@@ -40,14 +40,26 @@ class Meeting(models.Model):
     name = models.CharField(max_length=255)
     image_url = models.CharField(max_length=500)
     description = models.TextField()
-    questions_count = models.IntegerField()
-    video_length_sec = models.IntegerField()
+    questions_count = models.IntegerField()  # ✅ rolled up from videos on edit
+    video_length_sec = models.IntegerField()  # ✅ rolled up from videos on edit
     tags = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     shared_with = models.JSONField(default=list)
     currently_playing = models.BooleanField(default=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "name"],
+                name="uniq_meeting_name_per_org",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["owner", "name"], name="meeting_owner_name_idx"),
+            models.Index(fields=["organization", "-created_at"], name="meeting_org_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.organization.name})"
 
@@ -76,9 +88,66 @@ class ParticipantResponse(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["meeting", "participant_id"],
+                name="uniq_participant_per_meeting",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.name} — {self.meeting.name}"
 
+class ParticipantAnswer(models.Model):
+    """
+    One row per (participant, question) answer, mirrored from
+    ParticipantResponse.answers so analytics can aggregate in SQL.
+    """
+    meeting = models.ForeignKey(
+        Meeting,
+        on_delete=models.CASCADE,
+        related_name="participant_answers",
+    )
+    participant = models.ForeignKey(
+        ParticipantResponse,
+        on_delete=models.CASCADE,
+        related_name="answer_rows",
+    )
+    question_card = models.ForeignKey(
+        "QuestionCard",
+        on_delete=models.SET_NULL,   # ⚠️ keep the answer even if the card is deleted
+        null=True,
+        blank=True,
+        related_name="participant_answers",
+    )
+
+    # Raw key used in ParticipantResponse.answers (usually the card id)
+    question_key = models.CharField(max_length=100)
+
+    # Same payload the client submitted, e.g. {"answers": ["B"]}
+    answer = models.JSONField(default=dict, blank=True)
+    answered_at = models.DateTimeField()
+
+    # None when the card has no correct_answers to grade against
+    is_correct = models.BooleanField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["participant", "question_key"],
+                name="uniq_participant_answer_per_question",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["question_card", "answered_at"], name="pa_question_answered_idx"),
+            models.Index(fields=["meeting", "question_card"], name="pa_meeting_question_idx"),
+            models.Index(fields=["question_card", "is_correct"], name="pa_question_correct_idx"),
+        ]
+
+    def __str__(self):
+        return f"Answer {self.question_key} by {self.participant.name}"
+
 class Video(models.Model):
     meeting = models.ForeignKey(
         Meeting,
@@ -99,6 +168,20 @@ class Video(models.Model):
     tags = models.JSONField(default=list)
     created_at = models.DateTimeField(auto_now_add=True)  # reused as last edited
 
+    # ✅ Denormalized from segments (see utils/video_aggregates.py)
+    total_length = models.FloatField(default=0.0)
+    segment_count = models.PositiveIntegerField(default=0)
+    question_count = models.PositiveIntegerField(default=0)
+
+    # ✅ Bumped on every timeline save (optimistic concurrency for editors)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["organization", "-created_at"], name="video_org_created_idx"),
+            models.Index(fields=["meeting", "-created_at"], name="video_meeting_created_idx"),
+        ]
+
     def __str__(self):
         return f"Video ({self.name}) in {self.organization.name}"
 
@@ -160,6 +243,11 @@ class QuestionCard(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["organization", "-created_at"], name="qcard_org_created_idx"),
+        ]
+
     def __str__(self):
         return f"QuestionCard({self.question[:30]}...)"
 
@@ -172,6 +260,13 @@ class VideoSegment(models.Model):
     question_card = models.ForeignKey(
         "QuestionCard", on_delete=models.SET_NULL, null=True, blank=True
     )
+    position = models.PositiveIntegerField(default=0)  # ✅ timeline order
+
+    class Meta:
+        ordering = ["position", "id"]
+        indexes = [
+            models.Index(fields=["video", "source_start"], name="segment_video_start_idx"),
+        ]
 
     def __str__(self):
         return f"Segment {self.source_start}-{self.source_end} for {self.video.id}"
@@ -0,0 +1,106 @@
+from functools import wraps
+
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+from django.http import JsonResponse
+
+from .models import Meeting, Organization
+
+ROLE_OWNER = "owner"
+ROLE_MEMBER = "member"
+ROLE_NONE = "none"  # org exists, user has no access
+
+ORG_ROLE_TIMEOUT = 60 * 10  # 10 minutes
+
+
+def org_role_key(org_id, user_id):
+    return f"org_role:{org_id}:{user_id}"
+
+
+def get_org_role(user, org_id):
+    """
+    Resolve the user's role in an organization.
+    Returns ROLE_OWNER / ROLE_MEMBER / ROLE_NONE, or None if the org does not exist.
+    One Redis GET on a hit, one SELECT ... EXISTS(...) on a miss.
+    """
+    if not org_id:
+        return None
+    if not getattr(user, "is_authenticated", False):
+        return ROLE_NONE if Organization.objects.filter(id=org_id).exists() else None
+
+    key = org_role_key(org_id, user.id)
+    role = cache.get(key)
+    if role is not None:
+        return role
+
+    membership = Organization.members.through.objects.filter(
+        organization_id=OuterRef("id"), user_id=user.id
+    )
+    row = (
+        Organization.objects.filter(id=org_id)
+        .annotate(is_member=Exists(membership))
+        .values("owner_id", "is_member")
+        .first()
+    )
+    if row is None:
+        return None
+
+    if row["owner_id"] == user.id:
+        role = ROLE_OWNER
+    elif row["is_member"]:
+        role = ROLE_MEMBER
+    else:
+        role = ROLE_NONE
+
+    cache.set(key, role, timeout=ORG_ROLE_TIMEOUT)
+    return role
+
+
+def user_in_org(user, org):
+    """True if the user owns or belongs to `org` (an Organization or its id)."""
+    org_id = getattr(org, "id", org)
+    return get_org_role(user, org_id) in (ROLE_OWNER, ROLE_MEMBER)
+
+
+def user_shares_meeting(user, org_id, room_name):
+    """True if the user's email is in the meeting's shared_with list (admin access without membership)."""
+    shared_with = (
+        Meeting.objects.filter(organization_id=org_id, name=room_name)
+        .values_list("shared_with", flat=True)
+        .first()
+    )
+    return bool(shared_with) and bool(user.email) and user.email in shared_with
+
+
+def invalidate_org_role(org_id, user_id=None):
+    """Drop cached roles for one member, or for every member of the org."""
+    if user_id is not None:
+        cache.delete(org_role_key(org_id, user_id))
+    else:
+        cache.delete_pattern(org_role_key(org_id, "*"))
+
+
+def require_org_role(*roles, org_kwarg="org_id"):
+    """
+    View decorator: 404 if the org in the URL does not exist, 403 unless the user
+    holds one of `roles` (default: owner or member). Sets request.org_role.
+    """
+    allowed = roles or (ROLE_OWNER, ROLE_MEMBER)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            org_id = kwargs.get(org_kwarg)
+            role = get_org_role(request.user, org_id)
+
+            if role is None:
+                return JsonResponse({"error": f"Organization {org_id} not found."}, status=404)
+            if role not in allowed:
+                return JsonResponse({"error": "User is not part of this organization."}, status=403)
+
+            request.org_role = role
+            return view_func(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
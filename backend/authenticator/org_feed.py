@@ -0,0 +1,115 @@
+import functools
+import logging
+
+import orjson
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from . import async_redis, outbox
+from .perf import recorder
+
+logger = logging.getLogger(__name__)
+
+MAXLEN = getattr(settings, "ORG_FEED_MAXLEN", 1000)
+APPEND_ATTEMPTS = 3
+
+
+def stream_key(org_id):
+    return f"org_feed:{org_id}"
+
+
+def seq_key(org_id):
+    return f"org_feed_seq:{org_id}"
+
+
+def group_name(org_id):
+    return f"org_{org_id}_updates"
+
+
+def _seq(entry_id):
+    # Entries are added with explicit "<seq>-0" ids
+    return int(entry_id.split(b"-")[0])
+
+
+# ======================================================
+# Producers (views)
+# ======================================================
+def _append(org_id, encoded):
+    redis = get_redis_connection("default")
+    for _ in range(APPEND_ATTEMPTS):
+        seq = redis.incr(seq_key(org_id))
+        try:
+            redis.xadd(stream_key(org_id), {"e": encoded}, id=f"{seq}-0", maxlen=MAXLEN, approximate=True)
+            return seq
+        except ResponseError as e:
+            # Another worker's higher seq landed first: take the next one (leaves a gap, never a reorder)
+            if "equal or smaller" not in str(e):
+                raise
+    raise RuntimeError(f"could not append to {stream_key(org_id)} after {APPEND_ATTEMPTS} attempts")
+
+
+def _publish(org_id, encoded):
+    try:
+        seq = _append(org_id, encoded)
+    except Exception as e:
+        recorder.inc("org_feed_events_total", outcome="failed")
+        logger.warning("⚠️ Failed to append org %s feed event: %s", org_id, e)
+        return
+    recorder.inc("org_feed_events_total", outcome="appended")
+    outbox.publish(group_name(org_id), {"type": "org_update", "seq": seq, **orjson.loads(encoded)})
+
+
+def publish(org_id, category, action, payload=None, data=None):
+    """
+    Record a change to one of the org's objects and broadcast it to the org's
+    update group. `data` is the object's serialized form (same shape as the
+    org's list endpoint returns) so clients apply it in place instead of
+    refetching; leave it out for deletes.
+
+    Each event gets the next per-org sequence number and stays in a capped
+    stream (ORG_FEED_MAXLEN) that reconnecting clients replay from with
+    `?since=<seq>`. Like outbox.publish(): queued on commit, never raises.
+    """
+    event = {"category": category, "action": action, "payload": payload or {}, "data": data}
+    encoded = orjson.dumps(event, default=str)  # serialized now, so later mutations don't leak in
+    transaction.on_commit(functools.partial(_publish, org_id, encoded), robust=True)
+
+
+# ======================================================
+# Replay (OrganizationUpdateConsumer)
+# ======================================================
+async def replay(org_id, since):
+    """
+    Events after `since`, plus the seq the client is caught up to.
+
+    Returns (events, head, complete). `head` is the last seq replayed (or
+    `since` when there was nothing to replay), never the INCR counter: a seq
+    that was taken but not yet XADDed arrives live instead, and must not be
+    deduped as already sent. For a fresh client (since=None) it is the newest
+    stored seq. `complete` is False when events after `since` were already
+    trimmed from the stream (or Redis lost the feed), in which case the client
+    has to refetch its lists instead.
+    """
+    async with async_redis.connection() as redis:
+        counter = int(await redis.get(seq_key(org_id)) or 0)
+        newest = await redis.xrevrange(stream_key(org_id), count=1)
+        last = _seq(newest[0][0]) if newest else 0
+        if since is None:
+            return [], last, True
+        if since > counter or (not newest and since < counter):
+            recorder.inc("org_feed_replays_total", outcome="resync")
+            return [], last, False
+        if since >= last:
+            return [], since, True
+
+        oldest = await redis.xrange(stream_key(org_id), count=1)
+        if _seq(oldest[0][0]) > since + 1:
+            recorder.inc("org_feed_replays_total", outcome="resync")
+            return [], last, False
+
+        entries = await redis.xrange(stream_key(org_id), min=f"({since}-0", count=MAXLEN)
+        events = [{"type": "org_update", "seq": _seq(entry_id), **orjson.loads(fields[b"e"])} for entry_id, fields in entries]
+        recorder.inc("org_feed_replays_total", outcome="replayed")
+        return events, max([since, *(event["seq"] for event in events)]), True
@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import logging
+import time
+
+import orjson
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from . import async_redis
+from .log import bind_request_id
+from .perf import recorder
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "broadcast:outbox"
+RELAY_GROUP = "relay"
+RELAY_CONSUMER = "daphne"  # one logical relay: pending entries survive a daphne restart
+MAXLEN = getattr(settings, "OUTBOX_MAXLEN", 10000)
+MAX_AGE_SECONDS = getattr(settings, "OUTBOX_MAX_AGE_SECONDS", 30)
+BATCH = 100
+BLOCK_MS = 5000
+
+
+# ======================================================
+# Producers (views, LLM workers)
+# ======================================================
+def _encode(group, message):
+    # Serialized at publish time, so later mutations of `message` don't leak in
+    return orjson.dumps({"group": group, "message": message}, default=str)
+
+
+def _append(payload):
+    try:
+        get_redis_connection("default").xadd(STREAM_KEY, {"e": payload}, maxlen=MAXLEN, approximate=True)
+        recorder.inc("outbox_events_total", outcome="queued")
+    except Exception as e:
+        recorder.inc("outbox_events_total", outcome="failed")
+        logger.warning("⚠️ Failed to queue broadcast: %s", e)
+
+
+def publish(group, message):
+    """
+    Queue `message` for channel-layer `group`; daphne's relay does the
+    group_send. Inside a transaction.atomic() block the event is queued on
+    commit (and never for a rollback); otherwise right away. Never raises.
+    """
+    transaction.on_commit(functools.partial(_append, _encode(group, message)), robust=True)
+
+
+async def apublish(group, message):
+    """publish() for async views (no DB writes there, so no on_commit)."""
+    try:
+        async with async_redis.connection() as redis:
+            await redis.xadd(STREAM_KEY, {"e": _encode(group, message)}, maxlen=MAXLEN, approximate=True)
+        recorder.inc("outbox_events_total", outcome="queued")
+    except Exception as e:
+        recorder.inc("outbox_events_total", outcome="failed")
+        logger.warning("⚠️ Failed to queue broadcast: %s", e)
+
+
+# ======================================================
+# Relay (daphne)
+# ======================================================
+class OutboxRelay:
+    """
+    Reads the outbox stream through a consumer group and group_sends each
+    event in order, acking per batch. Started by the first websocket connect
+    in the process (like the timer loops) and restarted on the next one if it
+    dies. Entries left pending by a crash are delivered first on restart;
+    events older than MAX_AGE_SECONDS are dropped instead of replaying stale
+    state to clients.
+    """
+
+    def __init__(self):
+        self._task = None
+
+    def ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _create_group(self, redis):
+        try:
+            await redis.xgroup_create(STREAM_KEY, RELAY_GROUP, id="$", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _run(self):
+        bind_request_id("outbox-relay")
+        logger.info("✅ Starting broadcast outbox relay")
+        async with async_redis.connection() as redis:
+            layer = get_channel_layer()
+            backlog = True  # our pending entries first ("0"), then new ones (">")
+
+            while True:
+                try:
+                    if backlog:
+                        await self._create_group(redis)
+                    response = await redis.xreadgroup(
+                        RELAY_GROUP, RELAY_CONSUMER, {STREAM_KEY: "0" if backlog else ">"},
+                        count=BATCH, block=None if backlog else BLOCK_MS,
+                    )
+                    entries = response[0][1] if response else []
+                    if backlog and not entries:
+                        backlog = False
+                        continue
+
+                    for entry_id, fields in entries:
+                        await self._deliver(layer, entry_id, fields)
+                    if entries:
+                        await redis.xack(STREAM_KEY, RELAY_GROUP, *(entry_id for entry_id, _ in entries))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("⚠️ Outbox relay error: %s", e)
+                    backlog = True
+                    await asyncio.sleep(1)
+
+    async def _deliver(self, layer, entry_id, fields):
+        if not fields:  # trimmed away while pending
+            return
+        lag_ms = time.time() * 1000 - int(entry_id.split(b"-")[0])
+        if lag_ms > MAX_AGE_SECONDS * 1000:
+            recorder.inc("outbox_events_total", outcome="expired")
+            return
+
+        event = orjson.loads(fields[b"e"])
+        try:
+            await layer.group_send(event["group"], event["message"])
+            recorder.inc("outbox_events_total", outcome="sent")
+        except Exception as e:
+            recorder.inc("outbox_events_total", outcome="failed")
+            logger.warning("⚠️ Failed to relay %s to %s: %s", event["message"].get("type"), event["group"], e)
+        recorder.observe("outbox_relay_lag_ms", lag_ms)
+
+
+relay = OutboxRelay()
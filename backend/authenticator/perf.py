@@ -0,0 +1,569 @@
+import atexit
+import contextlib
+import functools
+import logging
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+import orjson
+import psutil
+from channels_redis.core import RedisChannelLayer
+from django.conf import settings
+from django_redis import get_redis_connection
+from django_redis.cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+FLUSH_SECONDS = getattr(settings, "PERF_FLUSH_SECONDS", 10)
+GROUP_WINDOW_TIMEOUT = 60 * 15  # keep per-minute group counters for 15 minutes
+METRIC_PREFIX = "classroom_"
+
+HISTOGRAM_NAMES_KEY = "metrics:names:h"
+COUNTER_NAMES_KEY = "metrics:names:c"
+GAUGE_PROCS_KEY = "metrics:gauge_procs"
+
+# name → help text. Histograms are observed in ms and exported in seconds;
+# counters ending in _ms_total are exported as _seconds_total.
+HISTOGRAMS = {
+    "http_request_duration_ms": "HTTP request wall time by URL name.",
+    "ws_connect_duration_ms": "Websocket connect handling time by consumer.",
+    "channel_group_send_duration_ms": "Channel layer group_send latency by event type.",
+    "cache_op_duration_ms": "Django cache (Redis) call latency by operation.",
+    "llm_call_duration_ms": "OpenAI call latency by purpose and outcome.",
+    "llm_queue_wait_ms": "Time LLM jobs waited in the scheduler queue by priority class.",
+    "media_processing_duration_ms": "ffmpeg/ffprobe/OpenCV processing time by task and outcome.",
+    "outbox_relay_lag_ms": "Time from queuing a broadcast to its group_send by the relay.",
+}
+COUNTERS = {
+    "http_errors_total": "HTTP responses with status >= 500 by URL name.",
+    "http_db_queries_total": "SQL queries run by HTTP requests, by URL name.",
+    "http_db_time_ms_total": "Time spent in SQL by HTTP requests, by URL name.",
+    "http_cache_calls_total": "Cache calls made by HTTP requests, by URL name.",
+    "http_cache_time_ms_total": "Time spent in cache calls by HTTP requests, by URL name.",
+    "http_response_bytes_total": "Response body bytes by URL name.",
+    "ws_messages_total": "Messages handled by websocket consumers (client frames and group events).",
+    "ws_handler_time_ms_total": "Time spent in websocket consumer handlers.",
+    "llm_jobs_total": "LLM scheduler jobs by priority class and outcome.",
+    "llm_tokens_total": "OpenAI tokens by model and kind (prompt/completion).",
+    "outbox_events_total": "Broadcast outbox events by outcome (queued/sent/expired/failed).",
+    "org_feed_events_total": "Org change feed events by outcome (appended/failed).",
+    "org_feed_replays_total": "Org feed reconnects with ?since= by outcome (replayed/resync).",
+    "ws_auth_total": "Websocket connects by consumer, auth method (ticket/session) and outcome.",
+}
+GAUGES = {
+    "timer_loops_active": "Meeting timer loops running.",
+    "ws_clients": "Connected websocket clients by group.",
+    "llm_queue_depth": "LLM jobs waiting by priority class.",
+    "llm_jobs_running": "LLM jobs running by priority class.",
+    "process_resident_memory_bytes": "RSS of each gunicorn/daphne process.",
+}
+
+
+def group_window_key(minute):
+    return f"perf:ws_groups:{minute}"
+
+
+def bucket_for(ms):
+    for bound in BUCKETS_MS:
+        if ms <= bound:
+            return str(bound)
+    return "inf"
+
+
+def _labels_key(labels):
+    return orjson.dumps(labels, option=orjson.OPT_SORT_KEYS).decode() if labels else "{}"
+
+
+# ======================================================
+# Per-request collector (DB + cache time), carried in a context var
+# ======================================================
+class RequestStats:
+    __slots__ = ("db_queries", "db_ms", "cache_calls", "cache_ms")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.cache_calls = 0
+        self.cache_ms = 0.0
+
+
+current_stats = ContextVar("perf_request_stats", default=None)
+
+
+def time_query(execute, sql, params, many, context):
+    """Connection execute_wrapper (installed on every connection in apps.ready)."""
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_ms += (time.perf_counter() - started) * 1000
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver."""
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+# ======================================================
+# Aggregation: in-process deltas, flushed to Redis by a background thread
+# ======================================================
+class PerfRecorder:
+    """
+    Metrics registry. Histograms and counters accumulate in memory and a
+    background thread flushes the deltas to Redis every FLUSH_SECONDS (one
+    pipeline), so recording costs a dict update under a lock. Totals are
+    cluster-wide and cumulative, like Prometheus counters.
+
+    Gauges are point-in-time values owned by one process (loops, clients,
+    queue depth, RSS): each flush publishes this process's gauges under a
+    key that expires after 3 flush intervals, and readers sum the live ones.
+
+    metrics:h:{name}         count|{labels}, sum|{labels}, {le}|{labels}
+    metrics:c:{name}         {labels} → value
+    metrics:g:{host}:{pid}   JSON [[name, labels, value], ...]
+    perf:ws_groups:{minute}  group → messages delivered in that minute
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hists = {}     # (name, labels_key) → [count, sum, {bucket: n}]
+        self._counters = defaultdict(float)  # (name, labels_key) → delta
+        self._groups = defaultdict(lambda: defaultdict(int))  # minute → group → messages
+        self._gauge_providers = []
+        self._pid = None
+        self.process = f"{socket.gethostname()}:{os.getpid()}"
+
+    # ------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------
+    def observe(self, name, ms, **labels):
+        self._ensure_flusher()
+        bucket = bucket_for(ms)
+        key = (name, _labels_key(labels))
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = [0, 0.0, defaultdict(int)]
+            hist[0] += 1
+            hist[1] += ms
+            hist[2][bucket] += 1
+
+    def inc(self, name, value=1, **labels):
+        if not value:
+            return
+        self._ensure_flusher()
+        with self._lock:
+            self._counters[(name, _labels_key(labels))] += value
+
+    @contextlib.contextmanager
+    def timed(self, name, **labels):
+        """Observe the block's duration, labelled outcome="ok" or "error"."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000, outcome=outcome, **labels)
+
+    def add_gauges(self, provider):
+        """Register fn() → [(name, labels dict, value)], sampled at every flush."""
+        self._gauge_providers.append(provider)
+        return provider
+
+    def record_http(self, name, wall_ms, status, size, stats):
+        self.observe("http_request_duration_ms", wall_ms, view=name)
+        self.inc("http_errors_total", status >= 500, view=name)
+        self.inc("http_db_queries_total", stats.db_queries, view=name)
+        self.inc("http_db_time_ms_total", stats.db_ms, view=name)
+        self.inc("http_cache_calls_total", stats.cache_calls, view=name)
+        self.inc("http_cache_time_ms_total", stats.cache_ms, view=name)
+        self.inc("http_response_bytes_total", size, view=name)
+
+    def record_ws_message(self, name, group, ms):
+        self.inc("ws_messages_total", consumer=name)
+        self.inc("ws_handler_time_ms_total", ms, consumer=name)
+        if group:
+            with self._lock:
+                self._groups[int(time.time() // 60)][group] += 1
+
+    # ------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------
+    def _ensure_flusher(self):
+        # Started lazily and again after fork(): the thread doesn't survive it
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.process = f"{socket.gethostname()}:{self._pid}"
+            threading.Thread(target=self._flush_loop, name="perf-flush", daemon=True).start()
+            atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_SECONDS)
+            self.flush()
+
+    def _sample_gauges(self):
+        gauges = []
+        for provider in self._gauge_providers:
+            try:
+                gauges.extend([name, labels, value] for name, labels, value in provider())
+            except Exception as e:
+                logger.warning("⚠️ Gauge provider %s failed: %s", getattr(provider, "__name__", provider), e)
+        return gauges
+
+    def flush(self):
+        with self._lock:
+            hists, self._hists = self._hists, {}
+            counters, self._counters = self._counters, defaultdict(float)
+            groups, self._groups = self._groups, defaultdict(lambda: defaultdict(int))
+        gauges = self._sample_gauges()
+
+        try:
+            pipe = get_redis_connection("default").pipeline(transaction=False)
+            for (name, labels), (count, total, buckets) in hists.items():
+                pipe.sadd(HISTOGRAM_NAMES_KEY, name)
+                pipe.hincrby(f"metrics:h:{name}", f"count|{labels}", count)
+                pipe.hincrbyfloat(f"metrics:h:{name}", f"sum|{labels}", total)
+                for bucket, n in buckets.items():
+                    pipe.hincrby(f"metrics:h:{name}", f"{bucket}|{labels}", n)
+            for (name, labels), value in counters.items():
+                pipe.sadd(COUNTER_NAMES_KEY, name)
+                pipe.hincrbyfloat(f"metrics:c:{name}", labels, value)
+            for minute, counts in groups.items():
+                for group, messages in counts.items():
+                    pipe.hincrby(group_window_key(minute), group, messages)
+                pipe.expire(group_window_key(minute), GROUP_WINDOW_TIMEOUT)
+            if gauges:
+                pipe.sadd(GAUGE_PROCS_KEY, self.process)
+                pipe.set(f"metrics:g:{self.process}", orjson.dumps(gauges), ex=FLUSH_SECONDS * 3)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("⚠️ Failed to flush perf counters: %s", e)
+
+
+recorder = PerfRecorder()
+timed = recorder.timed
+
+
+@recorder.add_gauges
+def _process_gauges():
+    return [("process_resident_memory_bytes", {"process": recorder.process}, psutil.Process().memory_info().rss)]
+
+
+# ======================================================
+# Backends: cache and channel layer
+# ======================================================
+class InstrumentedRedisCache(RedisCache):
+    """
+    django-redis backend that records every call's latency per operation
+    and bills it to the current request's RequestStats.
+    """
+
+
+def record_cache_call(op, ms):
+    """Latency histogram per operation + the current request's cache time (sync and async clients)."""
+    recorder.observe("cache_op_duration_ms", ms, op=op)
+    stats = current_stats.get()
+    if stats is not None:
+        stats.cache_calls += 1
+        stats.cache_ms += ms
+
+
+def _timed_cache_call(method):
+    op = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            record_cache_call(op, (time.perf_counter() - started) * 1000)
+    return wrapper
+
+
+# get_or_set() is left alone: it is get() + add(), each timed on its own
+for _name in (
+    "get", "set", "add", "delete", "get_many", "set_many", "delete_many", "delete_pattern",
+    "has_key", "incr", "decr", "keys", "iter_keys", "ttl", "expire", "persist", "touch", "clear",
+):
+    setattr(InstrumentedRedisCache, _name, _timed_cache_call(getattr(RedisCache, _name)))
+
+
+class InstrumentedRedisChannelLayer(RedisChannelLayer):
+    """channels_redis layer that records group_send latency per event type."""
+
+    async def group_send(self, group, message):
+        started = time.perf_counter()
+        try:
+            return await super().group_send(group, message)
+        finally:
+            recorder.observe(
+                "channel_group_send_duration_ms",
+                (time.perf_counter() - started) * 1000,
+                type=message.get("type", "?"),
+            )
+
+
+# ======================================================
+# Channels consumers
+# ======================================================
+_ws_clients = defaultdict(int)  # group → connected clients in this process
+
+
+@recorder.add_gauges
+def _ws_client_gauges():
+    return [("ws_clients", {"group": group}, n) for group, n in list(_ws_clients.items()) if n]
+
+
+class InstrumentedConsumerMixin:
+    """
+    Mix into an AsyncWebsocketConsumer (before the base class) to record
+    connect latency (websocket.connect handled → accepted + set up),
+    connected clients per `perf_group`, and every dispatched message:
+    client frames and channel-layer events, the latter counted against
+    `perf_group` for messages/sec per group. DB and cache time spent inside
+    handlers is not billed here.
+    """
+
+    perf_group = None  # set in connect(), e.g. self.room_group_name
+    _perf_counted = False
+
+    @property
+    def perf_name(self):
+        return type(self).__name__
+
+    async def websocket_connect(self, message):
+        started = time.perf_counter()
+        try:
+            await super().websocket_connect(message)
+        finally:
+            recorder.observe(
+                "ws_connect_duration_ms", (time.perf_counter() - started) * 1000, consumer=self.perf_name
+            )
+            if self.perf_group and not self._perf_counted:
+                _ws_clients[self.perf_group] += 1
+                self._perf_counted = True
+
+    async def websocket_disconnect(self, message):
+        if self._perf_counted:
+            _ws_clients[self.perf_group] -= 1
+            if _ws_clients[self.perf_group] <= 0:
+                del _ws_clients[self.perf_group]
+            self._perf_counted = False
+        await super().websocket_disconnect(message)
+
+    async def dispatch(self, message):
+        if message["type"] == "websocket.connect":
+            return await super().dispatch(message)  # timed in websocket_connect
+        started = time.perf_counter()
+        try:
+            await super().dispatch(message)
+        finally:
+            recorder.record_ws_message(
+                self.perf_name,
+                None if message["type"].startswith("websocket.") else self.perf_group,
+                (time.perf_counter() - started) * 1000,
+            )
+
+
+# ======================================================
+# OpenAI
+# ======================================================
+def record_llm_usage(model, response):
+    """Count prompt/completion tokens from a chat.completions response."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    recorder.inc("llm_tokens_total", getattr(usage, "prompt_tokens", 0) or 0, model=model, kind="prompt")
+    recorder.inc("llm_tokens_total", getattr(usage, "completion_tokens", 0) or 0, model=model, kind="completion")
+
+
+# ======================================================
+# Reading
+# ======================================================
+def read_histograms():
+    """{name: {labels_key: {"count", "sum", "buckets": {le: n}}}} across all processes."""
+    redis = get_redis_connection("default")
+    result = {}
+    for name in sorted(n.decode() for n in redis.smembers(HISTOGRAM_NAMES_KEY)):
+        series = defaultdict(lambda: {"count": 0, "sum": 0.0, "buckets": {}})
+        for field, value in redis.hgetall(f"metrics:h:{name}").items():
+            kind, _, labels = field.decode().partition("|")
+            if kind == "count":
+                series[labels]["count"] = int(value)
+            elif kind == "sum":
+                series[labels]["sum"] = float(value)
+            else:
+                series[labels]["buckets"][kind] = int(value)
+        result[name] = dict(series)
+    return result
+
+
+def read_counters():
+    redis = get_redis_connection("default")
+    return {
+        name: {labels.decode(): float(value) for labels, value in redis.hgetall(f"metrics:c:{name}").items()}
+        for name in sorted(n.decode() for n in redis.smembers(COUNTER_NAMES_KEY))
+    }
+
+
+def read_gauges():
+    """Gauges of every live process, summed per (name, labels)."""
+    redis = get_redis_connection("default")
+    procs = sorted(p.decode() for p in redis.smembers(GAUGE_PROCS_KEY))
+    totals = defaultdict(lambda: defaultdict(float))
+    for proc, raw in zip(procs, redis.mget([f"metrics:g:{p}" for p in procs]) if procs else []):
+        if raw is None:
+            redis.srem(GAUGE_PROCS_KEY, proc)  # process gone
+            continue
+        for name, labels, value in orjson.loads(raw):
+            totals[name][_labels_key(labels)] += value
+    return {name: dict(series) for name, series in totals.items()}
+
+
+def bucket_quantile(buckets, count, q):
+    """Upper bound (ms) of the bucket holding the q-quantile; None for the +Inf bucket."""
+    if not count:
+        return None
+    seen = 0
+    for bound in BUCKETS_MS:
+        seen += buckets.get(str(bound), 0)
+        if seen >= q * count:
+            return bound
+    return None
+
+
+def _summary(series):
+    count = series["count"]
+    return {
+        "count": count,
+        "avg_ms": round(series["sum"] / count, 2) if count else None,
+        "p50_ms": bucket_quantile(series["buckets"], count, 0.50),
+        "p95_ms": bucket_quantile(series["buckets"], count, 0.95),
+        "p99_ms": bucket_quantile(series["buckets"], count, 0.99),
+        "buckets": series["buckets"],
+    }
+
+
+def _by_label(series, label):
+    return {orjson.loads(labels).get(label, "?"): value for labels, value in series.items()}
+
+
+def snapshot():
+    """JSON view of the registry: per URL name, per consumer, per subsystem (perf_stats)."""
+    hists, counters, gauges = read_histograms(), read_counters(), read_gauges()
+
+    http = {}
+    for view, series in sorted(_by_label(hists.get("http_request_duration_ms", {}), "view").items()):
+        count = series["count"]
+        per_request = {
+            name: _by_label(counters.get(name, {}), "view").get(view, 0.0)
+            for name in ("http_db_queries_total", "http_db_time_ms_total", "http_cache_calls_total",
+                         "http_cache_time_ms_total", "http_response_bytes_total", "http_errors_total")
+        }
+        http[view] = {
+            **_summary(series),
+            "errors": int(per_request["http_errors_total"]),
+            "avg_db_queries": round(per_request["http_db_queries_total"] / count, 2),
+            "avg_db_ms": round(per_request["http_db_time_ms_total"] / count, 2),
+            "avg_cache_calls": round(per_request["http_cache_calls_total"] / count, 2),
+            "avg_cache_ms": round(per_request["http_cache_time_ms_total"] / count, 2),
+            "avg_bytes": round(per_request["http_response_bytes_total"] / count),
+        }
+
+    ws = {}
+    messages = _by_label(counters.get("ws_messages_total", {}), "consumer")
+    handler_ms = _by_label(counters.get("ws_handler_time_ms_total", {}), "consumer")
+    for consumer, series in _by_label(hists.get("ws_connect_duration_ms", {}), "consumer").items():
+        n = int(messages.get(consumer, 0))
+        ws[consumer] = {
+            "connects": series["count"],
+            "connect": _summary(series),
+            "messages": n,
+            "avg_handler_ms": round(handler_ms.get(consumer, 0) / n, 3) if n else None,
+        }
+
+    # Last complete minute → messages/sec per group
+    last_minute = int(time.time() // 60) - 1
+    groups = {
+        group.decode(): round(int(n) / 60, 2)
+        for group, n in get_redis_connection("default").hgetall(group_window_key(last_minute)).items()
+    }
+
+    return {
+        "flush_seconds": FLUSH_SECONDS,
+        "http": http,
+        "ws": ws,
+        "ws_group_messages_per_sec": dict(sorted(groups.items(), key=lambda item: -item[1])),
+        "group_send": {t: _summary(s) for t, s in _by_label(hists.get("channel_group_send_duration_ms", {}), "type").items()},
+        "cache_ops": {op: _summary(s) for op, s in _by_label(hists.get("cache_op_duration_ms", {}), "op").items()},
+        "gauges": {name: {labels: value for labels, value in series.items()} for name, series in gauges.items()},
+    }
+
+
+# ======================================================
+# Prometheus text format
+# ======================================================
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_labels(labels_key, **extra):
+    labels = {**orjson.loads(labels_key), **extra}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+def _export_name(name):
+    if name.endswith("_ms"):
+        return METRIC_PREFIX + name[:-3] + "_seconds", 1000.0
+    if name.endswith("_ms_total"):
+        return METRIC_PREFIX + name[:-9] + "_seconds_total", 1000.0
+    return METRIC_PREFIX + name, 1.0
+
+
+def render_prometheus():
+    """All histograms, counters and gauges in the Prometheus 0.0.4 text exposition format."""
+    lines = []
+
+    for name, series in read_histograms().items():
+        metric, scale = _export_name(name)
+        lines += [f"# HELP {metric} {HISTOGRAMS.get(name, name)}", f"# TYPE {metric} histogram"]
+        for labels, data in sorted(series.items()):
+            cumulative = 0
+            for bound in BUCKETS_MS:
+                cumulative += data["buckets"].get(str(bound), 0)
+                lines.append(f"{metric}_bucket{_render_labels(labels, le=repr(bound / 1000))} {cumulative}")
+            lines.append(f'{metric}_bucket{_render_labels(labels, le="+Inf")} {data["count"]}')
+            lines.append(f"{metric}_sum{_render_labels(labels)} {data['sum'] / scale}")
+            lines.append(f"{metric}_count{_render_labels(labels)} {data['count']}")
+
+    for name, series in read_counters().items():
+        metric, scale = _export_name(name)
+        lines += [f"# HELP {metric} {COUNTERS.get(name, name)}", f"# TYPE {metric} counter"]
+        lines += [f"{metric}{_render_labels(labels)} {value / scale}" for labels, value in sorted(series.items())]
+
+    for name, series in sorted(read_gauges().items()):
+        metric = METRIC_PREFIX + name
+        lines += [f"# HELP {metric} {GAUGES.get(name, name)}", f"# TYPE {metric} gauge"]
+        lines += [f"{metric}{_render_labels(labels)} {value}" for labels, value in sorted(series.items())]
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,158 @@
+import bisect
+import logging
+
+import orjson
+
+from .utils.playback_bundle import PlaybackBundle
+
+logger = logging.getLogger(__name__)
+
+EPSILON = 1e-3  # seconds; absorbs float error when waking exactly on a boundary
+SEEK_THRESHOLD = 2.5  # a forward jump larger than this is a seek, not playback
+
+
+class PlaybackSchedule:
+    """
+    Interval index over the question segments of a room's active video, plus
+    the active bots' answers sorted by answer_time, loaded from the room's
+    playback bundle.
+
+    advance(position) returns the question_start / question_end / bot_answer
+    events implied by moving playback to `position` (works for forward play,
+    seeks and resets), and next_boundary(position) tells the timer when to
+    wake up next. Bot answers fire only when playback crosses their time;
+    seeks and resets re-position without replaying them.
+    """
+
+    def __init__(self, org_id, room_name):
+        self.org_id = org_id
+        self.room_name = room_name
+        self.version = None
+        self.intervals = []   # [(start, end, segment_id, question_card)] sorted by start
+        self.starts = []      # start of each interval, for bisect
+        self.boundaries = []  # every distinct start/end, sorted
+        self.active = {}      # segment_id → interval currently open
+        self.answers = []     # [(answer_time, event)] sorted by time
+        self.answer_times = []
+        self.answer_cursor = 0
+        self.position = -EPSILON  # last position passed to advance()
+
+    # ======================================================
+    # Loading (sync — call through sync_to_async)
+    # ======================================================
+    def refresh(self):
+        """Reload from Redis if the room's bundle version changed. Returns True on reload."""
+        version = PlaybackBundle.current_version(self.org_id, self.room_name)
+        if version == self.version:
+            return False
+
+        self.version = version
+        data = {}
+        if version is not None:
+            _, body = PlaybackBundle.load(self.org_id, self.room_name)
+            if body:
+                data = orjson.loads(body).get("data") or {}
+        self.load(data)
+        logger.info("🗓️ [%s:%s] schedule v%s: %s question window(s)", self.org_id, self.room_name, version, len(self.intervals))
+        return True
+
+    def load(self, data):
+        self.intervals = sorted(
+            (
+                (float(seg["source_start"]), float(seg["source_end"]), seg["id"], seg["question_card"])
+                for seg in data.get("video_segments") or []
+                if seg.get("question_card")
+            ),
+            key=lambda iv: (iv[0], iv[1]),
+        )
+        self.starts = [iv[0] for iv in self.intervals]
+        self.boundaries = sorted({t for iv in self.intervals for t in iv[:2]})
+
+        self.answers = sorted(
+            (
+                (float(answer["answer_time"]), self._bot_answer_event(bot, answer))
+                for bot in data.get("bots") or []
+                for answer in bot.get("answers") or []
+                if isinstance(answer.get("answer_time"), (int, float))
+            ),
+            key=lambda item: item[0],
+        )
+        self.answer_times = [t for t, _ in self.answers]
+        # Don't replay answers the room has already played past
+        self.answer_cursor = bisect.bisect_right(self.answer_times, self.position + EPSILON)
+
+    # ======================================================
+    # Queries
+    # ======================================================
+    def active_at(self, position):
+        position += EPSILON
+        upto = bisect.bisect_right(self.starts, position)
+        return {iv[2]: iv for iv in self.intervals[:upto] if iv[1] > position}
+
+    def next_boundary(self, position):
+        index = bisect.bisect_right(self.boundaries, position + EPSILON)
+        boundary = self.boundaries[index] if index < len(self.boundaries) else None
+
+        if self.answer_cursor < len(self.answer_times):
+            answer_time = self.answer_times[self.answer_cursor]
+            if boundary is None or answer_time < boundary:
+                boundary = answer_time
+        return boundary
+
+    def due_answers(self, position):
+        """bot_answer events whose answer_time playback crossed since the last advance()."""
+        previous = self.position
+        if position < previous - EPSILON or position - previous > SEEK_THRESHOLD:
+            # Seek / reset: jump the cursor, replay nothing
+            self.answer_cursor = bisect.bisect_right(self.answer_times, position + EPSILON)
+            return []
+
+        due = []
+        while (
+            self.answer_cursor < len(self.answer_times)
+            and self.answer_times[self.answer_cursor] <= position + EPSILON
+        ):
+            due.append(dict(self.answers[self.answer_cursor][1], position=round(position, 3)))
+            self.answer_cursor += 1
+        return due
+
+    def advance(self, position):
+        """Move to `position`; returns channel-layer events (ends first, then starts)."""
+        now_active = self.active_at(position)
+        events = []
+
+        for seg_id, (start, end, _, card) in self.active.items():
+            if seg_id not in now_active:
+                events.append(self._event("question_end", seg_id, start, end, card, position))
+        for seg_id, (start, end, _, card) in now_active.items():
+            if seg_id not in self.active:
+                events.append(self._event("question_start", seg_id, start, end, card, position))
+
+        self.active = now_active
+        events.extend(self.due_answers(position))
+        self.position = position
+        return events
+
+    @staticmethod
+    def _bot_answer_event(bot, answer):
+        return {
+            "type": "bot_answer",
+            "bot_id": bot["id"],
+            "bot_name": bot.get("name"),
+            "image_url": bot.get("image_url"),
+            "question_id": answer.get("question_id"),
+            "question": answer.get("question"),
+            "answers": answer.get("answers", []),
+            "answer_time": answer["answer_time"],
+        }
+
+    @staticmethod
+    def _event(kind, seg_id, start, end, card, position):
+        return {
+            "type": kind,
+            "segment_id": seg_id,
+            "question_card": card,
+            "start": start,
+            "end": end,
+            "position": round(position, 3),
+        }
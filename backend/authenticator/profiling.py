@@ -0,0 +1,175 @@
+import logging
+import os
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = getattr(settings, "PROFILE_DIR", os.path.join(settings.BASE_DIR, "profiles"))
+MAX_FILES = getattr(settings, "PROFILE_MAX_FILES", 200)
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9._-]{1,200}$")
+
+
+# ======================================================
+# Output files (shared volume between gunicorn and daphne)
+# ======================================================
+def _slug(value):
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", str(value)).strip("-")[:60] or "x"
+
+
+def write_profile(kind, label, text, suffix):
+    """Write one profile to PROFILE_DIR and prune the oldest beyond MAX_FILES. Returns the file name."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{kind}_{_slug(label)}{suffix}"
+    with open(os.path.join(PROFILE_DIR, name), "w") as f:
+        f.write(text)
+
+    files = sorted(list_profiles(), key=lambda entry: entry["modified"])
+    for entry in files[:max(len(files) - MAX_FILES, 0)]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, entry["name"]))
+        except OSError:
+            pass
+    return name
+
+
+def list_profiles():
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    entries = []
+    for name in os.listdir(PROFILE_DIR):
+        path = os.path.join(PROFILE_DIR, name)
+        if _SAFE_NAME.match(name) and os.path.isfile(path):
+            stat = os.stat(path)
+            entries.append({"name": name, "size": stat.st_size, "modified": stat.st_mtime})
+    return entries
+
+
+def profile_path(name):
+    """Absolute path of a stored profile, or None (also for anything that isn't a plain file name)."""
+    if not _SAFE_NAME.match(name):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+# ======================================================
+# Statistical CPU profiler
+# ======================================================
+def _frame_label(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a helper
+    thread (sys._current_frames) and counts identical stacks. The result is
+    in the collapsed "root;...;leaf count" format that flamegraph.pl,
+    speedscope and inferno read directly.
+
+    Costs nothing on the profiled thread beyond the GIL hand-offs, so it can
+    stay on for a sampled fraction of production requests. For async views the
+    profiled thread is the event loop, so samples include whatever else the
+    loop runs meanwhile.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# ======================================================
+# tracemalloc (daphne: timer loops / consumers)
+# ======================================================
+class TracemallocSession:
+    """
+    Start tracing, then take snapshots; every snapshot is written as the top
+    allocation sites and, from the second one on, as a diff against the
+    previous snapshot (what grew in between). Tracing slows allocations
+    down noticeably, so it only runs between start() and stop().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._previous = None
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    def start(self, frames=25):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._previous = None
+        logger.warning("🧪 tracemalloc started (%s frames) in pid %s", frames, os.getpid())
+
+    def stop(self):
+        with self._lock:
+            tracemalloc.stop()
+            self._previous = None
+        logger.warning("🧪 tracemalloc stopped in pid %s", os.getpid())
+
+    def snapshot(self, limit=25, key_type="lineno"):
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+
+        with self._lock:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+            previous, self._previous = self._previous, snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        top = [str(stat) for stat in snapshot.statistics(key_type)[:limit]]
+        lines = [f"# pid {os.getpid()} traced {current / 1e6:.1f} MB (peak {peak / 1e6:.1f} MB)", "# top", *top]
+
+        diff = []
+        if previous is not None:
+            diff = [str(stat) for stat in snapshot.compare_to(previous, key_type)[:limit]]
+            lines += ["# growth since previous snapshot", *diff]
+
+        name = write_profile("tracemalloc", f"pid{os.getpid()}", "\n".join(lines) + "\n", ".txt")
+        return {"file": name, "traced_bytes": current, "peak_bytes": peak, "top": top, "diff": diff}
+
+
+tracemalloc_session = TracemallocSession()
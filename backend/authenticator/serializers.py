@@ -0,0 +1,239 @@
+import os
+from operator import attrgetter
+from urllib.parse import urljoin
+
+import orjson
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+# ============================================================
+# ✅ Field mappings: (json key, getter) pairs built once at import
+# ============================================================
+def _str_id(attr):
+    get = attrgetter(attr)
+    return lambda obj: str(get(obj))
+
+
+def _optional_str_id(attr):
+    get = attrgetter(attr)
+
+    def getter(obj):
+        value = get(obj)
+        return str(value) if value else None
+
+    return getter
+
+
+# Segment-embedded card (camelCase, as the editor/player expect it)
+QUESTION_CARD_FIELDS = (
+    ("id", _str_id("id")),
+    ("question", attrgetter("question")),
+    ("answers", attrgetter("answers")),
+    ("difficulty", attrgetter("difficulty")),
+    ("type", attrgetter("type")),
+    ("displayType", attrgetter("display_type")),
+    ("showWinner", attrgetter("show_winner")),
+    ("live", attrgetter("live")),
+)
+
+# Library card (question bank views) — needs select_related("user")
+QUESTION_CARD_DETAIL_FIELDS = (
+    ("id", _str_id("id")),
+    ("question", attrgetter("question")),
+    ("answers", attrgetter("answers")),
+    ("correctAnswers", attrgetter("correct_answers")),
+    ("difficulty", attrgetter("difficulty")),
+    ("type", attrgetter("type")),
+    ("displayType", attrgetter("display_type")),
+    ("showWinner", attrgetter("show_winner")),
+    ("live", attrgetter("live")),
+    ("organization_id", _optional_str_id("organization_id")),
+    ("meeting_id", _optional_str_id("meeting_id")),
+    ("created_at", lambda q: q.created_at.isoformat()),
+    ("user_email", lambda q: q.user.email if q.user_id else None),
+)
+
+# Live playback card (snake_case, consumed by the participant view)
+ACTIVE_QUESTION_CARD_FIELDS = (
+    ("id", attrgetter("id")),
+    ("question", attrgetter("question")),
+    ("answers", attrgetter("answers")),
+    ("difficulty", attrgetter("difficulty")),
+    ("type", attrgetter("type")),
+    ("display_type", attrgetter("display_type")),
+    ("show_winner", attrgetter("show_winner")),
+    ("live", attrgetter("live")),
+    ("correct_answers", attrgetter("correct_answers")),
+)
+
+
+def _build(obj, fields):
+    return {key: get(obj) for key, get in fields}
+
+
+# ============================================================
+# ✅ Question cards
+# ============================================================
+def serialize_question_card(qc):
+    if qc is None:
+        return None
+    return _build(qc, QUESTION_CARD_FIELDS)
+
+
+def serialize_question_card_detail(qc):
+    return _build(qc, QUESTION_CARD_DETAIL_FIELDS)
+
+
+def serialize_active_question_card(qc):
+    if qc is None:
+        return None
+    return _build(qc, ACTIVE_QUESTION_CARD_FIELDS)
+
+
+# ============================================================
+# ✅ Segments (expects select_related / prefetch of question_card)
+# ============================================================
+def serialize_segment(segment):
+    qc = segment.question_card
+    return {
+        "id": str(segment.id),
+        "source": [segment.source_start, segment.source_end],
+        "isQuestionCard": qc is not None,
+        "questionCardData": serialize_question_card(qc),
+    }
+
+
+def serialize_active_segment(segment):
+    return {
+        "id": segment.id,
+        "source_start": segment.source_start,
+        "source_end": segment.source_end,
+        "question_card": serialize_active_question_card(segment.question_card),
+    }
+
+
+# ============================================================
+# ✅ Videos (full mode expects prefetch_related("segments__question_card"))
+# ============================================================
+class AbsoluteUrlBuilder:
+    """
+    Stands in for `request` in the serializers after the response has gone
+    out (background threads): only build_absolute_uri(), against the scheme
+    and host captured from the original request.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(request.build_absolute_uri("/"))
+
+    def build_absolute_uri(self, location):
+        return urljoin(self.base_url, location)
+
+
+def make_absolute_media_url(request, path):
+    """Return full absolute media URL for stored paths."""
+    if not path:
+        return None
+    if path.startswith("http"):
+        return path
+    return request.build_absolute_uri(
+        os.path.join(settings.MEDIA_URL, path)
+    ).replace("\\", "/")
+
+
+def serialize_video(request, video, individual, include_meeting_name=False, summary=False):
+    """
+    Full payload embeds every segment under "questionCards". With summary=True the
+    segments are left out, so no segment prefetch is needed.
+    """
+    meeting = video.meeting
+
+    data = {
+        "id": str(video.id),
+        "videoName": video.name or "Untitled Video",
+        "videoTags": video.tags or [],
+        "videoLength": video.total_length,
+    }
+    if not summary:
+        data["questionCards"] = [serialize_segment(s) for s in video.segments.all()]
+
+    data.update({
+        "savedAt": video.created_at.isoformat(),
+        "videoUrl": make_absolute_media_url(request, video.url),
+        "thumbnail_url": make_absolute_media_url(request, video.thumbnail_url),
+        "organization_id": str(video.organization_id),
+        "individual": individual,
+    })
+    if include_meeting_name:
+        data["meetingName"] = meeting.name if meeting else None
+    data["associated_meeting_id"] = str(meeting.id) if meeting else None
+    return data
+
+
+# ============================================================
+# ✅ Surveys / bots (list endpoints and org feed events share these)
+# ============================================================
+def serialize_survey(survey):
+    """Expects select_related("user") when serializing many."""
+    return {
+        "id": str(survey.id),
+        "items": survey.items,
+        "organization_id": str(survey.organization_id) if survey.organization_id else None,
+        "meeting_id": str(survey.meeting_id) if survey.meeting_id else None,
+        "created_at": survey.created_at.isoformat(),
+        "user_email": survey.user.email if survey.user_id else None,
+    }
+
+
+def serialize_bot(request, bot):
+    """Expects select_related("meeting") when serializing many."""
+    video_url = None
+    if bot.video_url:
+        if not bot.video_url.startswith("http") and not bot.video_url.startswith("/media/"):
+            video_url = make_absolute_media_url(request, bot.video_url)
+        else:
+            video_url = request.build_absolute_uri(bot.video_url).replace("\\", "/")
+
+    meeting = bot.meeting
+    return {
+        "id": bot.id,
+        "name": bot.name,
+        "memory": bot.memory,
+        "answers": bot.answers,
+        "video_url": video_url,
+        "image_url": request.build_absolute_uri(bot.image.url).replace("\\", "/") if bot.image else None,
+        "meeting_id": meeting.id if meeting else None,
+        "meeting_name": meeting.name if meeting else None,
+    }
+
+
+# ============================================================
+# ✅ orjson-encoded responses
+# ============================================================
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+_django_encoder = DjangoJSONEncoder()
+
+
+def _default(obj):
+    # Same wire format as DjangoJSONEncoder for datetimes, Decimals, lazy strings…
+    return _django_encoder.default(obj)
+
+
+def dumps(data):
+    return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    Drop-in for JsonResponse on large payloads: orjson writes bytes straight into
+    the response. Decodes to the same value as JsonResponse(data); the raw bytes
+    are compact (no spaces after separators, UTF-8 instead of \\u escapes).
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
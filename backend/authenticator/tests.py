@@ -1,3 +1,647 @@
-from django.test import TestCase
+import base64
+import json
+import threading
+import time
+from datetime import timedelta
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection
+from django.core import signing
+from django.test import SimpleTestCase, TestCase
+from django_redis import get_redis_connection
+
+from . import join_tickets
+from .consumers import connection_role
+from .models import (
+    Meeting,
+    Organization,
+    ParticipantResponse,
+    QuestionCard,
+    Video,
+    VideoSegment,
+)
+from .org_access import invalidate_org_role
+from .pagination import (
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    parse_page_size,
+)
+from .playback_schedule import PlaybackSchedule
+from .utils.bot_pregeneration import BotAnswerPregenerator
+from .utils.llm_scheduler import (
+    PRIORITY_DESCRIPTION,
+    PRIORITY_LIVE,
+    PRIORITY_PREGEN,
+    LLMDeadlineExceeded,
+    LLMScheduler,
+)
+from .utils.playback_bundle import PlaybackBundle
+from .utils.timeline import SegmentTimeline, TimelineConflict, TimelineError
+
+
+# ======================================================
+# Query plans: hot lookups must stay index-backed
+# ======================================================
+def hot_lookups():
+    """The lookups every live-session / dashboard request runs, keyed by a short label."""
+    return {
+        "meeting by org + name": (
+            Meeting.objects.filter(organization_id=0, name="room"),
+            Meeting._meta.db_table,
+        ),
+        "meeting by owner + name": (
+            Meeting.objects.filter(owner_id=0, name="room"),
+            Meeting._meta.db_table,
+        ),
+        "org meetings by -created_at": (
+            Meeting.objects.filter(organization_id=0).order_by("-created_at"),
+            Meeting._meta.db_table,
+        ),
+        "participant by meeting + participant_id": (
+            ParticipantResponse.objects.filter(meeting_id=0, participant_id="p"),
+            ParticipantResponse._meta.db_table,
+        ),
+        "segments by video ordered by source_start": (
+            VideoSegment.objects.filter(video_id=0).order_by("source_start"),
+            VideoSegment._meta.db_table,
+        ),
+        "question cards by org by -created_at": (
+            QuestionCard.objects.filter(organization_id=0).order_by("-created_at"),
+            QuestionCard._meta.db_table,
+        ),
+        "org videos by -created_at": (
+            Video.objects.filter(organization_id=0).order_by("-created_at"),
+            Video._meta.db_table,
+        ),
+    }
+
+
+def find_full_scans(plan, table):
+    """Human-readable full-scan findings for `table` in an EXPLAIN output."""
+    vendor = connection.vendor
+
+    if vendor == "mysql":
+        findings = []
+
+        def walk(node):
+            if isinstance(node, dict):
+                if node.get("table_name") == table and node.get("access_type") == "ALL":
+                    findings.append(f"full table scan on {table}")
+                for value in node.values():
+                    walk(value)
+            elif isinstance(node, list):
+                for value in node:
+                    walk(value)
+
+        walk(json.loads(plan))
+        return findings
+
+    if vendor == "sqlite":
+        return [
+            line.strip() for line in plan.splitlines()
+            if f"SCAN {table}" in line and "USING" not in line
+        ]
+
+    # postgresql and anything else with textual plans
+    return [line.strip() for line in plan.splitlines() if f"Seq Scan on {table}" in line]
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_lookups_use_an_index(self):
+        for label, (queryset, table) in hot_lookups().items():
+            with self.subTest(label):
+                if connection.vendor == "mysql":
+                    plan = queryset.explain(format="json")
+                else:
+                    plan = queryset.explain()
+                self.assertEqual(find_full_scans(plan, table), [], plan)
+
+
+# ======================================================
+# Keyset pagination
+# ======================================================
+class KeysetPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("owner", "owner@example.com", "pw")
+        org = Organization.objects.create(owner=user, name="Org")
+        Video.objects.bulk_create([
+            Video(organization=org, url=f"https://example.com/{i}.mp4") for i in range(7)
+        ])
+        # Two pairs share a created_at, so pages must break ties on id
+        videos = list(Video.objects.order_by("id"))
+        stamps = [videos[0].created_at.replace(microsecond=0) - timedelta(minutes=m) for m in (5, 4, 4, 3, 2, 2, 1)]
+        for video, created_at in zip(videos, stamps):
+            video.created_at = created_at
+        Video.objects.bulk_update(videos, ["created_at"])
+
+    def expected_order(self):
+        return list(Video.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def test_pages_cover_every_row_once_in_order(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            rows, cursor = keyset_page(Video.objects.all(), cursor, limit=2)
+            seen.extend(video.id for video in rows)
+            pages += 1
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, self.expected_order())
+        self.assertEqual(pages, 4)
+
+    def test_last_full_page_has_no_cursor(self):
+        rows, cursor = keyset_page(Video.objects.all(), limit=7)
+        self.assertEqual(len(rows), 7)
+        self.assertIsNone(cursor)
+
+    def test_cursor_round_trips(self):
+        video = Video.objects.order_by("-created_at", "-id")[2]
+        self.assertEqual(decode_cursor(encode_cursor(video)), (video.created_at, video.id))
+
+        rows, _ = keyset_page(Video.objects.all(), encode_cursor(video), limit=50)
+        self.assertEqual([v.id for v in rows], self.expected_order()[3:])
+
+
+def raw_cursor(created_at, obj_id):
+    """A cursor encoded like encode_cursor() but from arbitrary values."""
+    raw = json.dumps([created_at, obj_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+class PageParamTests(SimpleTestCase):
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in ("not-base64!", "bnVsbA", raw_cursor("yesterday", 1), raw_cursor("2024-01-01T00:00:00", "x")):
+            with self.subTest(cursor), self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(parse_page_size("0"), 1)
+        self.assertEqual(parse_page_size("20"), 20)
+        self.assertEqual(parse_page_size("100000"), MAX_PAGE_SIZE)
+        with self.assertRaises(InvalidCursor):
+            parse_page_size("ten")
+
+
+# ======================================================
+# SegmentTimeline
+# ======================================================
+class TimelineTestCase(TestCase):
+    """A video with three untagged 10s segments: [0, 10], [10, 20], [20, 30]."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("editor", "editor@example.com", "pw")
+        cls.org = Organization.objects.create(owner=cls.user, name="Org")
+        cls.other_org = Organization.objects.create(owner=cls.user, name="Other")
+        cls.card = cls.make_card(cls.org)
+        cls.other_card = cls.make_card(cls.org)
+        cls.foreign_card = cls.make_card(cls.other_org)
+
+    @classmethod
+    def make_card(cls, org):
+        return QuestionCard.objects.create(
+            user=cls.user, organization=org, question="Q?", answers=["a", "b"],
+            difficulty="easy", type="mc",
+        )
+
+    def setUp(self):
+        self.video = Video.objects.create(organization=self.org, url="https://example.com/v.mp4")
+        self.first, self.second, self.third = VideoSegment.objects.bulk_create([
+            VideoSegment(video=self.video, source_start=start, source_end=start + 10, position=position)
+            for position, start in enumerate((0.0, 10.0, 20.0))
+        ])
+
+    def timeline(self):
+        return list(
+            VideoSegment.objects.filter(video=self.video)
+            .order_by("position")
+            .values_list("source_start", "source_end", "question_card_id")
+        )
+
+
+class SegmentTimelineSaveTests(TimelineTestCase):
+    def save(self, segments, version=None):
+        return SegmentTimeline.save(self.video, segments, self.user, self.org, base_version=version)
+
+    def test_known_ids_are_updated_in_place_and_missing_ones_deleted(self):
+        result = self.save([
+            {"id": str(self.third.id), "source": [0, 5]},
+            {"id": self.first.id, "source": [5, 10]},
+        ])
+
+        self.assertEqual((result["created"], result["updated"], result["deleted"]), (0, 2, 1))
+        self.assertEqual(result["segment_ids"], [self.third.id, self.first.id])  # timeline order
+        self.assertEqual(self.timeline(), [(0, 5, None), (5, 10, None)])
+
+    def test_unchanged_rows_are_left_alone(self):
+        result = self.save([
+            {"id": seg.id, "source": [seg.source_start, seg.source_end]}
+            for seg in (self.first, self.second, self.third)
+        ] + [{"id": "new-1", "source": [30, 40]}])
+
+        self.assertEqual((result["created"], result["updated"], result["deleted"]), (1, 0, 0))
+        self.assertEqual(result["version"], 1)
+
+    def test_cards_are_resolved_by_id_and_created_once_when_unknown(self):
+        new_card = {"id": "tmp-1", "question": "New?", "answers": ["x"], "difficulty": "easy", "type": "mc"}
+        self.save([
+            {"id": self.first.id, "source": [0, 10], "isQuestionCard": True,
+             "questionCardData": {"id": str(self.card.id)}},
+            {"id": self.second.id, "source": [10, 20], "isQuestionCard": True, "questionCardData": new_card},
+            {"id": self.third.id, "source": [20, 30], "isQuestionCard": True, "questionCardData": new_card},
+        ])
+
+        timeline = self.timeline()
+        self.assertEqual(timeline[0][2], self.card.id)
+        self.assertIsNotNone(timeline[1][2])
+        self.assertEqual(timeline[1][2], timeline[2][2])
+        self.assertEqual(QuestionCard.objects.filter(question="New?").count(), 1)
+
+    def test_card_ids_from_another_org_are_not_attached(self):
+        self.save([
+            {"id": self.first.id, "source": [0, 10], "isQuestionCard": True,
+             "questionCardData": {"id": str(self.foreign_card.id), "question": "Mine?", "answers": ["x"],
+                                  "difficulty": "easy", "type": "mc"}},
+        ])
+
+        card_id = self.timeline()[0][2]
+        self.assertNotEqual(card_id, self.foreign_card.id)
+        self.assertEqual(QuestionCard.objects.get(id=card_id).organization_id, self.org.id)
+
+    def test_stale_version_conflicts_without_writing(self):
+        self.save([{"id": self.first.id, "source": [0, 30]}], version=0)
+
+        with self.assertRaises(TimelineConflict):
+            self.save([], version=0)
+        self.assertEqual(self.timeline(), [(0, 30, None)])
+
+
+class SegmentTimelinePatchTests(TimelineTestCase):
+    def patch(self, *ops, version=0):
+        return SegmentTimeline.patch(self.video, list(ops), version, org=self.org.id)
+
+    def test_move_boundary_shifts_the_next_segment_start(self):
+        result = self.patch({"op": "move_boundary", "index": 0, "to": 12})
+
+        self.assertEqual(result["version"], 1)
+        self.assertEqual(self.timeline(), [(0, 12, None), (12, 20, None), (20, 30, None)])
+
+    def test_move_boundary_outside_the_neighbours_is_rejected(self):
+        with self.assertRaises(TimelineError):
+            self.patch({"op": "move_boundary", "index": 0, "to": 25})
+
+    def test_move_boundary_across_a_gap_stops_at_the_next_segment(self):
+        VideoSegment.objects.filter(id=self.first.id).update(source_end=6)
+
+        with self.assertRaises(TimelineError):
+            self.patch({"op": "move_boundary", "index": 0, "to": 12})
+
+        self.patch({"op": "move_boundary", "index": 0, "to": 10})
+        self.assertEqual(self.timeline(), [(0, 10, None), (10, 20, None), (20, 30, None)])
+
+    def test_split_inserts_a_new_segment_and_keeps_existing_ids(self):
+        result = self.patch({"op": "split", "index": 1, "at": 15})
+
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(result["deleted"], 0)
+        self.assertEqual(
+            self.timeline(),
+            [(0, 10, None), (10, 15, None), (15, 20, None), (20, 30, None)],
+        )
+        self.assertEqual(
+            VideoSegment.objects.get(video=self.video, position=1).id, self.second.id,
+        )
+
+    def test_merge_keeps_the_card_of_either_segment(self):
+        self.second.question_card = self.card
+        self.second.save()
+
+        result = self.patch({"op": "merge", "index": 0})
+
+        self.assertEqual(result["deleted"], 1)
+        self.assertEqual(self.timeline(), [(0, 20, self.card.id), (20, 30, None)])
+
+    def test_merge_refuses_two_different_cards(self):
+        VideoSegment.objects.filter(id=self.first.id).update(question_card=self.card)
+        VideoSegment.objects.filter(id=self.second.id).update(question_card=self.other_card)
+
+        with self.assertRaises(TimelineError):
+            self.patch({"op": "merge", "index": 0})
+        self.assertEqual(len(self.timeline()), 3)
+
+    def test_attach_and_detach_card(self):
+        self.patch({"op": "attach_card", "index": 2, "card_id": str(self.card.id)})
+        self.assertEqual(self.timeline()[2], (20, 30, self.card.id))
+
+        self.patch({"op": "detach_card", "index": 2}, version=1)
+        self.assertEqual(self.timeline()[2], (20, 30, None))
+
+    def test_attach_card_from_another_org_is_rejected(self):
+        with self.assertRaises(TimelineError):
+            self.patch({"op": "attach_card", "index": 0, "card_id": self.foreign_card.id})
+
+    def test_failed_op_writes_nothing(self):
+        with self.assertRaises(TimelineError):
+            self.patch({"op": "split", "index": 0, "at": 5}, {"op": "merge", "index": 9})
+
+        self.assertEqual(self.timeline(), [(0, 10, None), (10, 20, None), (20, 30, None)])
+        self.video.refresh_from_db(fields=["version"])
+        self.assertEqual(self.video.version, 0)
+
+    def test_stale_version_conflicts(self):
+        self.patch({"op": "split", "index": 0, "at": 5})
+
+        with self.assertRaises(TimelineConflict) as ctx:
+            self.patch({"op": "merge", "index": 0}, version=0)
+        self.assertEqual(ctx.exception.current_version, 1)
+        self.assertEqual(len(self.timeline()), 4)
+
+    def test_version_must_be_an_integer(self):
+        with self.assertRaises(TimelineError):
+            self.patch({"op": "merge", "index": 0}, version="0")
+        with self.assertRaises(TimelineError):
+            SegmentTimeline.save(self.video, [], self.user, self.org, base_version="abc")
+
+
+# ======================================================
+# PlaybackSchedule (room timer)
+# ======================================================
+SCHEDULE_DATA = {
+    "video_segments": [
+        {"id": 1, "source_start": 5, "source_end": 10, "question_card": {"id": 11}},
+        {"id": 2, "source_start": 8, "source_end": 12, "question_card": {"id": 12}},
+        {"id": 3, "source_start": 20, "source_end": 25, "question_card": {"id": 13}},
+        {"id": 4, "source_start": 0, "source_end": 5, "question_card": None},
+    ],
+    "bots": [
+        {"id": 7, "name": "Bot", "answers": [
+            {"question_id": 11, "answers": ["a"], "answer_time": 9},
+            {"question_id": 13, "answers": ["b"], "answer_time": 22},
+            {"question_id": 12, "answers": ["c"], "answer_time": None},
+        ]},
+    ],
+}
+
+
+class PlaybackScheduleTests(SimpleTestCase):
+    def setUp(self):
+        self.schedule = PlaybackSchedule(org_id=1, room_name="room")
+        self.schedule.load(SCHEDULE_DATA)
+
+    def play(self, *positions):
+        events = []
+        for position in positions:
+            events.extend(self.schedule.advance(position))
+        return [(event["type"], event.get("segment_id") or event.get("question_id")) for event in events]
+
+    def test_only_question_segments_and_timed_answers_are_indexed(self):
+        self.assertEqual([iv[2] for iv in self.schedule.intervals], [1, 2, 3])
+        self.assertEqual(self.schedule.answer_times, [9.0, 22.0])
+
+    def test_next_boundary_interleaves_segment_edges_and_answers(self):
+        wakeups, position = [], 0.0
+        while (position := self.schedule.next_boundary(position)) is not None:
+            wakeups.append(position)
+            self.schedule.advance(position)
+        self.assertEqual(wakeups, [5, 8, 9, 10, 12, 20, 22, 25])
+
+    def test_forward_playback_emits_ends_before_starts(self):
+        self.assertEqual(self.play(0, 2, 4, 5.5), [("question_start", 1)])
+        self.assertEqual(self.play(7, 8.5, 9.2), [("question_start", 2), ("bot_answer", 11)])
+        self.assertEqual(self.play(10), [("question_end", 1)])
+        self.assertEqual(self.play(11, 12), [("question_end", 2)])
+
+    def test_forward_seek_skips_the_answers_it_jumps_over(self):
+        self.play(0)
+        self.assertEqual(self.play(21), [("question_start", 3)])
+        self.assertEqual(self.schedule.next_boundary(21), 22)
+        self.assertEqual(self.play(22.5), [("bot_answer", 13)])
+
+    def test_seeking_back_reopens_windows_without_replaying_answers(self):
+        self.play(0, 2, 4, 6, 8, 9.5, 11, 13, 15, 17, 19, 21, 23)
+        self.assertEqual(self.play(6), [("question_end", 3), ("question_start", 1)])
+        self.assertEqual(self.schedule.next_boundary(6), 8)
+
+        # Playing forward again fires the answer at 9 once more
+        self.assertEqual(self.play(8.5, 9.5), [("question_start", 2), ("bot_answer", 11)])
+
+    def test_reload_keeps_answers_already_played_past(self):
+        self.play(0, 2, 4, 6, 8, 9.5)
+        self.schedule.load(SCHEDULE_DATA)
+        self.assertEqual(self.schedule.next_boundary(9.5), 10)
+        self.assertEqual(self.schedule.answer_times[self.schedule.answer_cursor], 22)
+
+
+# ======================================================
+# LLM scheduler
+# ======================================================
+class LLMSchedulerTests(SimpleTestCase):
+    TIMEOUT = 5
+
+    def setUp(self):
+        self.ran = []
+        self.release = threading.Event()
+
+    def blocker(self, scheduler, **options):
+        """Occupy one worker until self.release is set."""
+        started = threading.Event()
+
+        def block():
+            started.set()
+            self.release.wait(self.TIMEOUT)
+
+        future = scheduler.submit(block, **options)
+        self.assertTrue(started.wait(self.TIMEOUT))
+        return future
+
+    def job(self, scheduler, label, **options):
+        return scheduler.submit(self.ran.append, args=(label,), **options)
+
+    def test_classes_run_in_priority_order(self):
+        scheduler = LLMScheduler(workers=1, live_reserved=0)
+        self.blocker(scheduler)
+        futures = [
+            self.job(scheduler, "description", priority=PRIORITY_DESCRIPTION),
+            self.job(scheduler, "pregen", priority=PRIORITY_PREGEN),
+            self.job(scheduler, "live", priority=PRIORITY_LIVE),
+        ]
+        self.release.set()
+        for future in futures:
+            future.result(self.TIMEOUT)
+
+        self.assertEqual(self.ran, ["live", "pregen", "description"])
+
+    def test_orgs_take_turns_within_a_class(self):
+        scheduler = LLMScheduler(workers=1, live_reserved=0)
+        self.blocker(scheduler)
+        futures = [self.job(scheduler, f"a{i}", org_id="a") for i in range(3)]
+        futures.append(self.job(scheduler, "b0", org_id="b"))
+        self.release.set()
+        for future in futures:
+            future.result(self.TIMEOUT)
+
+        self.assertEqual(self.ran, ["a0", "b0", "a1", "a2"])
+
+    def test_reserved_workers_only_run_live_jobs(self):
+        scheduler = LLMScheduler(workers=2, live_reserved=1)
+        self.blocker(scheduler, priority=PRIORITY_PREGEN)
+        pregen = self.job(scheduler, "pregen", priority=PRIORITY_PREGEN)
+        live = self.job(scheduler, "live", priority=PRIORITY_LIVE)
+
+        live.result(self.TIMEOUT)
+        self.assertEqual(self.ran, ["live"])
+        self.assertEqual(scheduler.stats()["classes"]["pregen"]["queued"], 1)
+
+        self.release.set()
+        pregen.result(self.TIMEOUT)
+        self.assertEqual(self.ran, ["live", "pregen"])
+
+    def test_expired_job_returns_its_fallback(self):
+        scheduler = LLMScheduler(workers=1, live_reserved=0)
+        self.blocker(scheduler)
+        expired = self.job(scheduler, "late", deadline=time.time() + 0.05, fallback=lambda: "fallback")
+        timely = self.job(scheduler, "timely", deadline=time.time() + 60)
+        time.sleep(0.1)
+        self.release.set()
+
+        self.assertEqual(expired.result(self.TIMEOUT), "fallback")
+        timely.result(self.TIMEOUT)
+        self.assertEqual(self.ran, ["timely"])
+        self.assertEqual(scheduler.stats()["classes"]["pregen"]["expired"], 1)
+
+    def test_expired_job_without_fallback_fails(self):
+        scheduler = LLMScheduler(workers=1, live_reserved=0)
+        self.blocker(scheduler)
+        expired = self.job(scheduler, "late", deadline=time.time() + 0.05)
+        time.sleep(0.1)
+        self.release.set()
+
+        with self.assertRaises(LLMDeadlineExceeded):
+            expired.result(self.TIMEOUT)
+        self.assertEqual(self.ran, [])
+
+
+# ======================================================
+# Join tickets
+# ======================================================
+class JoinTicketTests(SimpleTestCase):
+    def test_issue_and_verify_round_trip(self):
+        ticket, expires_at = join_tickets.issue("p-1", "3", "room")
+        claims = join_tickets.verify(ticket)
+
+        self.assertEqual(claims, {
+            "pid": "p-1", "org": 3, "room": "room",
+            "role": join_tickets.ROLE_PARTICIPANT, "exp": expires_at,
+        })
+        self.assertAlmostEqual(expires_at, time.time() + join_tickets.MAX_AGE, delta=5)
+
+    def test_expired_ticket_is_rejected(self):
+        ticket, _ = join_tickets.issue("p-1", 3, "room", max_age=-1)
+        self.assertIsNone(join_tickets.verify(ticket))
+
+    def test_tampered_or_foreign_tickets_are_rejected(self):
+        ticket, _ = join_tickets.issue("p-1", 3, "room")
+        payload, signature = ticket.rsplit(":", 1)
+        forged = signing.dumps({"pid": "p-1", "org": 4, "room": "room", "exp": time.time() + 60})
+
+        for bad in (f"{payload}:{signature[::-1]}", forged, "", "garbage"):
+            with self.subTest(bad):
+                self.assertIsNone(join_tickets.verify(bad))
+
+    def test_grants_only_its_org_and_room(self):
+        claims = join_tickets.verify(join_tickets.issue("p-1", 3, "room")[0])
+
+        self.assertTrue(join_tickets.grants(claims, "3", "room"))
+        self.assertFalse(join_tickets.grants(claims, 4, "room"))
+        self.assertFalse(join_tickets.grants(claims, 3, "other"))
+        self.assertFalse(join_tickets.grants(None, 3, "room"))
+
+
+class ConnectionRoleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("owner", "owner@example.com", "pw")
+        cls.guest = User.objects.create_user("guest", "guest@example.com", "pw")
+        cls.stranger = User.objects.create_user("stranger", "stranger@example.com", "pw")
+        cls.org = Organization.objects.create(owner=cls.owner, name="Org")
+        for name, shared_with in (("room", [cls.guest.email]), ("other", [])):
+            Meeting.objects.create(
+                organization=cls.org, owner=cls.owner, name=name, image_url="", description="",
+                questions_count=0, video_length_sec=0, tags=[], shared_with=shared_with,
+            )
+
+    def setUp(self):
+        invalidate_org_role(self.org.id)
+
+    def role(self, room_name="room", user=None, ticket=None):
+        scope = {"user": user or AnonymousUser(), "join_ticket": join_tickets.verify(ticket) if ticket else None}
+        return async_to_sync(connection_role)(scope, "meeting", str(self.org.id), room_name)
+
+    def test_org_owner_is_an_instructor(self):
+        self.assertEqual(self.role(user=self.owner), join_tickets.ROLE_INSTRUCTOR)
+
+    def test_meeting_shared_with_user_is_an_instructor_of_that_room_only(self):
+        self.assertEqual(self.role(user=self.guest), join_tickets.ROLE_INSTRUCTOR)
+        self.assertIsNone(self.role("other", user=self.guest))
+        self.assertIsNone(self.role(None, user=self.guest))  # org feed
+
+    def test_ticket_holder_gets_the_ticket_role(self):
+        ticket, _ = join_tickets.issue("p-1", self.org.id, "room")
+        self.assertEqual(self.role(ticket=ticket), join_tickets.ROLE_PARTICIPANT)
+        self.assertIsNone(self.role("other", ticket=ticket))
+
+    def test_everyone_else_is_rejected(self):
+        self.assertIsNone(self.role(user=self.stranger))
+        self.assertIsNone(self.role())
+
+
+# ======================================================
+# Playback bundle
+# ======================================================
+class PlaybackBundleStoreTests(SimpleTestCase):
+    ORG, ROOM = 0, "test-bundle-store"
+
+    def setUp(self):
+        self.redis = get_redis_connection("default")
+        self.addCleanup(
+            self.redis.delete,
+            PlaybackBundle.bundle_key(self.ORG, self.ROOM),
+            PlaybackBundle.rooms_key(self.ORG),
+        )
+
+    def store(self, version, body):
+        return PlaybackBundle._store(self.redis, self.ORG, self.ROOM, version, body)
+
+    def test_an_older_compile_finishing_last_does_not_overwrite(self):
+        self.assertEqual(self.store(5, b"five"), (5, b"five"))
+        self.assertEqual(self.store(4, b"four"), (5, b"five"))
+        self.assertEqual(PlaybackBundle.load(self.ORG, self.ROOM), (5, b"five"))
+
+        self.assertEqual(self.store(6, b"six"), (6, b"six"))
+        self.assertEqual(PlaybackBundle.load(self.ORG, self.ROOM), (6, b"six"))
+
+
+# ======================================================
+# Bot answer pre-generation progress
+# ======================================================
+class PregenerationProgressTests(SimpleTestCase):
+    STATE = {"bot_answers": {"job": "j", "status": "generating", "total": 3, "done": 0, "failed": 0}}
+
+    def merged(self, finished, failed):
+        state = BotAnswerPregenerator._merge_progress(self.STATE, self.STATE["bot_answers"], finished, failed)
+        return state["bot_answers"]
+
+    def test_running_job_reports_counts(self):
+        self.assertEqual(self.merged(b"2", b"1"), {**self.STATE["bot_answers"], "done": 1, "failed": 1})
+
+    def test_finished_job_reports_its_outcome(self):
+        self.assertEqual(self.merged(b"3", b"0")["status"], "ready")
+        self.assertEqual(self.merged(b"3", b"1")["status"], "partial")
+
+    def test_missing_progress_leaves_the_state_alone(self):
+        self.assertIs(BotAnswerPregenerator._merge_progress(self.STATE, self.STATE["bot_answers"], None, None), self.STATE)
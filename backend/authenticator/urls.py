@@ -33,6 +33,8 @@ from .views import (
     delete_video,
     edit_video,
     get_video_by_id,
+    get_video_segments,
+    patch_video_timeline,
     get_meeting_id,
     create_question_card,
     get_all_question_cards,
@@ -66,6 +68,11 @@ from .views import (
     get_all_video_question_answers,
     get_bot_answers,
     get_question_by_id,
+    llm_scheduler_stats,
+    perf_stats,
+    metrics,
+    list_profiles,
+    download_profile,
 )
 
 urlpatterns = [
@@ -103,6 +110,8 @@ urlpatterns = [
     path("delete_video/<int:video_id>/", delete_video, name="delete_video"),
     path("edit_video/<int:video_id>/<int:org_id>/<str:room_name>/", edit_video, name="edit_video"),
     path("get_video_by_id/<int:video_id>/", get_video_by_id, name="get_video_by_id"),
+    path("get_video_segments/<int:video_id>/", get_video_segments, name="get_video_segments"),
+    path("patch_video_timeline/<int:video_id>/", patch_video_timeline, name="patch_video_timeline"),
     path("store_video_question_answers/<int:org_id>/<str:room_name>/<int:question_id>/", store_video_question_answers, name="store_video_question_answers"),
 
     path("store_currently_playing/<str:meeting_name>/", store_currently_playing, name="store_currently_playing"),
@@ -155,8 +164,8 @@ urlpatterns = [
          name="get_question_by_id",
         ),
     
-    path("update_final_state/<int:org_id>/<str:room_name>/", update_final_state, name="edit_bot"),
-    path("stop_meeting_complete/<int:org_id>/<str:room_name>/", stop_meeting_complete, name="edit_bot"),
+    path("update_final_state/<int:org_id>/<str:room_name>/", update_final_state, name="update_final_state"),
+    path("stop_meeting_complete/<int:org_id>/<str:room_name>/", stop_meeting_complete, name="stop_meeting_complete"),
     path("get_active_survey_id/<int:org_id>/<str:room_name>/", get_active_survey_id, name="get_active_survey_by_id"),
     path("start_meeting_again/<int:org_id>/<str:room_name>/", start_meeting_again, name="start_meeting"),
     path("get_meeting_state/<int:org_id>/<str:room_name>/", get_meeting_end_state, name="get_meeting_state"),
@@ -171,6 +180,11 @@ urlpatterns = [
     path("update_video_state/<int:org_id>/<str:room_name>/", update_video_state, name="update_video_state"),
     path("get_video_state/<int:org_id>/<str:room_name>/", get_video_state, name="get_video_state",),
     path("get_active_meeting_with_segments/<int:org_id>/<str:room_name>/", get_active_meeting_with_segments, name="get_active_meeting_with_segments",),
+    path("llm_scheduler_stats/", llm_scheduler_stats, name="llm_scheduler_stats"),
+    path("perf_stats/", perf_stats, name="perf_stats"),
+    path("metrics/", metrics, name="metrics"),
+    path("profiles/", list_profiles, name="list_profiles"),
+    path("profiles/<str:name>/", download_profile, name="download_profile"),
     path("health/", lambda r: JsonResponse({"ok": True})),
 
 ]
@@ -0,0 +1,35 @@
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+
+SKIP_TAG = "[EXCEPTION:SKIP]"
+
+
+class AnswerGrader:
+    @staticmethod
+    def normalize(values):
+        """Turn a submitted/correct answer list into a comparable set of strings."""
+        if values is None:
+            return set()
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        return {str(v).replace(SKIP_TAG, "").strip() for v in values}
+
+    @staticmethod
+    def grade(correct_answers, submitted):
+        """
+        Compare a submitted payload ({"answers": [...]}) with a card's correct_answers.
+        Returns None when the card has nothing to grade against.
+        """
+        correct = AnswerGrader.normalize(correct_answers)
+        if not correct:
+            return None
+
+        chosen = submitted.get("answers") if isinstance(submitted, dict) else submitted
+        return AnswerGrader.normalize(chosen) == correct
+
+    @staticmethod
+    def answered_at(entry):
+        """Parse the timestamp stored alongside each ParticipantResponse answer."""
+        raw = entry.get("timestamp") if isinstance(entry, dict) else None
+        parsed = parse_datetime(raw) if isinstance(raw, str) else None
+        return parsed or now()
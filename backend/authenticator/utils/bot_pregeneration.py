@@ -0,0 +1,285 @@
+import logging
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django_redis import get_redis_connection
+
+from .. import async_redis, outbox
+from ..models import Bot, VideoSegment
+from ..serializers import AbsoluteUrlBuilder
+from .llm_scheduler import PRIORITY_LIVE, PRIORITY_PREGEN, scheduler
+from .playback_bundle import BUNDLE_TIMEOUT, PlaybackBundle
+from .smart_bot_answers import SmartBotAnswerEngine
+
+logger = logging.getLogger(__name__)
+
+ANSWER_END_MARGIN = 8  # seconds cut from the segment end, same as generate_answers_bot
+
+
+class BotAnswerPregenerator:
+    """
+    Background generation of bot answers when a video + bot set is activated.
+
+    Every (bot, question) pair of the active video without a fresh answer is
+    generated through the LLM scheduler: as "live" work with a deadline at
+    the question's end if the room is already playing and hasn't passed it,
+    as "pregen" work otherwise. The active-meeting state carries a
+    `bot_answers` entry ({job, key, status, total, done, failed}); the room's
+    current job id lives in bot_pregen:{org}:{room} and live progress is
+    counted per job in bot_pregen:{org}:{room}:{job}, merged in by
+    with_progress(). When the last pair finishes the room's playback
+    bundle is recompiled and meeting_state_changed is broadcast with
+    status "ready" (or "partial" if some generations failed).
+
+    Workers never write active_meeting:{org}:{room} (views update it
+    concurrently): the stored entry stays "generating" and with_progress()
+    reports "ready" / "partial" once the progress hash shows every pair
+    finished. Workers get an AbsoluteUrlBuilder, not the request.
+    """
+
+    @staticmethod
+    def job_key(org_id, room_name):
+        return f"bot_pregen:{org_id}:{room_name}"
+
+    @staticmethod
+    def progress_key(org_id, room_name, job):
+        return f"bot_pregen:{org_id}:{room_name}:{job}"
+
+    @staticmethod
+    def activation_key(state):
+        bot_ids = sorted(str(b) for b in state.get("active_bot_ids") or [])
+        return f"{state.get('active_video_id')}:{','.join(bot_ids)}"
+
+    # ======================================================
+    # What needs generating
+    # ======================================================
+    @staticmethod
+    def is_fresh(entry, segment):
+        """An answer is fresh if it has answers and lands inside the question's segment."""
+        answer_time = entry.get("answer_time")
+        return (
+            bool(entry.get("answers"))
+            and isinstance(answer_time, (int, float))
+            and segment.source_start <= answer_time <= segment.source_end
+        )
+
+    @staticmethod
+    def question_key(entry):
+        """int question id of a bot.answers entry (stored as int or str), else None."""
+        if not isinstance(entry, dict):
+            return None
+        qid = str(entry.get("question_id", ""))
+        return int(qid) if qid.isdigit() else None
+
+    @staticmethod
+    def missing_pairs(org_id, state):
+        """[(bot, segment, question_place)] for every pair lacking a fresh answer."""
+        video_id = state.get("active_video_id")
+        ids = [int(b) for b in state.get("active_bot_ids") or [] if str(b).isdigit()]
+        if not video_id or not ids:
+            return []
+
+        segments = list(
+            VideoSegment.objects.filter(video_id=video_id, question_card__isnull=False)
+            .select_related("question_card")
+            .order_by("source_start")
+        )
+        bots = Bot.objects.filter(organization_id=org_id).in_bulk(ids)
+
+        pairs = []
+        for bot in bots.values():
+            existing = {
+                BotAnswerPregenerator.question_key(entry): entry
+                for entry in (bot.answers if isinstance(bot.answers, list) else [])
+                if isinstance(entry, dict)
+            }
+            for place, segment in enumerate(segments):
+                entry = existing.get(segment.question_card_id)
+                if not entry or not BotAnswerPregenerator.is_fresh(entry, segment):
+                    pairs.append((bot, segment, place))
+        return pairs
+
+    # ======================================================
+    # Enqueue (called from update_or_create_active_meeting)
+    # ======================================================
+    @staticmethod
+    def prepare(org_id, room_name, state):
+        """
+        Work out what the state's video + bot set is missing and reset the
+        progress hash. Returns (bot_answers status, pairs); store the status
+        in the active-meeting state *before* calling submit(). A job already
+        running for the same video + bot set is kept (no pairs returned);
+        otherwise the new job supersedes any older one.
+        """
+        key = BotAnswerPregenerator.activation_key(state)
+        current = BotAnswerPregenerator.with_progress(org_id, room_name, state).get("bot_answers")
+        if isinstance(current, dict) and current.get("key") == key and current.get("status") == "generating":
+            return current, []
+
+        pairs = BotAnswerPregenerator.missing_pairs(org_id, state)
+        job = uuid.uuid4().hex[:12]
+        status = {
+            "job": job,
+            "key": key,
+            "status": "generating" if pairs else "ready",
+            "total": len(pairs),
+            "done": 0,
+            "failed": 0,
+        }
+
+        progress_key = BotAnswerPregenerator.progress_key(org_id, room_name, job)
+        pipe = get_redis_connection("default").pipeline()
+        pipe.set(BotAnswerPregenerator.job_key(org_id, room_name), job, ex=BUNDLE_TIMEOUT)
+        pipe.hset(progress_key, mapping={"total": len(pairs), "finished": 0, "failed": 0})
+        pipe.expire(progress_key, BUNDLE_TIMEOUT)
+        pipe.execute()
+        return status, pairs
+
+    @staticmethod
+    def submit(request, org_id, room_name, job, pairs):
+        video_state = cache.get(f"video_state:{org_id}:{room_name}")
+        playing = isinstance(video_state, dict) and not video_state.get("stopped", True)
+        position = float(video_state.get("current_time", 0.0)) if playing else 0.0
+        urls = AbsoluteUrlBuilder.from_request(request)  # the request is gone when the jobs run
+
+        for bot, segment, place in pairs:
+            args = (urls, org_id, room_name, job, bot.id, bot.memory, segment, place)
+            live = playing and position < segment.source_end
+            scheduler.submit(
+                BotAnswerPregenerator._run_pair,
+                args=args,
+                priority=PRIORITY_LIVE if live else PRIORITY_PREGEN,
+                org_id=org_id,
+                # The class reaches the end of the question window at this wall-clock time
+                deadline=time.time() + (segment.source_end - position) if live else None,
+                fallback=lambda args=args: BotAnswerPregenerator._count(*args[:4], ok=False),
+            )
+        if pairs:
+            logger.info("🤖 Pre-generating %s bot answer(s) for %s:%s (job %s)", len(pairs), org_id, room_name, job)
+
+    @staticmethod
+    def _generating(state):
+        status = state.get("bot_answers")
+        return status if isinstance(status, dict) and status.get("status") == "generating" else None
+
+    @staticmethod
+    def _merge_progress(state, status, finished, failed):
+        if finished is None:
+            return state
+        finished, failed = int(finished or 0), int(failed or 0)
+        merged = {**status, "done": finished - failed, "failed": failed}
+        if finished >= status.get("total", 0):
+            merged["status"] = "partial" if failed else "ready"
+        return {**state, "bot_answers": merged}
+
+    @staticmethod
+    def with_progress(org_id, room_name, state):
+        """Copy of `state` with live done/failed counts while a job is running."""
+        status = BotAnswerPregenerator._generating(state)
+        if status is None:
+            return state
+
+        finished, failed = get_redis_connection("default").hmget(
+            BotAnswerPregenerator.progress_key(org_id, room_name, status.get("job")), ["finished", "failed"]
+        )
+        return BotAnswerPregenerator._merge_progress(state, status, finished, failed)
+
+    @staticmethod
+    async def awith_progress(org_id, room_name, state):
+        """with_progress() for async views (redis.asyncio)."""
+        status = BotAnswerPregenerator._generating(state)
+        if status is None:
+            return state
+
+        async with async_redis.connection() as redis:
+            finished, failed = await redis.hmget(
+                BotAnswerPregenerator.progress_key(org_id, room_name, status.get("job")), ["finished", "failed"]
+            )
+        return BotAnswerPregenerator._merge_progress(state, status, finished, failed)
+
+    # ======================================================
+    # Worker
+    # ======================================================
+    @staticmethod
+    def _run_pair(urls, org_id, room_name, job, bot_id, bot_memory, segment, place):
+        ok = False
+
+        try:
+            current = get_redis_connection("default").get(BotAnswerPregenerator.job_key(org_id, room_name))
+            if current is None or current.decode() != job:
+                return  # superseded by a newer activation
+
+            card = segment.question_card
+            generated = SmartBotAnswerEngine.generate_simple_answers(
+                question=card.question,
+                answers=card.answers,
+                question_type=card.type,
+                bot_memory=bot_memory,
+                start_time=segment.source_start,
+                end_time=segment.source_end - ANSWER_END_MARGIN,
+                question_place=place,
+            )
+            if generated.get("answers"):
+                # Keep the answer inside its question window so it stays "fresh"
+                answer_time = float(generated.get("answer_time") or segment.source_start)
+                answer_time = min(max(answer_time, segment.source_start), segment.source_end)
+                BotAnswerPregenerator._store_answer(bot_id, card.id, generated["answers"], answer_time)
+                ok = True
+        except Exception as e:
+            logger.warning("⚠️ Pre-generation failed for bot %s, question %s: %s", bot_id, segment.question_card_id, e)
+        finally:
+            close_old_connections()
+
+        BotAnswerPregenerator._count(urls, org_id, room_name, job, ok)
+
+    @staticmethod
+    def _count(urls, org_id, room_name, job, ok):
+        """Record one finished (or dropped) pair; the last one finishes the job."""
+        redis = get_redis_connection("default")
+        progress_key = BotAnswerPregenerator.progress_key(org_id, room_name, job)
+        if not ok:
+            redis.hincrby(progress_key, "failed", 1)
+        finished = redis.hincrby(progress_key, "finished", 1)
+        if finished == int(redis.hget(progress_key, "total") or 0):
+            BotAnswerPregenerator._finish(urls, org_id, room_name, job)
+
+    @staticmethod
+    def _store_answer(bot_id, question_id, answers_given, answer_time):
+        """Replace this question's entry in bot.answers, under a row lock."""
+        with transaction.atomic():
+            bot = Bot.objects.select_for_update().only("id", "answers").get(id=bot_id)
+            answers = [
+                entry for entry in (bot.answers if isinstance(bot.answers, list) else [])
+                if BotAnswerPregenerator.question_key(entry) != int(question_id)
+            ]
+            answers.append({
+                "question_id": question_id,
+                "answers": answers_given,
+                "answer_time": answer_time,
+            })
+            bot.answers = answers
+            bot.save(update_fields=["answers"])
+        cache.delete(f"bot:{bot_id}")
+
+    @staticmethod
+    def _finish(urls, org_id, room_name, job):
+        try:
+            state = cache.get(f"active_meeting:{org_id}:{room_name}")
+            status = state.get("bot_answers") if isinstance(state, dict) else None
+            if not isinstance(status, dict) or status.get("job") != job:
+                return
+
+            # Read-only: the stored state keeps "generating", with_progress() reports the outcome
+            state = BotAnswerPregenerator.with_progress(org_id, room_name, state)
+            PlaybackBundle.compile(urls, org_id, room_name, state)
+            outbox.publish(
+                f"meeting_{org_id}_{room_name}",
+                {"type": "meeting_state_changed", "state": state},
+            )
+            logger.info("✅ Bot answers %s for %s:%s (job %s)", state['bot_answers']['status'], org_id, room_name, job)
+        except Exception as e:
+            logger.warning("⚠️ Failed to finish bot pre-generation for %s:%s: %s", org_id, room_name, e)
+        finally:
+            close_old_connections()
@@ -0,0 +1,229 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from django.conf import settings
+
+from ..perf import recorder
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LIVE = 0         # bot answers for a question in a room that is playing
+PRIORITY_PREGEN = 1       # pre-generation / bulk regeneration of bot answers
+PRIORITY_DESCRIPTION = 2  # video descriptions
+PRIORITY_NAMES = {
+    PRIORITY_LIVE: "live",
+    PRIORITY_PREGEN: "pregen",
+    PRIORITY_DESCRIPTION: "description",
+}
+
+
+class LLMDeadlineExceeded(Exception):
+    """The job's deadline passed before a worker picked it up."""
+
+
+class _Job:
+    __slots__ = (
+        "fn", "args", "kwargs", "priority", "org_id", "deadline", "fallback", "future", "enqueued_at", "context",
+    )
+
+    def __init__(self, fn, args, kwargs, priority, org_id, deadline, fallback):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.org_id = org_id
+        self.deadline = deadline
+        self.fallback = fallback
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.context = contextvars.copy_context()  # keeps the submitter's request id in the job's logs
+
+
+class LLMScheduler:
+    """
+    In-process scheduler for OpenAI calls (one per gunicorn/daphne process).
+
+    - Strict priority between classes: live > pregen > description.
+    - Per-org fairness inside a class: orgs are served round-robin, so one
+      instructor's bulk regeneration can't starve another org's jobs.
+    - `live_reserved` workers only ever run live jobs, so a live question
+      never waits behind in-flight batch calls.
+    - Deadlines (epoch seconds): a job picked up after its deadline is not
+      run; its `fallback()` result is returned instead, or the future fails
+      with LLMDeadlineExceeded.
+
+    submit() returns a concurrent.futures.Future; stats() reports queue
+    depth, in-flight jobs and wait times per class.
+    """
+
+    def __init__(self, workers, live_reserved):
+        self.workers = max(1, workers)
+        self.live_reserved = min(max(0, live_reserved), self.workers - 1)
+        self._cond = threading.Condition()
+        self._queues = {p: OrderedDict() for p in PRIORITY_NAMES}  # priority → {org_id: deque[_Job]}
+        self._running = {p: 0 for p in PRIORITY_NAMES}
+        self._counters = {
+            p: {"submitted": 0, "completed": 0, "failed": 0, "expired": 0, "wait_total": 0.0, "wait_max": 0.0}
+            for p in PRIORITY_NAMES
+        }
+        self._threads = []
+
+    # ======================================================
+    # Public API
+    # ======================================================
+    def submit(self, fn, *, args=(), kwargs=None, priority=PRIORITY_PREGEN, org_id=None, deadline=None, fallback=None):
+        if priority not in PRIORITY_NAMES:
+            raise ValueError(f"Unknown LLM priority: {priority!r}")
+
+        job = _Job(fn, args, kwargs or {}, priority, org_id, deadline, fallback)
+        with self._cond:
+            self._start_workers()
+            self._queues[priority].setdefault(org_id, deque()).append(job)
+            self._counters[priority]["submitted"] += 1
+            self._cond.notify()
+        return job.future
+
+    def run(self, fn, *, timeout=None, **options):
+        """submit() and wait for the result."""
+        return self.submit(fn, **options).result(timeout=timeout)
+
+    def stats(self):
+        with self._cond:
+            classes = {}
+            for priority, name in PRIORITY_NAMES.items():
+                counters = self._counters[priority]
+                started = counters["completed"] + counters["failed"]
+                classes[name] = {
+                    "queued": sum(len(q) for q in self._queues[priority].values()),
+                    "running": self._running[priority],
+                    "submitted": counters["submitted"],
+                    "completed": counters["completed"],
+                    "failed": counters["failed"],
+                    "expired": counters["expired"],
+                    "avg_wait_ms": round(counters["wait_total"] / started * 1000, 1) if started else 0.0,
+                    "max_wait_ms": round(counters["wait_max"] * 1000, 1),
+                }
+
+            queued_by_org = {}
+            for queues in self._queues.values():
+                for org_id, queue in queues.items():
+                    queued_by_org[str(org_id)] = queued_by_org.get(str(org_id), 0) + len(queue)
+
+            return {
+                "workers": self.workers,
+                "live_reserved": self.live_reserved,
+                "classes": classes,
+                "queued_by_org": queued_by_org,
+            }
+
+    # ======================================================
+    # Workers
+    # ======================================================
+    def _start_workers(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"llm-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_job(self):
+        """Pop the next runnable job (caller holds the lock). Returns (job, expired_jobs)."""
+        expired = []
+        batch_running = sum(n for p, n in self._running.items() if p != PRIORITY_LIVE)
+        batch_slots = self.workers - self.live_reserved
+
+        for priority, queues in self._queues.items():
+            if priority != PRIORITY_LIVE and batch_running >= batch_slots:
+                break
+
+            while queues:
+                # Round-robin: take the first org's oldest job, then move the org to the back
+                org_id, queue = next(iter(queues.items()))
+                job = queue.popleft()
+                if queue:
+                    queues.move_to_end(org_id)
+                else:
+                    del queues[org_id]
+
+                if job.deadline is not None and time.time() > job.deadline:
+                    self._counters[priority]["expired"] += 1
+                    expired.append(job)
+                    continue
+                return job, expired
+        return None, expired
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job, expired = self._next_job()
+                while job is None and not expired:
+                    self._cond.wait()
+                    job, expired = self._next_job()
+                if job is not None:
+                    self._running[job.priority] += 1
+                    wait = time.monotonic() - job.enqueued_at
+                    counters = self._counters[job.priority]
+                    counters["wait_total"] += wait
+                    counters["wait_max"] = max(counters["wait_max"], wait)
+
+            for stale in expired:
+                self._expire(stale)
+            if job is None:
+                continue
+            recorder.observe("llm_queue_wait_ms", wait * 1000, priority=PRIORITY_NAMES[job.priority])
+
+            ok = False
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    try:
+                        job.future.set_result(job.context.run(job.fn, *job.args, **job.kwargs))
+                        ok = True
+                    except Exception as e:
+                        logger.warning("⚠️ LLM job %s failed: %s", getattr(job.fn, '__name__', job.fn), e)
+                        job.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._running[job.priority] -= 1
+                    self._counters[job.priority]["completed" if ok else "failed"] += 1
+                    # A batch slot may have freed up for a waiting worker
+                    self._cond.notify_all()
+                recorder.inc("llm_jobs_total", priority=PRIORITY_NAMES[job.priority], outcome="ok" if ok else "error")
+
+    @staticmethod
+    def _expire(job):
+        name = PRIORITY_NAMES[job.priority]
+        logger.warning("⏱️ Dropping %s LLM job for org %s: deadline passed", name, job.org_id)
+        recorder.inc("llm_jobs_total", priority=name, outcome="expired")
+        if not job.future.set_running_or_notify_cancel():
+            return
+        if job.fallback is None:
+            job.future.set_exception(LLMDeadlineExceeded(f"{name} job for org {job.org_id} expired"))
+            return
+        try:
+            job.future.set_result(job.context.run(job.fallback))
+        except Exception as e:
+            job.future.set_exception(e)
+
+
+scheduler = LLMScheduler(
+    workers=getattr(settings, "LLM_WORKERS", 6),
+    live_reserved=getattr(settings, "LLM_LIVE_RESERVED", 2),
+)
+
+
+@recorder.add_gauges
+def _scheduler_gauges():
+    classes = scheduler.stats()["classes"]
+    return [
+        gauge
+        for name, counters in classes.items()
+        for gauge in (
+            ("llm_queue_depth", {"priority": name}, counters["queued"]),
+            ("llm_jobs_running", {"priority": name}, counters["running"]),
+        )
+    ]
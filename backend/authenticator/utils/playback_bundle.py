@@ -0,0 +1,252 @@
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from redis.exceptions import WatchError
+
+from ..models import Bot, QuestionCard, Video, VideoSegment
+from ..serializers import dumps, make_absolute_media_url, serialize_active_segment
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_TIMEOUT = 60 * 60 * 10  # same lifetime as active_meeting:{org}:{room}
+
+
+class PlaybackBundle:
+    """
+    One immutable, pre-encoded JSON blob per active room with everything a
+    participant needs to play the meeting (video URL, ordered segments with
+    question cards, active bots and their answers).
+
+    Redis layout (raw client, values are bytes):
+      playback_bundle:{org}:{room}          → hash {version, body}
+      playback_bundle_version:{org}:{room}  → INCR counter, never expires
+      playback_bundle_rooms:{org}           → set of rooms with a bundle
+
+    The resolved active bots are also cached on their own (Django cache,
+    room_bots:{org}:{room}:{bot ids}:{version}) for get_bot_answers and
+    get_active_bots_video_name; a new bundle version retires the entry.
+    """
+
+    @staticmethod
+    def bundle_key(org_id, room_name):
+        return f"playback_bundle:{org_id}:{room_name}"
+
+    @staticmethod
+    def version_key(org_id, room_name):
+        return f"playback_bundle_version:{org_id}:{room_name}"
+
+    @staticmethod
+    def rooms_key(org_id):
+        return f"playback_bundle_rooms:{org_id}"
+
+    @staticmethod
+    def bots_key(org_id, room_name, bot_ids, version):
+        ids = ",".join(str(b) for b in bot_ids or [])
+        digest = hashlib.sha1(ids.encode("utf-8")).hexdigest()[:16]
+        return f"room_bots:{org_id}:{room_name}:{digest}:{version}"
+
+    @staticmethod
+    def etag(org_id, room_name, version):
+        return f'"pb-{org_id}-{room_name}-{version}"'
+
+    # ======================================================
+    # Build
+    # ======================================================
+    @staticmethod
+    def resolve_bots(request, org_id, bot_ids):
+        """Active bots with their answers resolved against question cards, in bot_ids order."""
+        ids = [int(b) for b in bot_ids or [] if str(b).isdigit()]
+        bots = Bot.objects.filter(organization_id=org_id).in_bulk(ids)
+
+        # Bot answers store question_id as int or str; in_bulk keys are ints
+        question_ids = {
+            int(entry["question_id"])
+            for bot in bots.values()
+            for entry in (bot.answers or [])
+            if isinstance(entry, dict) and str(entry.get("question_id", "")).isdigit()
+        }
+        questions = QuestionCard.objects.only("id", "question", "type").in_bulk(question_ids)
+
+        resolved = []
+        for bot_id in ids:
+            bot = bots.get(bot_id)
+            if not bot:
+                logger.warning("⚠️ Bot %s not found for org %s", bot_id, org_id)
+                continue
+
+            answers = []
+            for entry in (bot.answers or []):
+                if not isinstance(entry, dict) or not entry.get("question_id"):
+                    continue
+                qid = str(entry["question_id"])
+                q_obj = questions.get(int(qid)) if qid.isdigit() else None
+                answers.append({
+                    "question_id": entry["question_id"],
+                    "question": q_obj.question if q_obj else None,
+                    "type": q_obj.type if q_obj else None,
+                    "answers": entry.get("answers", []),
+                    "answer_time": entry.get("answer_time"),
+                })
+
+            image_url = None
+            if bot.image:
+                try:
+                    image_url = request.build_absolute_uri(bot.image.url).replace("\\", "/")
+                except Exception as e:
+                    logger.warning("⚠️ Could not build media URL for %s: %s", bot.image, e)
+
+            resolved.append({
+                "id": bot.id,
+                "name": bot.name,
+                "image_url": image_url,
+                "memory": bot.memory,
+                "answers": answers,
+                "organization_id": bot.organization_id,
+                "meeting_id": bot.meeting_id,
+                "video_url": bot.video_url,
+            })
+        return resolved
+
+    @staticmethod
+    def build(request, org_id, room_name, state, version):
+        """Same envelope as get_active_meeting_with_segments, plus bots + bundle_version."""
+        active_video_id = state.get("active_video_id")
+
+        video_url = None
+        segments = []
+        if active_video_id:
+            video = Video.objects.filter(id=active_video_id).only("id", "url").first()
+            if video:
+                video_url = make_absolute_media_url(request, video.url)
+                segments = [
+                    serialize_active_segment(seg)
+                    for seg in VideoSegment.objects.filter(video_id=video.id)
+                    .select_related("question_card")
+                    .order_by("source_start")
+                ]
+
+        return {
+            "message": "Active meeting data retrieved",
+            "data": {
+                "org_id": int(org_id),
+                "room_name": str(room_name),
+                "active_video_id": active_video_id,
+                "active_survey_id": state.get("active_survey_id"),
+                "active_bot_ids": state.get("active_bot_ids", []),
+                "last_updated": state.get("last_updated"),
+                "video_url": video_url,
+                "video_segments": segments,
+                "bots": PlaybackBundle.resolve_bots(request, org_id, state.get("active_bot_ids")),
+                "bundle_version": version,
+            },
+        }
+
+    @staticmethod
+    def _store(redis, org_id, room_name, version, body):
+        """
+        Compare-and-set: store the bundle unless a newer version is already
+        there (a concurrent compile that took a later version but finished
+        first). Returns the (version, body) left in Redis.
+        """
+        key = PlaybackBundle.bundle_key(org_id, room_name)
+        with redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    stored_version, stored_body = pipe.hmget(key, ["version", "body"])
+                    if stored_version is not None and int(stored_version) >= version:
+                        pipe.unwatch()
+                        return int(stored_version), stored_body
+                    pipe.multi()
+                    pipe.hset(key, mapping={"version": version, "body": body})
+                    pipe.expire(key, BUNDLE_TIMEOUT)
+                    pipe.sadd(PlaybackBundle.rooms_key(org_id), room_name)
+                    pipe.execute()
+                    return version, body
+                except WatchError:
+                    continue  # the bundle changed under us: compare again
+
+    @staticmethod
+    def compile(request, org_id, room_name, state):
+        """
+        Build, encode and store a new bundle version. Returns the stored
+        (version, body_bytes): the newer bundle if a concurrent compile won.
+        """
+        redis = get_redis_connection("default")
+        version = redis.incr(PlaybackBundle.version_key(org_id, room_name))
+        payload = PlaybackBundle.build(request, org_id, room_name, state, version)
+        body = dumps(payload)
+
+        stored_version, stored_body = PlaybackBundle._store(redis, org_id, room_name, version, body)
+        if stored_version != version:
+            logger.debug("📦 Playback bundle v%s for %s:%s superseded by v%s", version, org_id, room_name, stored_version)
+            return stored_version, stored_body
+
+        # Prime the per-room bot cache for this version
+        cache.set(
+            PlaybackBundle.bots_key(org_id, room_name, state.get("active_bot_ids"), version),
+            payload["data"]["bots"],
+            timeout=BUNDLE_TIMEOUT,
+        )
+
+        logger.debug("📦 Compiled playback bundle v%s for %s:%s (%s B)", version, org_id, room_name, len(body))
+        return version, body
+
+    # ======================================================
+    # Read
+    # ======================================================
+    @staticmethod
+    def current_version(org_id, room_name):
+        raw = get_redis_connection("default").hget(PlaybackBundle.bundle_key(org_id, room_name), "version")
+        return int(raw) if raw is not None else None
+
+    @staticmethod
+    def load(org_id, room_name):
+        """Returns (version, body_bytes), or (None, None) if no bundle is stored."""
+        version, body = get_redis_connection("default").hmget(
+            PlaybackBundle.bundle_key(org_id, room_name), ["version", "body"]
+        )
+        if version is None or body is None:
+            return None, None
+        return int(version), body
+
+    @staticmethod
+    def active_bots(request, org_id, room_name, bot_ids):
+        """
+        Resolved active bots of a room (see resolve_bots), cached per
+        (room, active-bot set, bundle version). Rooms without a bundle are
+        resolved on every call.
+        """
+        version = PlaybackBundle.current_version(org_id, room_name)
+        if version is None:
+            return PlaybackBundle.resolve_bots(request, org_id, bot_ids)
+
+        key = PlaybackBundle.bots_key(org_id, room_name, bot_ids, version)
+        bots = cache.get(key)
+        if bots is None:
+            bots = PlaybackBundle.resolve_bots(request, org_id, bot_ids)
+            cache.set(key, bots, timeout=BUNDLE_TIMEOUT)
+        return bots
+
+    # ======================================================
+    # Invalidation
+    # ======================================================
+    @staticmethod
+    def rebuild_for(request, org_id, video_id=None, bot_id=None):
+        """Recompile every bundled room of the org that plays `video_id` or uses `bot_id`."""
+        redis = get_redis_connection("default")
+        rooms_key = PlaybackBundle.rooms_key(org_id)
+
+        for raw_room in redis.smembers(rooms_key):
+            room_name = raw_room.decode() if isinstance(raw_room, bytes) else raw_room
+            state = cache.get(f"active_meeting:{org_id}:{room_name}")
+            if not isinstance(state, dict):
+                redis.srem(rooms_key, raw_room)
+                continue
+
+            uses_video = video_id is not None and str(state.get("active_video_id")) == str(video_id)
+            uses_bot = bot_id is not None and str(bot_id) in {str(b) for b in state.get("active_bot_ids") or []}
+            if uses_video or uses_bot:
+                PlaybackBundle.compile(request, org_id, room_name, state)
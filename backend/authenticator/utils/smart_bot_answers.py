@@ -1,10 +1,14 @@
-import traceback
 import json
+import logging
 import re
 from openai import OpenAI
 from django.conf import settings
 import random
 
+from ..perf import record_llm_usage, timed
+
+logger = logging.getLogger(__name__)
+
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
 
@@ -27,13 +31,10 @@ class SmartBotAnswerEngine:
         allowing context like 'he gets question 2 wrong'.
         """
 
-        print("🤖 [DEBUG] Generating simple answers with timing...", flush=True)
-        print(f"  • Question: {question}", flush=True)
-        print(f"  • Answers: {answers}", flush=True)
-        print(f"  • Type: {question_type}", flush=True)
-        print(f"  • Memory: {bot_memory}", flush=True)
-        print(f"  • Start: {start_time}, End: {end_time}", flush=True)
-        print(f"  • Question #: {question_place}", flush=True)
+        logger.debug(
+            "🤖 Generating simple answers: question=%r answers=%r type=%s memory=%r start=%s end=%s place=%s",
+            question, answers, question_type, bot_memory, start_time, end_time, question_place,
+        )
 
         # ========== Prompt templates ==========
         if question_type == "mc":
@@ -105,27 +106,29 @@ class SmartBotAnswerEngine:
 
         # ========== Call GPT ==========
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                max_tokens=200,
-                temperature=0.7,
-            )
+            with timed("llm_call_duration_ms", model="gpt-4o", purpose="bot_answer"):
+                response = client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=messages,
+                    max_tokens=200,
+                    temperature=0.7,
+                )
+            record_llm_usage("gpt-4o", response)
 
             raw_content = response.choices[0].message.content.strip()
-            print("📥 [DEBUG] Raw GPT response:", raw_content, flush=True)
+            logger.debug("📥 Raw GPT response: %s", raw_content)
 
             # Try parsing JSON object
             match = re.search(r"\{.*\}", raw_content, re.DOTALL)
             if not match:
-                print("⚠️ [DEBUG] No JSON object found — fallback to list", flush=True)
+                logger.warning("⚠️ No JSON object found — fallback to list")
                 match = re.search(r"\[.*\]", raw_content, re.DOTALL)
                 if not match:
                     return {"answers": [], "answer_time": start_time or 0.0}
 
             json_like = match.group(0)
             parsed = json.loads(json_like)
-            print("✅ [DEBUG] Parsed:", parsed, flush=True)
+            logger.debug("✅ Parsed: %s", parsed)
 
             # Validate structure
             if isinstance(parsed, dict):
@@ -161,6 +164,5 @@ class SmartBotAnswerEngine:
             return {"answers": [], "answer_time": start_time or 0.0}
 
         except Exception as e:
-            print("❌ [ERROR] Failed to generate timed answers:", str(e), flush=True)
-            traceback.print_exc()
+            logger.exception("❌ Failed to generate timed answers: %s", str(e))
             return {"answers": [], "answer_time": start_time or 0.0}
@@ -0,0 +1,318 @@
+import logging
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from ..models import QuestionCard, Video, VideoSegment
+from .video_aggregates import VideoAggregates
+
+logger = logging.getLogger(__name__)
+
+
+class TimelineError(ValueError):
+    """An operation cannot be applied to the current timeline."""
+
+
+class TimelineConflict(Exception):
+    """The client edited an older version of the timeline."""
+
+    def __init__(self, current_version):
+        super().__init__(f"Timeline changed (now at version {current_version})")
+        self.current_version = current_version
+
+
+class SegmentTimeline:
+    """
+    Diff-based save of a video's segment list.
+
+    Incoming segments use the editor format
+    ({"id", "source": [start, end], "isQuestionCard", "questionCardData"}).
+    Segments whose id matches an existing row of this video are updated in
+    place, unknown ids are inserted, and rows missing from the payload are
+    deleted, all inside a single transaction.
+    """
+
+    SEGMENT_FIELDS = ["source_start", "source_end", "question_card", "position"]
+
+    @staticmethod
+    def _int_id(value):
+        value = str(value) if value is not None else ""
+        return int(value) if value.isdigit() else None
+
+    @staticmethod
+    def resolve_question_cards(segments, user, org):
+        """
+        Return one QuestionCard (or None) per incoming segment.
+        Existing cards are fetched with a single query, scoped to ``org`` so a
+        crafted id cannot pull in another org's card; cards without a known
+        id are created, as before.
+        """
+        wanted = {
+            SegmentTimeline._int_id((seg.get("questionCardData") or {}).get("id"))
+            for seg in segments
+            if seg.get("isQuestionCard") and seg.get("questionCardData")
+        }
+        wanted.discard(None)
+        cards = QuestionCard.objects.filter(organization=org).in_bulk(wanted)
+        created = {}  # client id → card created in this save
+
+        resolved = []
+        for seg in segments:
+            q_data = seg.get("questionCardData")
+            if not (seg.get("isQuestionCard") and q_data):
+                resolved.append(None)
+                continue
+
+            client_id = q_data.get("id")
+            card = cards.get(SegmentTimeline._int_id(client_id)) or created.get(client_id)
+            if card is None:
+                if client_id:
+                    logger.warning("⚠️ QuestionCard %s not found — creating new one.", client_id)
+                card = QuestionCard.objects.create(
+                    user=user,
+                    organization=org,
+                    question=q_data["question"],
+                    answers=q_data["answers"],
+                    difficulty=q_data["difficulty"],
+                    type=q_data["type"],
+                    display_type=q_data.get("displayType"),
+                    show_winner=q_data.get("showWinner"),
+                    live=q_data.get("live"),
+                    correct_answers=q_data.get("correctAnswer", []),
+                )
+                # Same unknown card referenced twice → reuse it
+                if client_id:
+                    created[client_id] = card
+            resolved.append(card)
+
+        return resolved
+
+    @staticmethod
+    def diff(video_id, existing, segments, cards):
+        """
+        Compare existing rows ({id: VideoSegment}) with the incoming list.
+        Returns (to_create, to_update, delete_ids).
+        """
+        to_create, to_update, kept = [], [], set()
+
+        for position, (seg, card) in enumerate(zip(segments, cards)):
+            start, end = seg["source"][0], seg["source"][1]
+            card_id = card.id if card else None
+
+            seg_id = SegmentTimeline._int_id(seg.get("id"))
+            row = existing.get(seg_id) if seg_id not in kept else None
+
+            if row is None:
+                to_create.append(VideoSegment(
+                    video_id=video_id,
+                    source_start=start,
+                    source_end=end,
+                    question_card=card,
+                    position=position,
+                ))
+                continue
+
+            kept.add(row.id)
+            if (row.source_start, row.source_end, row.question_card_id, row.position) != (
+                start, end, card_id, position,
+            ):
+                row.source_start = start
+                row.source_end = end
+                row.question_card = card
+                row.position = position
+                to_update.append(row)
+
+        delete_ids = [seg_id for seg_id in existing if seg_id not in kept]
+        return to_create, to_update, delete_ids
+
+    @staticmethod
+    def _is_version(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    @staticmethod
+    def _lock(video, base_version):
+        """Lock the video row and check the client's base version (if any)."""
+        current = Video.objects.select_for_update().values_list("version", flat=True).get(id=video.id)
+        if base_version is not None and base_version != current:
+            raise TimelineConflict(current)
+        return {
+            seg.id: seg
+            for seg in VideoSegment.objects.select_for_update().filter(video_id=video.id)
+        }
+
+    @staticmethod
+    def _persist(video, existing, segments, cards, metadata_fields=()):
+        to_create, to_update, delete_ids = SegmentTimeline.diff(video.id, existing, segments, cards)
+
+        if delete_ids:
+            VideoSegment.objects.filter(id__in=delete_ids).delete()
+        if to_update:
+            VideoSegment.objects.bulk_update(to_update, SegmentTimeline.SEGMENT_FIELDS)
+        if to_create:
+            VideoSegment.objects.bulk_create(to_create)
+
+        video.version = F("version") + 1
+        video.save(update_fields=["version", *metadata_fields])
+        video.refresh_from_db(fields=["version"])
+
+        VideoAggregates.refresh_video(video)
+
+        segment_ids = list(
+            VideoSegment.objects.filter(video_id=video.id).values_list("id", flat=True)
+        )
+
+        logger.info(
+            "🧩 Timeline v%s for video %s: +%s ~%s -%s",
+            video.version, video.id, len(to_create), len(to_update), len(delete_ids),
+        )
+        return {
+            "version": video.version,
+            "segment_ids": segment_ids,
+            "created": len(to_create),
+            "updated": len(to_update),
+            "deleted": len(delete_ids),
+        }
+
+    @staticmethod
+    def save(video, segments, user, org, metadata_fields=(), base_version=None):
+        """
+        Apply the incoming timeline to `video` atomically and bump its version.
+        `metadata_fields` are extra Video fields already set on the instance
+        (name, tags, …) to persist in the same transaction.
+        Raises TimelineConflict if `base_version` is given and stale, and
+        TimelineError if it is given but not an integer.
+        Returns {"version", "segment_ids", "created", "updated", "deleted"}.
+        """
+        if base_version is not None and not SegmentTimeline._is_version(base_version):
+            raise TimelineError("'version' must be an integer")
+
+        with transaction.atomic():
+            existing = SegmentTimeline._lock(video, base_version)
+            cards = SegmentTimeline.resolve_question_cards(segments, user, org)
+            return SegmentTimeline._persist(video, existing, segments, cards, metadata_fields)
+
+    # ======================================================
+    # Incremental patches
+    # ======================================================
+    @staticmethod
+    def _segment_at(timeline, op):
+        index = op.get("index")
+        if not isinstance(index, int) or not 0 <= index < len(timeline):
+            raise TimelineError(f"{op.get('op')}: index {index!r} out of range")
+        return index, timeline[index]
+
+    @staticmethod
+    def _time(op, key):
+        value = op.get(key)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise TimelineError(f"{op.get('op')}: '{key}' must be a number")
+        return float(value)
+
+    @staticmethod
+    def apply_op(timeline, op, cards):
+        """
+        Apply one operation to the in-memory timeline (list of
+        {"id", "source": [start, end], "card"}). Indexes refer to the timeline
+        as left by the previous operation, like JSON Patch paths.
+        """
+        name = op.get("op")
+
+        if name == "move_boundary":
+            # Move the end of segment `index`. If the next segment starts right
+            # there its start moves along; across a gap the end may only grow
+            # up to the next segment's start.
+            index, seg = SegmentTimeline._segment_at(timeline, op)
+            to = SegmentTimeline._time(op, "to")
+            nxt = timeline[index + 1] if index + 1 < len(timeline) else None
+            adjacent = nxt is not None and nxt["source"][0] == seg["source"][1]
+            if adjacent:
+                in_range = seg["source"][0] < to < nxt["source"][1]
+                upper = nxt["source"][1]
+            else:
+                upper = nxt["source"][0] if nxt else float("inf")
+                in_range = seg["source"][0] < to <= upper
+            if not in_range:
+                raise TimelineError(f"move_boundary: {to} is outside ({seg['source'][0]}, {upper})")
+            if adjacent:
+                nxt["source"][0] = to
+            seg["source"][1] = to
+
+        elif name == "split":
+            index, seg = SegmentTimeline._segment_at(timeline, op)
+            at = SegmentTimeline._time(op, "at")
+            start, end = seg["source"]
+            if not start < at < end:
+                raise TimelineError(f"split: {at} is outside ({start}, {end})")
+            seg["source"][1] = at
+            timeline.insert(index + 1, {"id": None, "source": [at, end], "card": None})
+
+        elif name == "merge":
+            # Merge segment `index` with the one after it
+            index, seg = SegmentTimeline._segment_at(timeline, op)
+            if index + 1 >= len(timeline):
+                raise TimelineError("merge: no segment after the last one")
+            nxt = timeline[index + 1]
+            if seg["card"] and nxt["card"] and seg["card"].id != nxt["card"].id:
+                raise TimelineError("merge: both segments carry different question cards")
+            seg["source"][1] = nxt["source"][1]
+            seg["card"] = seg["card"] or nxt["card"]
+            del timeline[index + 1]
+
+        elif name == "attach_card":
+            _, seg = SegmentTimeline._segment_at(timeline, op)
+            card = cards.get(SegmentTimeline._int_id(op.get("card_id")))
+            if card is None:
+                raise TimelineError(f"attach_card: question card {op.get('card_id')!r} not found")
+            seg["card"] = card
+
+        elif name == "detach_card":
+            _, seg = SegmentTimeline._segment_at(timeline, op)
+            seg["card"] = None
+
+        else:
+            raise TimelineError(f"Unsupported op: {name!r}")
+
+    @staticmethod
+    def patch(video, ops, base_version, org):
+        """
+        Apply a list of operations against `base_version` of the timeline.
+        Raises TimelineConflict on a stale version and TimelineError on a bad op
+        (nothing is written in either case).
+        """
+        if not isinstance(ops, list) or not ops:
+            raise TimelineError("'ops' must be a non-empty list")
+        if not SegmentTimeline._is_version(base_version):
+            raise TimelineError("'version' (integer) is required")
+
+        with transaction.atomic():
+            existing = SegmentTimeline._lock(video, base_version)
+
+            # Cards referenced by attach_card must belong to the video's org
+            card_ids = {
+                SegmentTimeline._int_id(op.get("card_id"))
+                for op in ops
+                if isinstance(op, dict) and op.get("op") == "attach_card"
+            }
+            card_ids.discard(None)
+            current_ids = {seg.question_card_id for seg in existing.values() if seg.question_card_id}
+            cards = QuestionCard.objects.filter(
+                Q(id__in=current_ids) | Q(id__in=card_ids, organization=org)
+            ).in_bulk()
+
+            timeline = [
+                {
+                    "id": seg.id,
+                    "source": [seg.source_start, seg.source_end],
+                    "card": cards.get(seg.question_card_id),
+                }
+                for seg in sorted(existing.values(), key=lambda s: (s.position, s.id))
+            ]
+            for op in ops:
+                if not isinstance(op, dict):
+                    raise TimelineError("Each op must be an object")
+                SegmentTimeline.apply_op(timeline, op, cards)
+
+            segments = [{"id": seg["id"], "source": seg["source"]} for seg in timeline]
+            return SegmentTimeline._persist(
+                video, existing, segments, [seg["card"] for seg in timeline]
+            )
@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Meeting, Video, VideoSegment
+
+
+class VideoAggregates:
+    """
+    Keeps Video.total_length / segment_count / question_count and the
+    Meeting.video_length_sec / questions_count rollup in sync with segments.
+    Call inside the same transaction that writes the segments.
+    """
+
+    @staticmethod
+    def segment_totals(segments):
+        """Group a VideoSegment queryset by video → {video_id: {field: value}}."""
+        rows = (
+            segments.values("video_id")
+            .order_by()
+            .annotate(
+                total_length=Coalesce(
+                    Sum(F("source_end") - F("source_start")),
+                    Value(0.0),
+                    output_field=FloatField(),
+                ),
+                segment_count=Count("id"),
+                question_count=Count("question_card_id"),
+            )
+        )
+        return {row.pop("video_id"): row for row in rows}
+
+    @staticmethod
+    def refresh_video(video):
+        totals = VideoAggregates.segment_totals(
+            VideoSegment.objects.filter(video_id=video.id)
+        ).get(video.id, {"total_length": 0.0, "segment_count": 0, "question_count": 0})
+
+        for field, value in totals.items():
+            setattr(video, field, value)
+        Video.objects.filter(id=video.id).update(**totals)
+
+        if video.meeting_id:
+            VideoAggregates.refresh_meeting(video.meeting_id, video.organization_id)
+        return totals
+
+    @staticmethod
+    def refresh_meeting(meeting_id, org_id=None):
+        totals = Video.objects.filter(meeting_id=meeting_id).aggregate(
+            length=Coalesce(Sum("total_length"), Value(0.0), output_field=FloatField()),
+            questions=Coalesce(Sum("question_count"), Value(0)),
+        )
+        Meeting.objects.filter(id=meeting_id).update(
+            video_length_sec=int(round(totals["length"])),
+            questions_count=totals["questions"],
+        )
+
+        if org_id is None:
+            org_id = Meeting.objects.filter(id=meeting_id).values_list("organization_id", flat=True).first()
+        if org_id:
+            transaction.on_commit(lambda: cache.delete(f"org_meetings:{org_id}"))
+
+    @staticmethod
+    def backfill(videos=None, batch_size=500):
+        """Recompute every video (or the given queryset) plus their meetings. Returns the video count."""
+        videos = videos if videos is not None else Video.objects.all()
+        video_ids = list(videos.values_list("id", flat=True).order_by("id"))
+        meeting_ids = set()
+
+        for start in range(0, len(video_ids), batch_size):
+            batch_ids = video_ids[start:start + batch_size]
+            totals = VideoAggregates.segment_totals(
+                VideoSegment.objects.filter(video_id__in=batch_ids)
+            )
+
+            batch = []
+            for video in Video.objects.filter(id__in=batch_ids).only("id", "meeting_id"):
+                row = totals.get(video.id, {"total_length": 0.0, "segment_count": 0, "question_count": 0})
+                for field, value in row.items():
+                    setattr(video, field, value)
+                batch.append(video)
+                if video.meeting_id:
+                    meeting_ids.add(video.meeting_id)
+
+            with transaction.atomic():
+                Video.objects.bulk_update(batch, ["total_length", "segment_count", "question_count"])
+
+        for meeting_id in meeting_ids:
+            with transaction.atomic():
+                VideoAggregates.refresh_meeting(meeting_id)
+
+        return len(video_ids)
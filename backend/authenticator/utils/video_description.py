@@ -1,80 +1,87 @@
+import logging
+
 from openai import OpenAI
-import traceback
 from django.conf import settings
 import cv2
 import base64
 
+from ..perf import record_llm_usage, timed
+
+logger = logging.getLogger(__name__)
+
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
 class VideoDescriber:
     @staticmethod
+    @timed("media_processing_duration_ms", task="frame_sample")
     def sample_frames(video_path, count=4):
-        print("📸 Sampling frames from:", video_path)
+        logger.debug("📸 Sampling frames from: %s", video_path)
         frames = []
         cap = cv2.VideoCapture(video_path)
 
         if not cap.isOpened():
-            print("❌ Could not open video file.")
+            logger.warning("❌ Could not open video file.")
             return []
 
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        print(f"🔢 Total frames in video: {total_frames}")
+        logger.debug("🔢 Total frames in video: %s", total_frames)
         frame_idxs = [int(i * total_frames / count) for i in range(count)]
 
         for idx in frame_idxs:
-            print(f"⏩ Seeking frame {idx}...")
+            logger.debug("⏩ Seeking frame %s...", idx)
             cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
             success, frame = cap.read()
             if success:
-                print(f"✅ Successfully read frame {idx}")
+                logger.debug("✅ Successfully read frame %s", idx)
                 _, buffer = cv2.imencode('.jpg', frame)
                 base64_img = base64.b64encode(buffer).decode("utf-8")
                 data_uri = f"data:image/jpeg;base64,{base64_img}"
                 frames.append(data_uri)
             else:
-                print(f"❌ Failed to read frame {idx}")
+                logger.warning("❌ Failed to read frame %s", idx)
 
         cap.release()
-        print(f"📦 Collected {len(frames)} frames.")
+        logger.debug("📦 Collected %s frames.", len(frames))
         return frames
 
     @staticmethod
     def generate_description_from_frames(frames):
-        print("🧠 Sending frames to GPT for description...")
+        logger.debug("🧠 Sending frames to GPT for description...")
         if not frames:
-            print("⚠️ No frames provided.")
+            logger.warning("⚠️ No frames provided.")
             return ""
 
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Based on the 4 sampled frames, describe what this video is about in 1-2 sentences.",
-                            },
-                            *[
+            with timed("llm_call_duration_ms", model="gpt-4o", purpose="video_description"):
+                response = client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
                                 {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": frame
+                                    "type": "text",
+                                    "text": "Based on the 4 sampled frames, describe what this video is about in 1-2 sentences.",
+                                },
+                                *[
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {
+                                            "url": frame
+                                        }
                                     }
-                                }
-                                for frame in frames
+                                    for frame in frames
+                                ]
                             ]
-                        ]
-                    }
-                ],
-                max_tokens=200
-            )
+                        }
+                    ],
+                    max_tokens=200
+                )
+            record_llm_usage("gpt-4o", response)
 
-            print("✅ GPT response received")
+            logger.debug("✅ GPT response received")
             return response.choices[0].message.content.strip()
 
         except Exception as e:
-            print("❌ Error during OpenAI Vision request:")
-            traceback.print_exc()
+            logger.exception("❌ Error during OpenAI Vision request: %s", e)
             return "Could not generate description."
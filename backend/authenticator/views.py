@@ -1,5 +1,6 @@
 import json
-from django.http import JsonResponse
+import logging
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
@@ -12,20 +13,50 @@ from .models import Meeting, VideoSegment, QuestionCard, Bot, Participant, Surve
 from django.utils.timezone import now
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.cache import cache
+from django_redis import get_redis_connection
 
 import os
 from django.conf import settings
 import datetime
 import random
+import time
 from .models import Meeting, Video
 
 from .utils.video_description import VideoDescriber
+from .utils.video_aggregates import VideoAggregates
+from .utils.timeline import SegmentTimeline, TimelineConflict, TimelineError
+from .utils.playback_bundle import PlaybackBundle
+from .utils.bot_pregeneration import BotAnswerPregenerator
+from .utils.llm_scheduler import PRIORITY_PREGEN, LLMDeadlineExceeded, scheduler as llm_scheduler
+from . import join_tickets, org_feed, outbox, perf, profiling
+from .async_redis import async_cache
+from .pagination import DEFAULT_PAGE_SIZE, InvalidCursor, keyset_page, parse_page_size
+from .serializers import (
+    FastJsonResponse,
+    make_absolute_media_url,
+    serialize_active_segment,
+    serialize_bot,
+    serialize_question_card,
+    serialize_question_card_detail,
+    serialize_segment,
+    serialize_survey,
+    serialize_video,
+)
+from .org_access import (
+    ROLE_OWNER,
+    get_org_role,
+    invalidate_org_role,
+    require_org_role,
+    user_in_org,
+)
 from django.dispatch import receiver
 from .models import UserProfile
 from django.db.models.signals import post_save
 from django.core.files.base import ContentFile
-from django.utils.crypto import get_random_string
-from django.db import models
+from django.utils.crypto import constant_time_compare, get_random_string
+from django.db import models, transaction
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
@@ -62,7 +93,7 @@ def get_meeting_id(request, org_id, room_name):
         }, status=200)
 
     except Exception as e:
-        print("❌ Error in get_meeting_id:", e)
+        logger.exception("❌ Error in get_meeting_id: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
         
 @csrf_exempt
@@ -87,12 +118,11 @@ def get_user_stats(request):
     total_video_length = meetings.aggregate(models.Sum("video_length_sec"))["video_length_sec__sum"] or 0
 
     # Unique collaborators across meetings (from shared_with + participants)
+    # ✅ Two queries total instead of one participants query per meeting
     collaborators = set()
-    for m in meetings:
-        # shared_with JSON list
-        collaborators.update(m.shared_with or [])
-        # participants email
-        collaborators.update(m.participants.values_list("email", flat=True))
+    for shared_with in meetings.values_list("shared_with", flat=True):
+        collaborators.update(shared_with or [])
+    collaborators.update(Participant.objects.filter(meeting__owner=user).values_list("email", flat=True))
     total_collaborators = len(collaborators)
 
     # Earliest meeting date for "membership" proxy (or fallback to user.date_joined if available)
@@ -123,29 +153,29 @@ def get_user_stats(request):
 @csrf_exempt
 def google_login_view(request):
     if request.method != 'POST':
-        print("❌ Wrong method:", request.method)
+        logger.warning("❌ Wrong method: %s", request.method)
         return JsonResponse({'error': 'Only POST allowed'}, status=405)
 
     try:
         data = json.loads(request.body)
         access_token = data.get('token')
-        print("🔑 Access token received:", access_token[:10] + "..." if access_token else None)
+        logger.debug("🔑 Access token received: %s", bool(access_token))
 
         # Call Google userinfo endpoint
         user_info = requests.get(
             "https://www.googleapis.com/oauth2/v3/userinfo",
             headers={"Authorization": f"Bearer {access_token}"}
         ).json()
-        print("📩 Google user info:", user_info)
+        logger.debug("📩 Google user info: %s", user_info)
 
         email = user_info.get("email")
         name = user_info.get("name")
         picture_url = user_info.get("picture") or \
             "https://images.unsplash.com/photo-1509042239860-f550ce710b93?fit=crop&w=400&q=80"
-        print(f"👤 Parsed -> Email: {email}, Name: {name}, Picture: {picture_url}")
+        logger.debug("👤 Parsed -> Email: %s, Name: %s, Picture: %s", email, name, picture_url)
 
         if not email:
-            print("❌ No email found in Google user info")
+            logger.warning("❌ No email found in Google user info")
             return JsonResponse({'error': 'Email not found'}, status=400)
 
         User = get_user_model()
@@ -153,34 +183,34 @@ def google_login_view(request):
             email=email,
             defaults={'username': email, 'first_name': name or ''}
         )
-        print("✅ User created?" , created, "| User:", user)
+        logger.debug("✅ User created? %s | User: %s", created, user)
 
         # ✅ safely create or update UserProfile
         profile, prof_created = UserProfile.objects.get_or_create(user=user)
-        print("✅ UserProfile created?", prof_created, "| Profile:", profile)
+        logger.debug("✅ UserProfile created? %s | Profile: %s", prof_created, profile)
 
         # ✅ Update if missing OR Google picture changed
         should_update_picture = False
         if not profile.profile_picture:
-            print("🖼 No existing profile picture — need to fetch")
+            logger.debug("🖼 No existing profile picture — need to fetch")
             should_update_picture = True
         elif profile.profile_picture and picture_url not in profile.profile_picture.url:
-            print("♻️ Google picture URL changed, updating local copy")
+            logger.debug("♻️ Google picture URL changed, updating local copy")
             should_update_picture = True
 
         if should_update_picture:
             try:
                 resp = requests.get(picture_url, timeout=5)
-                print("🌐 Fetched picture -> Status:", resp.status_code, "Length:", len(resp.content))
+                logger.debug("🌐 Fetched picture -> Status: %s Length: %s", resp.status_code, len(resp.content))
                 if resp.status_code == 200:
                     filename = f"{user.id}_{get_random_string(8)}.jpg"
                     profile.profile_picture.save(filename, ContentFile(resp.content), save=True)
-                    print("✅ Saved/updated profile picture as:", filename)
+                    logger.debug("✅ Saved/updated profile picture as: %s", filename)
             except Exception as e:
-                print("⚠️ Could not fetch profile picture:", e)
+                logger.warning("⚠️ Could not fetch profile picture: %s", e)
 
         login(request, user)
-        print("🔓 User logged in:", user.email)
+        logger.info("🔓 User logged in: %s", user.email)
 
         return JsonResponse({
             'message': 'Logged in',
@@ -189,7 +219,7 @@ def google_login_view(request):
             'picture': request.build_absolute_uri(profile.profile_picture.url) if profile.profile_picture else None,
         })
     except Exception as e:
-        print("💥 Exception in google_login_view:", e)
+        logger.exception("💥 Exception in google_login_view: %s", e)
         return JsonResponse({'error': str(e)}, status=400)
     
 @login_required
@@ -272,25 +302,24 @@ def delete_meeting(request, org_id, meeting_name):
                 status=404
             )
 
-        org = meeting.organization
         user = request.user
 
         # ✅ Permission check: only meeting owner, org owner, or org member can delete
-        if user != meeting.owner and user != org.owner and user not in org.members.all():
+        if user.id != meeting.owner_id and not user_in_org(user, meeting.organization_id):
             return JsonResponse({'error': 'Not authorized to delete this meeting.'}, status=403)
 
         # ✅ Perform deletion
         meeting.delete()
-        print(f"🗑️ Deleted meeting '{meeting_name}' from org {org_id}")
+        logger.info("🗑️ Deleted meeting '%s' from org %s", meeting_name, org_id)
 
         # ✅ Invalidate cache after commit
         cache.delete(f"org_meetings:{org_id}")
-        print(f"🧹 Cache invalidated for org_meetings:{org_id}")
+        logger.info("🧹 Cache invalidated for org_meetings:%s", org_id)
 
         return JsonResponse({'message': f"Meeting '{meeting_name}' deleted successfully."})
 
     except Exception as e:
-        print("🔥 DELETE MEETING ERROR:", str(e))
+        logger.exception("🔥 DELETE MEETING ERROR: %s", str(e))
         return JsonResponse({'error': str(e)}, status=400)
 
 @csrf_exempt
@@ -313,9 +342,8 @@ def archive_meeting(request, org_id, meeting_name):
             )
 
         # ✅ Optional: Permission check — only org owner or meeting owner can archive
-        org = meeting.organization
         user = request.user
-        if user != org.owner and user != meeting.owner and user not in org.members.all():
+        if user.id != meeting.owner_id and not user_in_org(user, meeting.organization_id):
             return JsonResponse({'error': "Not authorized to archive this meeting"}, status=403)
 
         meeting.currently_playing = False
@@ -347,9 +375,8 @@ def unarchive_meeting(request, org_id, meeting_name):
                 status=404
             )
 
-        org = meeting.organization
         user = request.user
-        if user != org.owner and user != meeting.owner and user not in org.members.all():
+        if user.id != meeting.owner_id and not user_in_org(user, meeting.organization_id):
             return JsonResponse({'error': "Not authorized to unarchive this meeting"}, status=403)
 
         meeting.currently_playing = True
@@ -364,6 +391,7 @@ def unarchive_meeting(request, org_id, meeting_name):
     
 @csrf_exempt
 @login_required
+@require_org_role()
 def create_meeting(request, org_id):
     if request.method != 'POST':
         return JsonResponse({'error': 'Only POST allowed'}, status=405)
@@ -381,15 +409,8 @@ def create_meeting(request, org_id):
         shared_with = data.get("sharedWith", [])
         video_segments = data.get("VideoSegments", [])
 
-        # ✅ Ensure org exists
-        try:
-            org = Organization.objects.get(id=org_id)
-        except Organization.DoesNotExist:
-            return JsonResponse({'error': f"Organization with id {org_id} not found"}, status=404)
-
-        # ✅ Permissions: must be org member or owner
-        if org.owner != user and user not in org.members.all():
-            return JsonResponse({'error': "You are not part of this organization"}, status=403)
+        # ✅ Org existence + membership checked by @require_org_role
+        org = Organization.objects.get(id=org_id)
 
         # ✅ Warn if duplicate name already exists in org
         if Meeting.objects.filter(organization=org, name=name).exists():
@@ -441,35 +462,29 @@ def create_meeting(request, org_id):
         })
 
     except Exception as e:
-        print("🔥 CREATE MEETING ERROR:", str(e))
+        logger.exception("🔥 CREATE MEETING ERROR: %s", str(e))
         return JsonResponse({'error': str(e)}, status=400)
 
 @login_required
+@require_org_role()
 def get_org_meetings(request, org_id):
     try:
         cache_key = f"org_meetings:{int(org_id)}"
-        print(f"🔑 Cache key: {cache_key}")
+        logger.debug("🔑 Cache key: %s", cache_key)
 
         # ✅ Try cache first
         cached_data = cache.get(cache_key)
         if cached_data:
-            print("📦 Using cached data")
+            logger.debug("📦 Using cached data")
             return JsonResponse(cached_data)
 
-        # ✅ Validate organization
-        try:
-            org = Organization.objects.get(id=org_id)
-        except Organization.DoesNotExist:
-            return JsonResponse({"error": f"Organization {org_id} not found"}, status=404)
-
-        # ✅ Permission check
-        user = request.user
-        if user != org.owner and user not in org.members.all():
-            return JsonResponse({"error": "Not authorized for this organization"}, status=403)
-
-        # ✅ Query DB for all meetings in org
-        meetings = Meeting.objects.filter(organization=org).order_by("-created_at")
-        print(f"🔍 Found {meetings.count()} meetings for org {org_id}")
+        # ✅ Query DB for all meetings in org (membership checked by @require_org_role)
+        meetings = (
+            Meeting.objects.filter(organization_id=org_id)
+            .select_related("owner")
+            .order_by("-created_at")
+        )
+        logger.debug("🔍 Found %s meetings for org %s", meetings.count(), org_id)
 
         # ✅ Serialize meeting data
         meeting_data = []
@@ -491,12 +506,12 @@ def get_org_meetings(request, org_id):
 
         # ✅ Cache for 5 minutes
         cache.set(cache_key, response_obj, timeout=60 * 5)
-        print(f"💾 Cached {len(meeting_data)} meetings under {cache_key}")
+        logger.debug("💾 Cached %s meetings under %s", len(meeting_data), cache_key)
 
         return JsonResponse(response_obj)
 
     except Exception as e:
-        print("🔥 GET ORG MEETINGS ERROR:", e)
+        logger.exception("🔥 GET ORG MEETINGS ERROR: %s", e)
         return JsonResponse({'error': str(e)}, status=400)
 
 @csrf_exempt
@@ -532,7 +547,7 @@ def get_organizations(request):
 @login_required
 def create_organization(request):
     if request.method != "POST":
-        print("[DEBUG] Invalid method:", request.method)
+        logger.warning("❌ Invalid request method: %s", request.method)
         return JsonResponse({"error": "Only POST allowed"}, status=405)
 
     try:
@@ -541,11 +556,11 @@ def create_organization(request):
         description = request.POST.get("description", "")
         image = request.FILES.get("image")
 
-        print("[DEBUG] Incoming POST data:", request.POST.dict())
-        print("[DEBUG] Uploaded files:", request.FILES)
+        logger.debug("📥 Incoming POST data: %s", request.POST.dict())
+        logger.debug("📥 Uploaded files: %s", request.FILES)
 
         if not name:
-            print("[DEBUG] Missing organization name")
+            logger.warning("⚠️ Missing organization name")
             return JsonResponse({"error": "Missing organization name"}, status=400)
 
         # --- Default image if none provided ---
@@ -557,9 +572,9 @@ def create_organization(request):
             try:
                 with open(default_path, "rb") as f:
                     image = ImageFile(f, name="sb_default.jpg")
-                print("[DEBUG] Using default Santa Barbara image")
+                logger.debug("🖼 Using default Santa Barbara image")
             except Exception as e:
-                print("[DEBUG] Failed to load default image:", e)
+                logger.warning("⚠️ Failed to load default image: %s", e)
                 image = None  # fallback to null
 
         # --- Create org ---
@@ -570,7 +585,7 @@ def create_organization(request):
             image=image,
         )
         org.members.add(request.user)  # ✅ owner auto-added as member
-        print("[DEBUG] Organization created:", org.id, org.name)
+        logger.info("🏢 Organization created: %s %s", org.id, org.name)
 
         # --- Cache keys ---
         owner_cache_key = f"organization_name:{org.id}"
@@ -579,7 +594,7 @@ def create_organization(request):
         # --- Clear old caches ---
         cache.delete(owner_cache_key)
         cache.delete(email_cache_key)
-        print("[DEBUG] Cleared cache keys:", owner_cache_key, email_cache_key)
+        logger.debug("🧹 Cleared cache keys: %s %s", owner_cache_key, email_cache_key)
 
         # --- Build org data ---
         org_data = {
@@ -593,7 +608,7 @@ def create_organization(request):
         # --- Set caches ---
         cache.set(owner_cache_key, request.user.email, timeout=3600)
         cache.set(email_cache_key, [org_data], timeout=3600)
-        print("[DEBUG] Cached organization data for:", request.user.email)
+        logger.debug("💾 Cached organization data for: %s", request.user.email)
 
         return JsonResponse({
             "message": "Organization created successfully",
@@ -601,7 +616,7 @@ def create_organization(request):
         })
 
     except Exception as e:
-        print("[DEBUG] Exception during organization creation:", str(e))
+        logger.exception("🔥 Exception during organization creation: %s", str(e))
         return JsonResponse({"error": str(e)}, status=400)
 
 @csrf_exempt
@@ -654,6 +669,7 @@ def join_organization(request, org_id):
 
         # ✅ Otherwise, add as member
         org.members.add(user)
+        invalidate_org_role(org.id, user.id)
 
         # Invalidate cache
         email_cache_key = f"user:{user.email}_organizations"
@@ -685,6 +701,7 @@ def delete_organization(request, org_id):
             return JsonResponse({"error": "Only the owner can delete this organization"}, status=403)
 
         org.delete()
+        invalidate_org_role(org_id)
         owner_cache_key = f"organization_name:{org_id}"
         email_cache_key = f"user:{request.user.email}_organizations"
 
@@ -706,27 +723,16 @@ def check_organization_owner(request, org_id):
         return JsonResponse({"error": "Only GET allowed"}, status=405)
 
     try:
-        owner_cache_key = f"organization_name:{org_id}"
-        cached_owner_email = cache.get(owner_cache_key)
-
-        if cached_owner_email:
-            # ✅ If cache has it, just compare emails
-            is_owner = (cached_owner_email == request.user.email)
-        else:
-            # ❌ Not in cache → check DB
-            org = Organization.objects.get(id=org_id)
-            is_owner = (org.owner == request.user)
-
-            # ✅ Populate cache for future calls
-            cache.set(owner_cache_key, org.owner.email, timeout=3600)
+        # ✅ Cached (user, org) role lookup
+        role = get_org_role(request.user, org_id)
+        if role is None:
+            return JsonResponse({"error": "Organization not found"}, status=404)
 
         return JsonResponse({
             "organization_id": org_id,
-            "is_owner": is_owner
+            "is_owner": role == ROLE_OWNER
         })
 
-    except Organization.DoesNotExist:
-        return JsonResponse({"error": "Organization not found"}, status=404)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
@@ -747,17 +753,7 @@ def get_meeting_segments(request, meeting_name):
             }
 
             if seg.question_card:
-                qc = seg.question_card
-                segment_info["questionCard"] = {
-                    "id": str(qc.id),
-                    "question": qc.question,
-                    "answers": qc.answers,
-                    "difficulty": qc.difficulty,
-                    "type": qc.type,
-                    "displayType": qc.display_type,
-                    "showWinner": qc.show_winner,
-                    "live": qc.live
-                }
+                segment_info["questionCard"] = serialize_question_card(seg.question_card)
 
             segment_data.append(segment_info)
 
@@ -829,16 +825,7 @@ def refresh_meeting_segments(request, meeting_name):
                     show_winner=q_data.get("showWinner"),
                     live=q_data.get("live")
                 )
-                q_card_dict = {
-                    "id": str(question_card.id),
-                    "question": question_card.question,
-                    "answers": question_card.answers,
-                    "difficulty": question_card.difficulty,
-                    "type": question_card.type,
-                    "displayType": question_card.display_type,
-                    "showWinner": question_card.show_winner,
-                    "live": question_card.live,
-                }
+                q_card_dict = serialize_question_card(question_card)
 
             VideoSegment.objects.create(
                 meeting=meeting,
@@ -877,6 +864,7 @@ def edit_video(request, video_id, org_id, room_name):
         new_name = data.get("name")
         new_tags = data.get("tags", [])
         new_thumbnail = data.get("thumbnail_url")
+        base_version = data.get("version")  # optional optimistic concurrency
 
         video = (
             Video.objects.filter(id=video_id)
@@ -888,83 +876,10 @@ def edit_video(request, video_id, org_id, room_name):
 
         org = video.organization
         user = request.user
-        is_owner = hasattr(org, "owner") and org.owner == user
-        is_member = hasattr(org, "members") and user in org.members.all()
-
-        if not (is_owner or is_member):
+        if not user_in_org(user, org):
             return JsonResponse({"error": "User is not part of this organization."}, status=403)
 
-        print(f"🧩 Editing metadata and segments for video {video.id} in org {org.name}")
-
-        # 🔁 Replace old segments
-        VideoSegment.objects.filter(video=video).delete()
-        new_segments = []
-
-        for seg in video_segments:
-            q_data = seg.get("questionCardData")
-            question_card = None
-            q_card_dict = None
-
-            # ✅ Handle question cards properly
-            if seg.get("isQuestionCard") and q_data:
-                q_card_id = q_data.get("id")
-
-                if q_card_id:
-                    # Try to find existing question card
-                    question_card = QuestionCard.objects.filter(id=q_card_id).first()
-                    if not question_card:
-                        print(f"⚠️ QuestionCard {q_card_id} not found — creating new one.")
-                        question_card = QuestionCard.objects.create(
-                            user=request.user,
-                            organization=org,
-                            question=q_data["question"],
-                            answers=q_data["answers"],
-                            difficulty=q_data["difficulty"],
-                            type=q_data["type"],
-                            display_type=q_data.get("displayType"),
-                            show_winner=q_data.get("showWinner"),
-                            live=q_data.get("live"),
-                            correct_answers=q_data.get("correctAnswer", []),
-                        )
-                else:
-                    # No id provided — new question card
-                    question_card = QuestionCard.objects.create(
-                        user=request.user,
-                        organization=org,
-                        question=q_data["question"],
-                        answers=q_data["answers"],
-                        difficulty=q_data["difficulty"],
-                        type=q_data["type"],
-                        display_type=q_data.get("displayType"),
-                        show_winner=q_data.get("showWinner"),
-                        live=q_data.get("live"),
-                        correct_answers=q_data.get("correctAnswer", []),
-                    )
-
-                q_card_dict = {
-                    "id": str(question_card.id),
-                    "question": question_card.question,
-                    "answers": question_card.answers,
-                    "difficulty": question_card.difficulty,
-                    "type": question_card.type,
-                    "displayType": question_card.display_type,
-                    "showWinner": question_card.show_winner,
-                    "live": question_card.live,
-                }
-
-            # ✅ Create new video segment
-            VideoSegment.objects.create(
-                video=video,
-                source_start=seg["source"][0],
-                source_end=seg["source"][1],
-                question_card=question_card,
-            )
-
-            new_segments.append({
-                "source": [seg["source"][0], seg["source"][1]],
-                "isQuestionCard": seg.get("isQuestionCard", False),
-                "questionCardData": q_card_dict,
-            })
+        logger.info("🧩 Editing metadata and segments for video %s in org %s", video.id, org.name)
 
         # 🕒 Handle updated timestamps
         if new_timestamp:
@@ -981,7 +896,20 @@ def edit_video(request, video_id, org_id, room_name):
         if new_thumbnail is not None:
             video.thumbnail_url = new_thumbnail
 
-        video.save(update_fields=["created_at", "name", "tags", "thumbnail_url"])
+        # 🔁 Diff segments against the stored timeline and save atomically
+        try:
+            timeline = SegmentTimeline.save(
+                video,
+                video_segments,
+                user=request.user,
+                org=org,
+                metadata_fields=["created_at", "name", "tags", "thumbnail_url"],
+                base_version=base_version,
+            )
+        except TimelineConflict as e:
+            return JsonResponse({"error": str(e), "version": e.current_version}, status=409)
+        except TimelineError as e:
+            return JsonResponse({"error": str(e)}, status=400)
 
         # 🌐 Build absolute URLs
         if video.url and not video.url.startswith("http"):
@@ -1013,19 +941,13 @@ def edit_video(request, video_id, org_id, room_name):
         )
         cache.delete(f"org_videos:{org.id}")
 
+        # 📦 Rooms currently playing this video get a fresh bundle
+        PlaybackBundle.rebuild_for(request, org.id, video_id=video.id)
+
         # 🔔 Notify WebSocket listeners
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"org_{org.id}_updates",
-            {
-                "type": "org_update",
-                "category": "video",
-                "action": "update",
-                "payload": {"id": video.id},
-            },
-        )
+        org_feed.publish(org.id, "video", "update", {"id": video.id}, data=serialize_org_video(request, video.id))
 
-        print(f"📡 Sent WebSocket update for edited video {video.id}")
+        logger.info("📡 Sent WebSocket update for edited video %s", video.id)
 
         # ✅ Return updated metadata
         return JsonResponse({
@@ -1035,10 +957,80 @@ def edit_video(request, video_id, org_id, room_name):
             "tags": video.tags or [],
             "video_url": video_url,
             "thumbnail_url": thumbnail_url,
+            "version": timeline["version"],
+            "segmentIds": [str(seg_id) for seg_id in timeline["segment_ids"]],
         }, status=200)
 
     except Exception as e:
-        print("❌ Error in edit_video:", e)
+        logger.exception("❌ Error in edit_video: %s", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+@csrf_exempt
+@login_required
+def patch_video_timeline(request, video_id):
+    """
+    Incremental timeline edit. Body:
+      {
+        "version": <version the client edited>,
+        "ops": [
+          {"op": "move_boundary", "index": 2, "to": 12.5},
+          {"op": "split", "index": 4, "at": 30.0},
+          {"op": "merge", "index": 4},
+          {"op": "attach_card", "index": 5, "card_id": 12},
+          {"op": "detach_card", "index": 5}
+        ]
+      }
+    Indexes refer to the timeline as left by the previous op. A stale version
+    returns 409 with the current one; the applied delta is broadcast to the org.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Only POST allowed"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        ops = data.get("ops")
+        base_version = data.get("version")
+
+        video = Video.objects.filter(id=video_id).first()
+        if not video:
+            return JsonResponse({"error": f"Video {video_id} not found."}, status=404)
+
+        if not user_in_org(request.user, video.organization_id):
+            return JsonResponse({"error": "User is not part of this organization."}, status=403)
+
+        try:
+            timeline = SegmentTimeline.patch(video, ops, base_version, org=video.organization_id)
+        except TimelineConflict as e:
+            return JsonResponse({"error": str(e), "version": e.current_version}, status=409)
+        except TimelineError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        segment_ids = [str(seg_id) for seg_id in timeline["segment_ids"]]
+
+        # 💾 Drop stale listings / playback caches
+        cache.delete(f"video:{video.id}")
+        cache.delete(f"org_videos:{video.organization_id}")
+        PlaybackBundle.rebuild_for(request, video.organization_id, video_id=video.id)
+
+        # 🔔 Broadcast the delta so other editors can replay it
+        org_feed.publish(video.organization_id, "video_timeline", "patch", {
+            "id": video.id,
+            "base_version": int(base_version),
+            "version": timeline["version"],
+            "ops": ops,
+            "segmentIds": segment_ids,
+            "videoLength": video.total_length,
+        })
+
+        return JsonResponse({
+            "message": "Timeline updated.",
+            "version": timeline["version"],
+            "segmentIds": segment_ids,
+            "videoLength": video.total_length,
+        }, status=200)
+
+    except Exception as e:
+        logger.exception("❌ Error in patch_video_timeline: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
@@ -1066,10 +1058,7 @@ def get_video_by_id(request, video_id):
         organization = video.organization
 
         # ✅ Authorization: must be part of org (owner or member)
-        is_owner = hasattr(organization, "owner") and organization.owner == request.user
-        is_member = hasattr(organization, "members") and request.user in organization.members.all()
-
-        if not (is_owner or is_member):
+        if not user_in_org(request.user, organization):
             return JsonResponse({"error": "User is not part of this organization."}, status=403)
 
         # ✅ Determine if video is individual (belongs to a meeting owned by user)
@@ -1077,74 +1066,14 @@ def get_video_by_id(request, video_id):
         if hasattr(video.meeting, "owner"):
             individual = video.meeting.owner == request.user
 
-        # ✅ Build segment and question card data
-        segments_data = []
-        for segment in video.segments.all():
-            q_data = None
-            if segment.question_card:
-                qc = segment.question_card
-                q_data = {
-                    "id": str(qc.id),
-                    "question": qc.question,
-                    "answers": qc.answers,
-                    "difficulty": qc.difficulty,
-                    "type": qc.type,
-                    "displayType": qc.display_type,
-                    "showWinner": qc.show_winner,
-                    "live": qc.live,
-                }
-
-            segments_data.append({
-                "id": str(segment.id),
-                "source": [segment.source_start, segment.source_end],
-                "isQuestionCard": bool(segment.question_card),
-                "questionCardData": q_data,
-            })
+        # ✅ Build metadata for frontend (segments, cards, absolute URLs)
+        metadata = serialize_video(request, video, individual)
 
-        # ✅ Convert stored relative paths into absolute URLs
-        from django.conf import settings
-        import os
-
-        # If the video.url is relative, prepend MEDIA_URL
-        if video.url and not video.url.startswith("http"):
-            video_url = request.build_absolute_uri(
-                os.path.join(settings.MEDIA_URL, video.url)
-            ).replace("\\", "/")
-        else:
-            video_url = video.url
-
-        # Same logic for thumbnail
-        if video.thumbnail_url and not video.thumbnail_url.startswith("http"):
-            thumbnail_url = request.build_absolute_uri(
-                os.path.join(settings.MEDIA_URL, video.thumbnail_url)
-            ).replace("\\", "/")
-        else:
-            thumbnail_url = video.thumbnail_url
-
-        # ✅ Build metadata for frontend
-        metadata = {
-            "id": str(video.id),
-            "videoName": video.name or "Untitled Video",
-            "videoTags": video.tags or [],
-            "videoLength": sum(
-                s.source_end - s.source_start for s in video.segments.all()
-            ),
-            "questionCards": segments_data,
-            "savedAt": video.created_at.isoformat(),
-            "videoUrl": video_url,
-            "organization_id": str(video.organization.id),
-            "individual": individual,
-            "thumbnail_url": thumbnail_url,
-            "associated_meeting_id": (
-                str(video.meeting.id) if video.meeting else None
-            ),
-        }
-
-        print(f"🎬 Returned metadata for video {video.id} ({video.name})")
-        return JsonResponse({"video": metadata}, status=200)
+        logger.debug("🎬 Returned metadata for video %s (%s)", video.id, video.name)
+        return FastJsonResponse({"video": metadata}, status=200)
 
     except Exception as e:
-        print("❌ Error in get_video_by_id:", e)
+        logger.exception("❌ Error in get_video_by_id: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
@@ -1175,13 +1104,10 @@ def check_meeting_access(request, org_id, meeting_id):
             "admin_access": False,
         })
 
-    org = meeting.organization  # ✅ fetch organization
-
     # ✅ Compute fresh values if not cached
     if admin_access is None:
         admin_access = (
-            org.owner == user
-            or org.members.filter(id=user.id).exists()
+            user_in_org(user, meeting.organization_id)
             or user_email in meeting.shared_with
         )
         cache.set(admin_cache_key, admin_access, timeout=300)
@@ -1352,10 +1278,10 @@ from .utils.smart_bot_answers import SmartBotAnswerEngine  # ✅ Import our help
 @login_required
 def return_bot_answers(request, meeting_name):
     try:
-        print("== Incoming GET Params ==")
-        print("Raw meeting_name:", meeting_name)
-        print("Decoded meeting_name:", meeting_name.encode().decode('utf-8', 'ignore'))
-        print("GET:", request.GET)
+        logger.debug("== Incoming GET Params ==")
+        logger.debug("Raw meeting_name: %s", meeting_name)
+        logger.debug("Decoded meeting_name: %s", meeting_name.encode().decode('utf-8', 'ignore'))
+        logger.debug("GET: %s", request.GET)
 
         user = request.user
         current_question = int(request.GET.get("currentQuestion", -1))
@@ -1367,13 +1293,13 @@ def return_bot_answers(request, meeting_name):
         question_type = request.GET.get("type", "")
         question_text = request.GET.get("questionText", "blank")
         
-        print("THE QUESTION TYPE IS:", question_type)
-        print("THE QUESTION TEXT IS:", question_text)
+        logger.debug("THE QUESTION TYPE IS: %s", question_type)
+        logger.debug("THE QUESTION TEXT IS: %s", question_text)
 
-        print("Parsed current_question:", current_question)
-        print("Parsed start_time:", start_time)
-        print("Parsed end_time:", end_time)
-        print("Frontend-provided answers:", frontend_answers)
+        logger.debug("Parsed current_question: %s", current_question)
+        logger.debug("Parsed start_time: %s", start_time)
+        logger.debug("Parsed end_time: %s", end_time)
+        logger.debug("Frontend-provided answers: %s", frontend_answers)
 
         if (
             current_question < 0 or start_time < 0 or end_time < 0 or
@@ -1383,10 +1309,10 @@ def return_bot_answers(request, meeting_name):
 
         # Load meeting object
         meeting = Meeting.objects.get(name=meeting_name)
-        print("Meeting found:", meeting.name)
+        logger.debug("Meeting found: %s", meeting.name)
 
         bots = meeting.bots.all()
-        print(f"Found {bots.count()} bots")
+        logger.debug("Found %s bots", bots.count())
 
         # Redis cache key
         redis_key = f"bot_answers:{meeting_name}:{question_id}"
@@ -1435,10 +1361,10 @@ def return_bot_answers(request, meeting_name):
         return JsonResponse({"botAnswers": enriched_results})
 
     except Meeting.DoesNotExist:
-        print("Meeting not found!")
+        logger.warning("⚠️ Meeting not found!")
         return JsonResponse({"error": "Meeting not found"}, status=404)
     except Exception as e:
-        print("Exception occurred:", str(e))
+        logger.exception("🔥 Exception occurred: %s", str(e))
         return JsonResponse({"error": str(e)}, status=400)
 
 
@@ -1543,61 +1469,70 @@ def store_video(request, org_id, meeting_name):
         thumbnail_name = f"{file_root}_thumb.jpg"
         thumbnail_path = os.path.join(settings.MEDIA_ROOT, base_storage_path, thumbnail_name)
         try:
-            subprocess.run([
-                "ffmpeg", "-y",
-                "-i", full_path,
-                "-ss", "00:00:01.000",
-                "-frames:v", "1",
-                "-update", "1",
-                "-q:v", "2",
-                "-f", "image2",
-                thumbnail_path
-            ], check=True)
+            with perf.timed("media_processing_duration_ms", task="video_thumbnail"):
+                subprocess.run([
+                    "ffmpeg", "-y",
+                    "-i", full_path,
+                    "-ss", "00:00:01.000",
+                    "-frames:v", "1",
+                    "-update", "1",
+                    "-q:v", "2",
+                    "-f", "image2",
+                    thumbnail_path
+                ], check=True)
             image_url = request.build_absolute_uri(
                 os.path.join(settings.MEDIA_URL, base_storage_path, thumbnail_name)
             ).replace("\\", "/")
-            print(f"🖼️ Thumbnail generated successfully: {image_url}")
+            logger.info("🖼️ Thumbnail generated successfully: %s", image_url)
         except subprocess.CalledProcessError as e:
-            print("⚠️ Failed to generate thumbnail:", e)
+            logger.warning("⚠️ Failed to generate thumbnail: %s", e)
             image_url = None
 
-        # ✅ Create Video record (relative paths only)
-        video = Video.objects.create(
-            meeting=meeting,
-            organization=organization,
-            name=video_name,
-            url=relative_video_path,  # stored relative path
-            thumbnail_url=image_url.replace(request.build_absolute_uri(settings.MEDIA_URL), "")
-            if image_url else None,
-            description="none",
-            tags=tags,
-        )
-
-        # ✅ Extract duration with ffprobe
+        # ✅ Extract duration with ffprobe (before opening the transaction)
         try:
-            result = subprocess.run(
-                [
-                    "ffprobe", "-v", "error",
-                    "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1",
-                    full_path,
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            duration = float(result.stdout.strip())
+            with perf.timed("media_processing_duration_ms", task="video_duration"):
+                result = subprocess.run(
+                    [
+                        "ffprobe", "-v", "error",
+                        "-show_entries", "format=duration",
+                        "-of", "default=noprint_wrappers=1:nokey=1",
+                        full_path,
+                    ],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                )
+                duration = float(result.stdout.strip())
         except Exception as e:
-            print("⚠️ Failed to get video duration:", e)
+            logger.warning("⚠️ Failed to get video duration: %s", e)
             duration = 0.0
 
-        # ✅ Create base segment (full length)
-        VideoSegment.objects.create(
-            video=video,
-            source_start=0.0,
-            source_end=duration,
-            question_card=None,
-        )
+        with transaction.atomic():
+            # ✅ Create Video record (relative paths only) with its aggregates
+            video = Video.objects.create(
+                meeting=meeting,
+                organization=organization,
+                name=video_name,
+                url=relative_video_path,  # stored relative path
+                thumbnail_url=image_url.replace(request.build_absolute_uri(settings.MEDIA_URL), "")
+                if image_url else None,
+                description="none",
+                tags=tags,
+                total_length=duration,
+                segment_count=1,
+                question_count=0,
+            )
+
+            # ✅ Create base segment (full length)
+            VideoSegment.objects.create(
+                video=video,
+                source_start=0.0,
+                source_end=duration,
+                question_card=None,
+            )
+
+            # 📏 Roll the new video up into its meeting
+            VideoAggregates.refresh_meeting(meeting.id, organization.id)
 
         # ✅ Cache + WebSocket broadcast
         cache.set(f"video:{video.id}", {
@@ -1610,15 +1545,8 @@ def store_video(request, org_id, meeting_name):
         }, timeout=600)
         cache.delete(f"org_videos:{organization.id}")
 
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"org_{organization.id}_updates",
-            {
-                "type": "org_update",
-                "category": "video",
-                "action": "create",
-                "payload": {"id": video.id},
-            },
+        org_feed.publish(
+            organization.id, "video", "create", {"id": video.id}, data=serialize_org_video(request, video.id)
         )
 
         # ✅ Return same style response as store_bot
@@ -1635,25 +1563,20 @@ def store_video(request, org_id, meeting_name):
         }, status=201)
 
     except Exception as e:
-        print("🔥 store_video error:", e)
+        logger.exception("🔥 store_video error: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-
-def notify_org_update(org_id, category, action, payload=None):
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        f"org_{org_id}_updates",
-        {
-            "type": "org_update",
-            "category": category,   # e.g. "video", "survey", "dataset"
-            "action": action,       # e.g. "create", "update", "delete"
-            "payload": payload or {},
-        },
+def serialize_org_video(request, video_id):
+    """A video as get_org_videos lists it, for org feed events."""
+    video = (
+        Video.objects.select_related("meeting")
+        .prefetch_related("segments__question_card")
+        .get(id=video_id)
     )
-    
+    return serialize_video(request, video, individual=False, include_meeting_name=True)
+
+
 @csrf_exempt
 @login_required
 def delete_video(request, video_id):
@@ -1677,14 +1600,11 @@ def delete_video(request, video_id):
 
         # ✅ Authorization: allow owner or members
         user = request.user
-        is_owner = hasattr(org, "owner") and org.owner == user
-        is_member = hasattr(org, "members") and user in org.members.all()
-
-        if not (is_owner or is_member):
-            print(f"🚫 Unauthorized deletion attempt by {user.email} on org {org.id}")
+        if not user_in_org(user, org):
+            logger.warning("🚫 Unauthorized deletion attempt by %s on org %s", user.email, org.id)
             return JsonResponse({"error": "You do not have permission to delete this video."}, status=403)
 
-        print(f"🗑️ {user.email} deleting video {video.id} from org {org.id}")
+        logger.info("🗑️ %s deleting video %s from org %s", user.email, video.id, org.id)
 
         # ✅ Delete physical files
         def safe_remove_file(url_field_value):
@@ -1694,13 +1614,16 @@ def delete_video(request, video_id):
             abs_path = os.path.join(settings.MEDIA_ROOT, rel_path)
             if os.path.exists(abs_path):
                 os.remove(abs_path)
-                print(f"🧹 Deleted file: {abs_path}")
+                logger.info("🧹 Deleted file: %s", abs_path)
 
         safe_remove_file(video.url)
         safe_remove_file(video.thumbnail_url)
 
-        # ✅ Delete DB record
-        video.delete()
+        # ✅ Delete DB record (and drop it from the meeting rollup)
+        with transaction.atomic():
+            video.delete()
+            if video.meeting_id:
+                VideoAggregates.refresh_meeting(video.meeting_id, org.id)
 
         # ✅ Invalidate cache
         user_email = request.user.email
@@ -1708,34 +1631,94 @@ def delete_video(request, video_id):
         cache.delete_pattern(f"org_videos:*:{org.id}*") 
 
         # ✅ Broadcast update via WebSocket
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"org_{org.id}_updates",
-            {
-                "type": "org_update",
-                "category": "video",
-                "action": "delete",
-                "payload": {"id": video_id},
-            },
-        )
+        org_feed.publish(org.id, "video", "delete", {"id": video_id})
 
-        print(f"📢 Sent org_update:delete for org_{org.id}")
+        logger.info("📢 Sent org_update:delete for org_%s", org.id)
         return JsonResponse({"message": f"Video {video_id} deleted successfully."}, status=200)
 
     except Exception as e:
-        print("❌ Error deleting video:", e)
+        logger.exception("❌ Error deleting video: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
-def make_absolute_media_url(request, path):
-    """Return full absolute media URL for stored paths."""
-    if not path:
-        return None
-    if path.startswith("http"):
-        return path
-    return request.build_absolute_uri(
-        os.path.join(settings.MEDIA_URL, path)
-    ).replace("\\", "/")
-    
+def video_list_response(request, videos, individual, include_meeting_name=False, label="org"):
+    """
+    Shared body of get_user_videos / get_org_videos.
+    Query params:
+      - fields=summary  → card-level metadata only (no segments / question cards)
+      - limit, cursor   → keyset pagination on (created_at, id), newest first
+    Without limit/cursor the full list is returned, as before.
+    """
+    summary = request.GET.get("fields") == "summary"
+    cursor = request.GET.get("cursor")
+    limit = request.GET.get("limit")
+    paginate = cursor is not None or limit is not None
+
+    videos = videos.select_related("meeting")
+    if not summary:
+        videos = videos.prefetch_related("segments__question_card")
+
+    next_cursor = None
+    if paginate:
+        try:
+            page_size = parse_page_size(limit) if limit is not None else DEFAULT_PAGE_SIZE
+            videos, next_cursor = keyset_page(videos, cursor, page_size)
+        except InvalidCursor as e:
+            return JsonResponse({"error": str(e)}, status=400)
+    else:
+        videos = videos.order_by("-created_at", "-id")
+
+    videos_list = [
+        serialize_video(
+            request, video, individual,
+            include_meeting_name=include_meeting_name, summary=summary,
+        )
+        for video in videos
+    ]
+
+    response_data = {"videos": videos_list, "cached": False}
+    if paginate:
+        response_data["next_cursor"] = next_cursor
+        response_data["has_more"] = next_cursor is not None
+
+    logger.debug("🎥 Returning %s %s videos (%s)", len(videos_list), label, 'summary' if summary else 'full')
+    return FastJsonResponse(response_data, status=200)
+
+
+@csrf_exempt
+@login_required
+def get_video_segments(request, video_id):
+    """
+    On-demand segment detail for one video (pairs with fields=summary listings).
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "Only GET requests are allowed."}, status=405)
+
+    try:
+        video = Video.objects.filter(id=video_id).only("id", "organization_id", "total_length").first()
+        if not video:
+            return JsonResponse({"error": f"Video {video_id} not found."}, status=404)
+
+        if not user_in_org(request.user, video.organization_id):
+            return JsonResponse({"error": "User is not part of this organization."}, status=403)
+
+        segments = (
+            VideoSegment.objects.filter(video_id=video.id)
+            .select_related("question_card")
+            .order_by("position", "id")
+        )
+        segments_data = [serialize_segment(seg) for seg in segments]
+
+        return FastJsonResponse({
+            "video_id": str(video.id),
+            "videoLength": video.total_length,
+            "questionCards": segments_data,
+        }, status=200)
+
+    except Exception as e:
+        logger.exception("❌ Error in get_video_segments: %s", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
 @csrf_exempt
 @login_required
 def get_user_videos(request, org_id, meeting_name):
@@ -1753,76 +1736,29 @@ def get_user_videos(request, org_id, meeting_name):
 
         # print(f"❌ Cache miss for {cache_key}, fetching from DB")
 
-        organization = Organization.objects.filter(id=org_id).first()
-        if not organization:
-            return JsonResponse({"error": f"Organization {org_id} not found."}, status=404)
-
-        meeting = Meeting.objects.filter(name=meeting_name, organization=organization).first()
+        meeting = Meeting.objects.filter(name=meeting_name, organization_id=org_id).first()
         if not meeting:
+            if not Organization.objects.filter(id=org_id).exists():
+                return JsonResponse({"error": f"Organization {org_id} not found."}, status=404)
             return JsonResponse({"error": f"Meeting '{meeting_name}' not found."}, status=404)
 
-        videos = (
-            Video.objects.filter(meeting=meeting, organization=organization)
-            .prefetch_related("segments__question_card")
-            .order_by("-created_at")
-        )
-
-        videos_list = []
-        for video in videos:
-            segments_data = []
-            for segment in video.segments.all():
-                q_data = None
-                if segment.question_card:
-                    qc = segment.question_card
-                    q_data = {
-                        "id": str(qc.id),
-                        "question": qc.question,
-                        "answers": qc.answers,
-                        "difficulty": qc.difficulty,
-                        "type": qc.type,
-                        "displayType": qc.display_type,
-                        "showWinner": qc.show_winner,
-                        "live": qc.live,
-                    }
-
-                segments_data.append({
-                    "id": str(segment.id),
-                    "source": [segment.source_start, segment.source_end],
-                    "isQuestionCard": bool(segment.question_card),
-                    "questionCardData": q_data,
-                })
+        # ✅ Same rule as check_meeting_access: org members, or users the meeting is shared with
+        if not (user_in_org(request.user, org_id) or user_email in meeting.shared_with):
+            return JsonResponse({"error": "User is not part of this organization."}, status=403)
 
-            # ✅ Correct URL generation (same as get_video_by_id)
-            full_video_url = make_absolute_media_url(request, video.url)
-            full_thumbnail_url = make_absolute_media_url(request, video.thumbnail_url)
-
-            videos_list.append({
-                "id": str(video.id),
-                "videoName": video.name or "Untitled Video",
-                "videoTags": video.tags or [],
-                "videoLength": sum(
-                    s.source_end - s.source_start for s in video.segments.all()
-                ),
-                "questionCards": segments_data,
-                "savedAt": video.created_at.isoformat(),
-                "videoUrl": full_video_url,
-                "thumbnail_url": full_thumbnail_url,
-                "organization_id": str(video.organization.id),
-                "individual": True,
-                "associated_meeting_id": str(video.meeting.id) if video.meeting else None,
-            })
+        videos = Video.objects.filter(meeting=meeting, organization_id=org_id)
 
         # cache.set(cache_key, videos_list, timeout=600)
 
-        print(f"🎥 Returning {len(videos_list)} user videos with absolute URLs")
-        return JsonResponse({"videos": videos_list, "cached": False}, status=200)
+        return video_list_response(request, videos, individual=True, label="user")
 
     except Exception as e:
-        print("❌ Error in get_user_videos:", e)
+        logger.exception("❌ Error in get_user_videos: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
 @login_required
+@require_org_role()
 def get_org_videos(request, org_id):
     """Fetch all videos belonging to an organization, across all meetings."""
     if request.method != "GET":
@@ -1839,70 +1775,17 @@ def get_org_videos(request, org_id):
 
         # print(f"❌ Cache miss for {cache_key}, fetching from DB")
 
-        organization = Organization.objects.filter(id=org_id).first()
-        if not organization:
-            return JsonResponse({"error": f"Organization {org_id} not found."}, status=404)
-
-        videos = (
-            Video.objects.filter(organization=organization)
-            .prefetch_related("segments__question_card", "meeting")
-            .order_by("-created_at")
-        )
-
-        videos_list = []
-        for video in videos:
-            segments_data = []
-            for segment in video.segments.all():
-                q_data = None
-                if segment.question_card:
-                    qc = segment.question_card
-                    q_data = {
-                        "id": str(qc.id),
-                        "question": qc.question,
-                        "answers": qc.answers,
-                        "difficulty": qc.difficulty,
-                        "type": qc.type,
-                        "displayType": qc.display_type,
-                        "showWinner": qc.show_winner,
-                        "live": qc.live,
-                    }
-
-                segments_data.append({
-                    "id": str(segment.id),
-                    "source": [segment.source_start, segment.source_end],
-                    "isQuestionCard": bool(segment.question_card),
-                    "questionCardData": q_data,
-                })
-
-            # ✅ Use same media URL normalization as get_video_by_id
-            full_video_url = make_absolute_media_url(request, video.url)
-            full_thumbnail_url = make_absolute_media_url(request, video.thumbnail_url)
-
-            print("THE FULL VIDEO URL IS", full_thumbnail_url)
-            videos_list.append({
-                "id": str(video.id),
-                "videoName": video.name or "Untitled Video",
-                "videoTags": video.tags or [],
-                "videoLength": sum(
-                    s.source_end - s.source_start for s in video.segments.all()
-                ),
-                "questionCards": segments_data,
-                "savedAt": video.created_at.isoformat(),
-                "videoUrl": full_video_url,
-                "thumbnail_url": full_thumbnail_url,
-                "organization_id": str(video.organization.id),
-                "individual": False,
-                "meetingName": video.meeting.name if video.meeting else None,
-                "associated_meeting_id": str(video.meeting.id) if video.meeting else None,
-            })
+        # ✅ Org existence + membership checked by @require_org_role
+        videos = Video.objects.filter(organization_id=org_id)
 
         # cache.set(cache_key, videos_list, timeout=600)
 
-        print(f"🏢 Returning {len(videos_list)} org videos with absolute URLs")
-        return JsonResponse({"videos": videos_list, "cached": False}, status=200)
+        return video_list_response(
+            request, videos, individual=False, include_meeting_name=True, label="org"
+        )
 
     except Exception as e:
-        print("❌ Error in get_org_videos:", e)
+        logger.exception("❌ Error in get_org_videos: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
@@ -1983,6 +1866,9 @@ def update_bot(request, meeting_name):
 
         bot.save()
 
+        if bot.organization_id:
+            PlaybackBundle.rebuild_for(request, bot.organization_id, bot_id=bot.id)
+
         return JsonResponse({
             "message": "Bot updated successfully",
             "updated_fields": updated_fields,
@@ -2076,6 +1962,11 @@ def join_room(request, org_id, meeting_name):
         participant_obj.name = name
         participant_obj.save()
 
+    # -----------------------------
+    #  Signed ticket for the meeting websocket (verified without DB/session lookups)
+    # -----------------------------
+    ticket, ticket_expires_at = join_tickets.issue(participant_id, org.id, meeting.name)
+
     # -----------------------------
     #  Build JSON response
     # -----------------------------
@@ -2084,6 +1975,8 @@ def join_room(request, org_id, meeting_name):
         "message": "Access verified and participant registered.",
         "participant_id": participant_id,
         "created": created,
+        "ticket": ticket,
+        "ticket_expires_at": ticket_expires_at,
     })
 
     return response
@@ -2221,7 +2114,7 @@ def create_question_card(request, org_id, meeting_id):
         ).first()
 
         if existing_qc:
-            print(f"⚠️ Duplicate QuestionCard detected (id={existing_qc.id}), skipping creation.")
+            logger.warning("⚠️ Duplicate QuestionCard detected (id=%s), skipping creation.", existing_qc.id)
             return JsonResponse(
                 {
                     "message": "QuestionCard already exists with identical fields.",
@@ -2247,7 +2140,7 @@ def create_question_card(request, org_id, meeting_id):
             live=live,
         )
 
-        print(f"🆕 Created QuestionCard {qc.id} for meeting {meeting.id} / org {organization.id}")
+        logger.info("🆕 Created QuestionCard %s for meeting %s / org %s", qc.id, meeting.id, organization.id)
 
         # 🧹 Invalidate cache
         cache_key = f"org_question_cards:{org_id}"
@@ -2255,19 +2148,13 @@ def create_question_card(request, org_id, meeting_id):
 
         # 📡 Broadcast via WebSocket
         try:
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                f"org_{organization.id}_updates",
-                {
-                    "type": "org_update",
-                    "category": "question",
-                    "action": "create",
-                    "payload": {"id": str(qc.id)},
-                },
+            org_feed.publish(
+                organization.id, "question", "create", {"id": str(qc.id)},
+                data=serialize_question_card_detail(qc),
             )
-            print(f"📡 Sent WS create event for QuestionCard {qc.id} (org {org_id})")
+            logger.info("📡 Sent WS create event for QuestionCard %s (org %s)", qc.id, org_id)
         except Exception as e:
-            print("⚠️ Failed to broadcast WS create event:", e)
+            logger.warning("⚠️ Failed to broadcast WS create event: %s", e)
 
         return JsonResponse(
             {
@@ -2283,15 +2170,27 @@ def create_question_card(request, org_id, meeting_id):
     except json.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON format."}, status=400)
     except Exception as e:
-        print("❌ Error in create_question_card:", e)
+        logger.exception("❌ Error in create_question_card: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
+def survey_answer_keys(org_id, room_name, participant_id=None):
+    """
+    Raw Redis keys for the Qualtrics survey log of a room.
+      - survey_index:{org}:{room}                    → hash participant_id → display name
+      - survey_answers:{org}:{room}:{participant_id} → list of JSON entries (RPUSH)
+    The index has its own prefix so no participant_id can name it.
+    """
+    if participant_id is None:
+        return f"survey_index:{org_id}:{room_name}"
+    return f"survey_answers:{org_id}:{room_name}:{participant_id}"
+
 @csrf_exempt
 @require_POST
 def store_quatric_survey_answers(request, org_id, room_name):
     """
-    Stores participant survey answers for a given meeting.
-    Uses the same join_room cache key namespace and expires after 12h.
+    Appends participant survey answers for a given meeting.
+    Each submission is RPUSHed onto a per-participant list keyed by participant_id,
+    and the participant is recorded in a room-level index. Expires after 12h.
     """
     COOKIE_MAX_AGE = 12 * 60 * 60  # 12 hours
     try:
@@ -2299,35 +2198,43 @@ def store_quatric_survey_answers(request, org_id, room_name):
     except json.JSONDecodeError:
         return JsonResponse({"ok": False, "message": "Invalid JSON"}, status=400)
 
-    participant_name = data.get("participant_name")
+    participant_id = data.get("participant_id")
+    participant_name = data.get("participant_name") or ""
     answers = data.get("answers")
 
-    if not participant_name or not isinstance(answers, dict):
+    if not isinstance(participant_id, str) or not isinstance(participant_name, str):
         return JsonResponse(
-            {"ok": False, "message": "Missing participant_name or answers"},
+            {"ok": False, "message": "participant_id and participant_name must be strings"},
+            status=400
+        )
+    participant_id = participant_id.strip()
+    if not participant_id or not isinstance(answers, dict):
+        return JsonResponse(
+            {"ok": False, "message": "Missing participant_id or answers"},
             status=400
         )
-
-    # ✅ Reuse join_room cache namespace
-    safe_name = participant_name.lower().replace(" ", "_")
-    redis_key = f"join_room:{org_id}:{room_name}:{safe_name}:Qualtric_survey_answers"
-
-    print("stored_in", redis_key)
-    # ✅ Each answer stored as timestamped log entries
-    existing = cache.get(redis_key, [])
-    if not isinstance(existing, list):
-        existing = []
 
     entry = {
         "timestamp": now().isoformat(),
         "answers": answers
     }
-    existing.append(entry)
-    cache.set(redis_key, existing, timeout=COOKIE_MAX_AGE)
+
+    # ✅ O(1) append + index update in a single round trip
+    list_key = survey_answer_keys(org_id, room_name, participant_id)
+    index_key = survey_answer_keys(org_id, room_name)
+
+    redis = get_redis_connection("default")
+    pipe = redis.pipeline()
+    pipe.rpush(list_key, json.dumps(entry))
+    pipe.hset(index_key, participant_id, participant_name)
+    pipe.expire(list_key, COOKIE_MAX_AGE)
+    pipe.expire(index_key, COOKIE_MAX_AGE)
+    pipe.execute()
 
     return JsonResponse({"ok": True, "message": "Survey answers stored", "entry": entry})
 
-from .models import ParticipantResponse
+from .models import ParticipantResponse, ParticipantAnswer
+from .utils.answer_grading import AnswerGrader
 
 @csrf_exempt
 @require_POST
@@ -2403,7 +2310,23 @@ def store_video_question_answers(request, org_id, room_name, question_id):
     }
     participant_obj.save()
 
-    print(f"🗄️ DB Updated: ParticipantResponse(id={participant_obj.id})")
+    # ✅ Mirror into the normalized answer table for analytics
+    question_card = QuestionCard.objects.filter(id=question_id).first()
+    ParticipantAnswer.objects.update_or_create(
+        participant=participant_obj,
+        question_key=str(question_id),
+        defaults={
+            "meeting": meeting,
+            "question_card": question_card,
+            "answer": answers,
+            "answered_at": AnswerGrader.answered_at(entry),
+            "is_correct": AnswerGrader.grade(
+                question_card.correct_answers if question_card else None, answers
+            ),
+        },
+    )
+
+    logger.debug("🗄️ DB Updated: ParticipantResponse(id=%s)", participant_obj.id)
 
     # ----------------------
     #   🔹 5. Response
@@ -2437,7 +2360,7 @@ def get_all_video_question_answers(request, org_id, room_name):
         # Redis key pattern:
         # video_question:{org_id}:{room_name}:{participant_id}:{question_id}:answers
         keys = cache.keys(f"video_question:{org_id}:{room_name}:*:*:answers")
-        print("🎯 Video question keys found:", keys)
+        logger.debug("🎯 Video question keys found: %s", keys)
 
         if not keys:
             return JsonResponse({
@@ -2455,34 +2378,31 @@ def get_all_video_question_answers(request, org_id, room_name):
         except Meeting.DoesNotExist:
             return JsonResponse({"ok": False, "message": "Meeting not found"}, status=404)
 
-        results = []
-
+        parsed = []
         for key in keys:
             parts = key.split(":")
             if len(parts) < 6:
                 continue
-
-            participant_id = parts[3]
-            question_id = parts[4]
-            if not is_valid_uuid(participant_id):
-                print(f"⚠️ Skipping legacy key: {key}")
+            if not is_valid_uuid(parts[3]):
+                logger.debug("⚠️ Skipping legacy key: %s", key)
                 continue
-            redis_data = cache.get(key)
+            parsed.append((key, parts[3], parts[4]))
 
-            # Fetch participant name from DB
-            participant_name = None
-            try:
-                participant_obj = ParticipantResponse.objects.get(
-                    meeting=meeting, 
-                    participant_id=participant_id
-                )
-                participant_name = participant_obj.name
-            except ParticipantResponse.DoesNotExist:
-                participant_name = "Unknown Participant"
+        # ✅ One cache round trip and one query for names, instead of one of each per key
+        stored = cache.get_many([key for key, _, _ in parsed])
+        names = dict(
+            ParticipantResponse.objects.filter(
+                meeting=meeting,
+                participant_id__in={participant_id for _, participant_id, _ in parsed},
+            ).values_list("participant_id", "name")
+        )
 
+        results = []
+        for key, participant_id, question_id in parsed:
+            redis_data = stored.get(key)
             results.append({
                 "participant_id": participant_id,
-                "participant_name": participant_name,
+                "participant_name": names.get(participant_id, "Unknown Participant"),
                 "question_id": question_id,
                 "count": len(redis_data) if isinstance(redis_data, list) else 0,
                 "answers": redis_data or []
@@ -2498,7 +2418,7 @@ def get_all_video_question_answers(request, org_id, room_name):
         })
 
     except Exception as e:
-        print("❌ Error in get_all_video_question_answers:", e)
+        logger.exception("❌ Error in get_all_video_question_answers: %s", e)
         return JsonResponse({
             "ok": False,
             "message": f"Error retrieving video question answers: {str(e)}"
@@ -2508,29 +2428,36 @@ def get_all_video_question_answers(request, org_id, room_name):
 def get_all_quatric_survey_answers(request, org_id, room_name):
     """
     Returns all stored Qualtrics survey answers for a given meeting across all participants.
+    Reads the room index, then fetches every participant log in one pipeline.
     """
     try:
-        # redis = get_redis_connection("default")  # "default" cache alias from settings.py
-        # pattern = f"join_room:{org_id}:{room_name}:*:Qualtric_survey_answers"
-
-        keys = cache.keys(f"join_room:{org_id}:{room_name}:*:Qualtric_survey_answers")
+        redis = get_redis_connection("default")
+        index = redis.hgetall(survey_answer_keys(org_id, room_name))
 
-        print("SCANEND KEYS", keys)
-        if not keys:
+        if not index:
             return JsonResponse({
                 "ok": True,
                 "message": "No stored survey answers found for this room.",
                 "participants": []
             })
 
+        participants = [
+            (pid.decode("utf-8"), name.decode("utf-8")) for pid, name in index.items()
+        ]
+
+        pipe = redis.pipeline()
+        for participant_id, _ in participants:
+            pipe.lrange(survey_answer_keys(org_id, room_name, participant_id), 0, -1)
+        logs = pipe.execute()
+
         results = []
-        for key in keys:
-            safe_name = key.split(":")[3]  # extract the safe participant name
-            data = cache.get(key)
+        for (participant_id, participant_name), raw_entries in zip(participants, logs):
+            entries = [json.loads(raw) for raw in raw_entries]
             results.append({
-                "participant": safe_name.replace("_", " "),
-                "count": len(data) if isinstance(data, list) else 0,
-                "answers": data or []
+                "participant_id": participant_id,
+                "participant": participant_name,
+                "count": len(entries),
+                "answers": entries
             })
 
         return JsonResponse({
@@ -2564,9 +2491,7 @@ def get_all_question_cards(request, org_id):
             return JsonResponse({"error": f"Organization {org_id} not found."}, status=404)
 
         user = request.user
-        is_owner = hasattr(organization, "owner") and organization.owner == user
-        is_member = hasattr(organization, "members") and user in organization.members.all()
-        if not (is_owner or is_member):
+        if not user_in_org(user, organization):
             return JsonResponse({"error": "User is not part of this organization."}, status=403)
 
         # cache_key = f"org_question_cards:{org_id}"
@@ -2581,46 +2506,23 @@ def get_all_question_cards(request, org_id):
         # ✅ Query DB
         question_cards = (
             QuestionCard.objects.filter(organization=organization)
-            .select_related("meeting", "organization", "user")
+            .select_related("user")
             .order_by("-created_at")
         )
 
         # ✅ Include correct_answers in the response
-        question_list = [
-            {
-                "id": str(q.id),
-                "question": q.question,
-                "answers": q.answers,
-                "correctAnswers": q.correct_answers,  # 👈 NEW FIELD
-                "difficulty": q.difficulty,
-                "type": q.type,
-                "displayType": q.display_type,
-                "showWinner": q.show_winner,
-                "live": q.live,
-                "organization_id": str(q.organization.id) if q.organization else None,
-                "meeting_id": str(q.meeting.id) if q.meeting else None,
-                "created_at": q.created_at.isoformat(),
-                "user_email": q.user.email if q.user else None,
-            }
-            for q in question_cards
-        ]
+        question_list = [serialize_question_card_detail(q) for q in question_cards]
         
-          # 🧩 DEBUG LOG: Verify correctAnswers in serialized output
-        print("🧩 [DEBUG] Serialized question list preview:")
-        for q in question_list:
-            print(f"  • ID={q['id']} | correctAnswers={q['correctAnswers']} | "
-                  f"answers={q['answers']} | question={q['question']}")
-
         response_data = {"questions": question_list, "count": len(question_list)}
 
         # ✅ Cache it
         # cache.set(cache_key, response_data, CACHE_TIMEOUT)
-        print(f"💾 Cached {len(question_list)} question cards for org {org_id}")
+        logger.debug("🧩 Serialized %s question cards for org %s", len(question_list), org_id)
 
-        return JsonResponse(response_data, status=200)
+        return FastJsonResponse(response_data, status=200)
 
     except Exception as e:
-        print("❌ Error in get_all_question_cards:", e)
+        logger.exception("❌ Error in get_all_question_cards: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
@@ -2633,7 +2535,7 @@ def delete_question_card(request, question_id):
 
         has_permission = (
             question.user == user
-            or (org and (org.owner == user or org.members.filter(id=user.id).exists()))
+            or (org and user_in_org(user, org))
         )
         if not has_permission:
             return JsonResponse(
@@ -2642,26 +2544,17 @@ def delete_question_card(request, question_id):
             )
 
         question.delete()
-        print(f"🗑️ Deleted QuestionCard {question_id} by {user.username}")
+        logger.info("🗑️ Deleted QuestionCard %s by %s", question_id, user.username)
 
         if org:
             cache_key = f"org_question_cards:{org.id}"
             cache.delete(cache_key)
 
         try:
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                f"org_{org.id}_updates",  # ✅ match Video + Question create pattern
-                {
-                    "type": "org_update",
-                    "category": "question",
-                    "action": "delete",
-                    "payload": {"id": str(question_id)},
-                },
-            )
-            print(f"📡 Sent WS delete event for QuestionCard {question_id} (org {org.id})")
+            org_feed.publish(org.id, "question", "delete", {"id": str(question_id)})
+            logger.info("📡 Sent WS delete event for QuestionCard %s (org %s)", question_id, org.id)
         except Exception as e:
-            print("⚠️ Failed to broadcast WS delete event:", e)
+            logger.warning("⚠️ Failed to broadcast WS delete event: %s", e)
 
         return JsonResponse(
             {"message": f"QuestionCard {question_id} deleted successfully."},
@@ -2671,7 +2564,7 @@ def delete_question_card(request, question_id):
     except QuestionCard.DoesNotExist:
         return JsonResponse({"error": f"QuestionCard with id {question_id} not found."}, status=404)
     except Exception as e:
-        print("🔥 DELETE QUESTION ERROR:", str(e))
+        logger.exception("🔥 DELETE QUESTION ERROR: %s", str(e))
         return JsonResponse({"error": str(e)}, status=400)
 
 @csrf_exempt
@@ -2707,36 +2600,22 @@ def get_question_card_by_id(request, question_id):
         user = request.user
         has_permission = (
             question.user == user
-            or (org and (org.owner == user or org.members.filter(id=user.id).exists()))
+            or (org and user_in_org(user, org))
         )
         if not has_permission:
             return JsonResponse({"error": "You do not have permission to view this question."}, status=403)
 
         # ✅ 3. Serialize the question
-        question_data = {
-            "id": str(question.id),
-            "question": question.question,
-            "answers": question.answers,
-            "correctAnswers": question.correct_answers,
-            "difficulty": question.difficulty,
-            "type": question.type,
-            "displayType": question.display_type,
-            "showWinner": question.show_winner,
-            "live": question.live,
-            "organization_id": str(org.id) if org else None,
-            "meeting_id": str(question.meeting.id) if question.meeting else None,
-            "created_at": question.created_at.isoformat(),
-            "user_email": question.user.email if question.user else None,
-        }
+        question_data = serialize_question_card_detail(question)
 
         # ✅ 4. Cache the result
         # cache.set(cache_key, question_data, CACHE_TIMEOUT)
-        print(f"💾 Cached QuestionCard {question_id}")
+        logger.debug("💾 Cached QuestionCard %s", question_id)
 
         return JsonResponse(question_data, status=200)
 
     except Exception as e:
-        print(f"❌ Error in get_question_card_by_id({question_id}):", e)
+        logger.exception("❌ Error in get_question_card_by_id(%s): %s", question_id, e)
         return JsonResponse({"error": str(e)}, status=500)
     
 @csrf_exempt
@@ -2770,7 +2649,7 @@ def create_survey(request, org_id, meeting_id):
             items=items,
         )
 
-        print(f"🆕 Created Survey {survey.id} for meeting {meeting.id} / org {organization.id}")
+        logger.info("🆕 Created Survey %s for meeting %s / org %s", survey.id, meeting.id, organization.id)
 
         # 🧹 Invalidate cache
         cache_key = f"org_surveys:{org_id}"
@@ -2778,19 +2657,12 @@ def create_survey(request, org_id, meeting_id):
 
         # 📢 WebSocket broadcast
         try:
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                f"org_{organization.id}_updates",
-                {
-                    "type": "org_update",
-                    "category": "survey",
-                    "action": "create",
-                    "payload": {"id": str(survey.id)},
-                },
+            org_feed.publish(
+                organization.id, "survey", "create", {"id": str(survey.id)}, data=serialize_survey(survey)
             )
-            print(f"📡 Sent WS create event for Survey {survey.id} (org {org_id})")
+            logger.info("📡 Sent WS create event for Survey %s (org %s)", survey.id, org_id)
         except Exception as e:
-            print("⚠️ Failed to broadcast WS create event:", e)
+            logger.warning("⚠️ Failed to broadcast WS create event: %s", e)
 
         return JsonResponse(
             {
@@ -2805,7 +2677,7 @@ def create_survey(request, org_id, meeting_id):
     except json.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON format."}, status=400)
     except Exception as e:
-        print("❌ Error in create_survey:", e)
+        logger.exception("❌ Error in create_survey: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
@@ -2824,16 +2696,14 @@ def get_all_surveys(request, org_id):
             return JsonResponse({"error": f"Organization {org_id} not found."}, status=404)
 
         user = request.user
-        is_owner = hasattr(organization, "owner") and organization.owner == user
-        is_member = hasattr(organization, "members") and user in organization.members.all()
-        if not (is_owner or is_member):
+        if not user_in_org(user, organization):
             return JsonResponse({"error": "User is not part of this organization."}, status=403)
 
         cache_key = f"org_surveys:{org_id}"
 
         cached_data = cache.get(cache_key)
         if cached_data:
-            print(f"⚡ Returning cached surveys for org {org_id}")
+            logger.debug("⚡ Returning cached surveys for org %s", org_id)
             return JsonResponse(cached_data, status=200)
 
         surveys = (
@@ -2842,26 +2712,16 @@ def get_all_surveys(request, org_id):
             .order_by("-created_at")
         )
 
-        survey_list = [
-            {
-                "id": str(s.id),
-                "items": s.items,
-                "organization_id": str(s.organization.id) if s.organization else None,
-                "meeting_id": str(s.meeting.id) if s.meeting else None,
-                "created_at": s.created_at.isoformat(),
-                "user_email": s.user.email if s.user else None,
-            }
-            for s in surveys
-        ]
+        survey_list = [serialize_survey(s) for s in surveys]
 
         response_data = {"surveys": survey_list, "count": len(survey_list)}
         cache.set(cache_key, response_data, CACHE_TIMEOUT)
-        print(f"💾 Cached {len(survey_list)} surveys for org {org_id}")
+        logger.debug("💾 Cached %s surveys for org %s", len(survey_list), org_id)
 
         return JsonResponse(response_data, status=200)
 
     except Exception as e:
-        print("❌ Error in get_all_surveys:", e)
+        logger.exception("❌ Error in get_all_surveys: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
@@ -2874,7 +2734,7 @@ def delete_survey(request, survey_id: int):
     try:
         survey = Survey.objects.filter(id=survey_id).first()
         if not survey:
-            print(f"⚠️ Survey {survey_id} not found, clearing cache anyway.")
+            logger.warning("⚠️ Survey %s not found, clearing cache anyway.", survey_id)
             cache.delete_pattern("org_surveys:*")
             return JsonResponse(
                 {"message": f"Survey {survey_id} not found but cache cleared."},
@@ -2887,7 +2747,7 @@ def delete_survey(request, survey_id: int):
         # ✅ Check ownership or org-level permission
         has_permission = (
             survey.user == user
-            or (org and (org.owner == user or org.members.filter(id=user.id).exists()))
+            or (org and user_in_org(user, org))
         )
         if not has_permission:
             return JsonResponse(
@@ -2896,7 +2756,7 @@ def delete_survey(request, survey_id: int):
             )
 
         survey.delete()
-        print(f"🗑️ Deleted Survey {survey_id} by {user.username}")
+        logger.info("🗑️ Deleted Survey %s by %s", survey_id, user.username)
 
         # ✅ Clear cache
         if org:
@@ -2907,24 +2767,15 @@ def delete_survey(request, survey_id: int):
         # ✅ Broadcast WebSocket update
         if org:
             try:
-                channel_layer = get_channel_layer()
-                async_to_sync(channel_layer.group_send)(
-                    f"org_{org.id}_updates",
-                    {
-                        "type": "org_update",
-                        "category": "survey",
-                        "action": "delete",
-                        "payload": {"id": survey_id},
-                    },
-                )
-                print(f"📡 Sent WS delete event for Survey {survey_id} (org {org.id})")
+                org_feed.publish(org.id, "survey", "delete", {"id": survey_id})
+                logger.info("📡 Sent WS delete event for Survey %s (org %s)", survey_id, org.id)
             except Exception as e:
-                print("⚠️ Failed to broadcast WS delete event:", e)
+                logger.warning("⚠️ Failed to broadcast WS delete event: %s", e)
 
         return JsonResponse({"message": f"Survey {survey_id} deleted successfully."}, status=200)
 
     except Exception as e:
-        print("🔥 DELETE SURVEY ERROR:", str(e))
+        logger.exception("🔥 DELETE SURVEY ERROR: %s", str(e))
         return JsonResponse({"error": str(e)}, status=400)
 
 
@@ -2938,7 +2789,7 @@ def get_survey_by_id(request, survey_id: int):
         cache_key = f"survey:{survey_id}"
         cached_survey = cache.get(cache_key)
         if cached_survey:
-            print(f"⚡ Returning cached Survey {survey_id}")
+            logger.debug("⚡ Returning cached Survey %s", survey_id)
             return JsonResponse(cached_survey, status=200)
 
         survey = (
@@ -2955,7 +2806,7 @@ def get_survey_by_id(request, survey_id: int):
         user = request.user
         has_permission = (
             survey.user == user
-            or (org and (org.owner == user or org.members.filter(id=user.id).exists()))
+            or (org and user_in_org(user, org))
         )
         if not has_permission:
             return JsonResponse({"error": "You do not have permission to view this survey."}, status=403)
@@ -2970,24 +2821,15 @@ def get_survey_by_id(request, survey_id: int):
         }
 
         cache.set(cache_key, survey_data, CACHE_TIMEOUT)
-        print(f"💾 Cached Survey {survey_id}")
+        logger.debug("💾 Cached Survey %s", survey_id)
 
         return JsonResponse(survey_data, status=200)
 
     except Exception as e:
-        print(f"❌ Error in get_survey_by_id({survey_id}):", e)
+        logger.exception("❌ Error in get_survey_by_id(%s): %s", survey_id, e)
         return JsonResponse({"error": str(e)}, status=500)
     
 
-# ============================================================
-# ✅ Utility: check org membership (owner or member)
-# ============================================================
-def user_in_org(user, org):
-    if not org:
-        return False
-    return (hasattr(org, "owner") and org.owner == user) or \
-           (hasattr(org, "members") and user in org.members.all())
-
 # ============================================================
 # ✅ STORE BOT
 # ============================================================
@@ -3062,10 +2904,11 @@ def store_bot(request, org_id, meeting_name):
             thumbnail_name = f"{file_root}_thumb.jpg"
             thumbnail_path = os.path.join(settings.MEDIA_ROOT, base_storage_path, thumbnail_name)
             try:
-                subprocess.run([
-                    "ffmpeg", "-y", "-i", full_path, "-ss", "00:00:01.000",
-                    "-vframes", "1", "-q:v", "2", thumbnail_path
-                ], check=True)
+                with perf.timed("media_processing_duration_ms", task="bot_thumbnail"):
+                    subprocess.run([
+                        "ffmpeg", "-y", "-i", full_path, "-ss", "00:00:01.000",
+                        "-vframes", "1", "-q:v", "2", thumbnail_path
+                    ], check=True)
                 image_url = request.build_absolute_uri(
                     os.path.join(settings.MEDIA_URL, base_storage_path, thumbnail_name)
                 ).replace("\\", "/")
@@ -3104,16 +2947,7 @@ def store_bot(request, org_id, meeting_name):
         cache.delete(f"org_bots:{organization.id}")  # invalidate org cache
 
         # ✅ WebSocket broadcast
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"org_{organization.id}_updates",
-            {
-                "type": "org_update",
-                "category": "bot",
-                "action": "create",
-                "payload": {"id": bot.id},
-            },
-        )
+        org_feed.publish(organization.id, "bot", "create", {"id": bot.id}, data=serialize_bot(request, bot))
 
         return JsonResponse({
             "message": "Bot stored successfully",
@@ -3122,7 +2956,7 @@ def store_bot(request, org_id, meeting_name):
         }, status=201)
 
     except Exception as e:
-        print("🔥 store_bot error:", e)
+        logger.exception("🔥 store_bot error: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 # ============================================================
@@ -3172,6 +3006,10 @@ def edit_bot(request, bot_id, org_id, room_name):
 
         bot.save()
 
+        # 📦 Rooms using this bot replay its answers from the bundle
+        if bot.organization_id:
+            PlaybackBundle.rebuild_for(request, bot.organization_id, bot_id=bot.id)
+
         # ✅ Cache update
         bot_data = {
             "id": bot.id,
@@ -3188,20 +3026,13 @@ def edit_bot(request, bot_id, org_id, room_name):
         cache.delete(f"org_bots:{bot.organization.id}")
 
         # ✅ Broadcast updates
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"org_{bot.organization.id}_updates",
-            {
-                "type": "org_update",
-                "category": "bot",
-                "action": "update",
-                "payload": {"id": bot.id},
-            },
-        )
+        org_feed.publish(bot.organization.id, "bot", "update", {"id": bot.id}, data=serialize_bot(request, bot))
 
         cache_key = f"active_meeting:{org_id}:{room_name}"
         existing = cache.get(cache_key)
-        async_to_sync(channel_layer.group_send)(
+        if isinstance(existing, dict):
+            existing = BotAnswerPregenerator.with_progress(org_id, room_name, existing)
+        outbox.publish(
             f"meeting_{org_id}_{room_name}",
             {"type": "meeting_state_changed", "state": existing},
         )
@@ -3209,7 +3040,7 @@ def edit_bot(request, bot_id, org_id, room_name):
         return JsonResponse({"message": "Bot updated", "bot_id": bot.id}, status=200)
 
     except Exception as e:
-        print("🔥 edit_bot error:", e)
+        logger.exception("🔥 edit_bot error: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
     
 # ============================================================
@@ -3242,22 +3073,17 @@ def delete_bot(request, bot_id):
         org_id = bot.organization.id if bot.organization else None
         bot.delete()
 
+        # ✅ Drop it from the playback bundle / cached bots of rooms using it
+        if org_id:
+            PlaybackBundle.rebuild_for(request, org_id, bot_id=bot_id)
+
         # ✅ Broadcast
         if org_id:
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                f"org_{org_id}_updates",
-                {
-                    "type": "org_update",
-                    "category": "bot",
-                    "action": "delete",
-                    "payload": {"id": bot_id},
-                },
-            )
+            org_feed.publish(org_id, "bot", "delete", {"id": bot_id})
 
         return JsonResponse({"message": "Bot deleted successfully"})
     except Exception as e:
-        print("🔥 delete_bot error:", e)
+        logger.exception("🔥 delete_bot error: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 
@@ -3332,44 +3158,13 @@ def get_all_bots(request, org_id):
             return JsonResponse({"cached": True, "bots": cached})
 
         bots = Bot.objects.filter(organization=organization).select_related("meeting")
-        bot_list = []
-
-        for bot in bots:
-            # ✅ Normalize video URL
-            video_url = None
-            if bot.video_url:
-                if not bot.video_url.startswith("http") and not bot.video_url.startswith("/media/"):
-                    video_url = request.build_absolute_uri(
-                        os.path.join(settings.MEDIA_URL, bot.video_url)
-                    ).replace("\\", "/")
-                else:
-                    video_url = request.build_absolute_uri(bot.video_url).replace("\\", "/")
-
-            # ✅ Normalize image URL
-            image_url = (
-                request.build_absolute_uri(bot.image.url).replace("\\", "/")
-                if bot.image
-                else None
-            )
-            
-            print("IMAGE URL", image_url)
-            print("video_URL", video_url)
-            bot_list.append({
-                "id": bot.id,
-                "name": bot.name,
-                "memory": bot.memory,
-                "answers": bot.answers,
-                "video_url": video_url,
-                "image_url": image_url,
-                "meeting_id": bot.meeting.id if bot.meeting else None,
-                "meeting_name": bot.meeting.name if bot.meeting else None,
-            })
+        bot_list = [serialize_bot(request, bot) for bot in bots]  # ✅ absolute video/image URLs
 
         cache.set(redis_key, bot_list, timeout=600)
         return JsonResponse({"cached": False, "bots": bot_list})
 
     except Exception as e:
-        print("🔥 get_all_bots error:", e)
+        logger.exception("🔥 get_all_bots error: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
     
 
@@ -3380,22 +3175,22 @@ def get_all_bots(request, org_id):
 @login_required
 @csrf_exempt
 def update_or_create_active_meeting(request, org_id, room_name):
-    print(f"🟡 [update_or_create_active_meeting] Called for org={org_id}, room={room_name}")
+    logger.debug("🟡 [update_or_create_active_meeting] Called for org=%s, room=%s", org_id, room_name)
 
     if request.method != "POST":
-        print("❌ Invalid request method:", request.method)
+        logger.warning("❌ Invalid request method: %s", request.method)
         return JsonResponse({"error": "Only POST allowed"}, status=405)
 
     try:
         data = json.loads(request.body)
-        print(f"📥 Incoming data: {data}")
+        logger.debug("📥 Incoming data: %s", data)
 
         cache_key = f"active_meeting:{org_id}:{room_name}"
 
         # ✅ Ensure structure always exists
         existing = cache.get(cache_key)
         if not isinstance(existing, dict):
-            print(f"⚠️ Cache for {cache_key} invalid or missing. Resetting...")
+            logger.warning("⚠️ Cache for %s invalid or missing. Resetting...", cache_key)
             existing = {
                 "org_id": int(org_id),
                 "room_name": str(room_name),
@@ -3405,14 +3200,14 @@ def update_or_create_active_meeting(request, org_id, room_name):
                 "last_updated": now().isoformat(),
             }
 
-        print(f"🧩 Before update: {existing}")
+        logger.debug("🧩 Before update: %s", existing)
 
         # Extract incoming fields
         bot_ids = data.get("active_bot_ids")
         video_id = data.get("active_video_id")
         survey_id = data.get("active_survey_id")
 
-        print(f"➡️ Incoming fields: bot_ids={bot_ids}, video_id={video_id}, survey_id={survey_id}")
+        logger.debug("➡️ Incoming fields: bot_ids=%s, video_id=%s, survey_id=%s", bot_ids, video_id, survey_id)
 
         # ✅ Only update real fields (not "djsut")
         if bot_ids != "djsut":
@@ -3424,24 +3219,42 @@ def update_or_create_active_meeting(request, org_id, room_name):
 
         existing["last_updated"] = now().isoformat()
 
+        # 🤖 Work out which bot answers still need generating for this video + bot set
+        pregen_pairs = []
+        try:
+            existing["bot_answers"], pregen_pairs = BotAnswerPregenerator.prepare(org_id, room_name, existing)
+        except Exception as e:
+            logger.warning("⚠️ Failed to plan bot answer pre-generation for %s: %s", cache_key, e)
+
         # ✅ Store in cache
         cache.set(cache_key, existing, timeout=60 * 60 * 10) 
-        print(f"💾 Cache updated for key={cache_key}: {existing}")
+        logger.info("💾 Active meeting updated for %s", cache_key)
+
+        # 🤖 Generate them in the background; the room gets "ready" before play
+        if pregen_pairs:
+            BotAnswerPregenerator.submit(
+                request, org_id, room_name, existing["bot_answers"]["job"], pregen_pairs
+            )
+
+        # 📦 Precompile the participant playback bundle for this room
+        try:
+            PlaybackBundle.compile(request, org_id, room_name, existing)
+        except Exception as e:
+            logger.warning("⚠️ Failed to compile playback bundle for %s: %s", cache_key, e)
 
         # ✅ Broadcast to WebSocket group
         try:
-            channel_layer = get_channel_layer()
             group_name = f"meeting_{org_id}_{room_name}"
-            async_to_sync(channel_layer.group_send)(
+            outbox.publish(
                 group_name,
                 {
                     "type": "meeting_state_changed",
                     "state": existing,
                 }
             )
-            print(f"📡 Broadcasted meeting_state_changed to {group_name}")
+            logger.debug("📡 Broadcasted meeting_state_changed to %s", group_name)
         except Exception as e:
-            print(f"⚠️ Failed to broadcast meeting_state_changed: {e}")
+            logger.warning("⚠️ Failed to broadcast meeting_state_changed: %s", e)
 
         return JsonResponse({
             "message": "Active meeting updated successfully",
@@ -3449,28 +3262,28 @@ def update_or_create_active_meeting(request, org_id, room_name):
         })
 
     except json.JSONDecodeError:
-        print("❌ JSON decode error — invalid request body")
+        logger.warning("❌ JSON decode error — invalid request body")
         return JsonResponse({"error": "Invalid JSON"}, status=400)
     except Exception as e:
-        print(f"🔥 Exception in update_or_create_active_meeting: {e}")
+        logger.exception("🔥 Exception in update_or_create_active_meeting: %s", e)
         return JsonResponse({"error": "Internal server error"}, status=500)
     
 @csrf_exempt
 @login_required
 def generate_answers_bot(request, bot_id, org_id, room_name):
-    print(f"🟡 [generate_answers_bot] Called for bot_id={bot_id}, org={org_id}, room={room_name}")
+    logger.debug("🟡 [generate_answers_bot] Called for bot_id=%s, org=%s, room=%s", bot_id, org_id, room_name)
     
     try:
         bot = Bot.objects.filter(id=bot_id, organization__id=org_id).first()
         if not bot:
-            print(f"❌ Bot {bot_id} not found in org {org_id}")
+            logger.warning("❌ Bot %s not found in org %s", bot_id, org_id)
             return JsonResponse({"error": "Bot not found"}, status=404)
 
         # 🔹 Get meeting info from cache
         cache_key = f"active_meeting:{org_id}:{room_name}"
         existing = cache.get(cache_key)
         active_video_id = existing.get("active_video_id") if existing else None
-        print(f"🟩 Active video ID from cache: {active_video_id}")
+        logger.debug("🟩 Active video ID from cache: %s", active_video_id)
 
         if not active_video_id:
             return JsonResponse({"error": "Active video not found"}, status=400)
@@ -3495,18 +3308,48 @@ def generate_answers_bot(request, bot_id, org_id, room_name):
                 })
 
         question_place = 0 
-        final_answers = []
-        for seg in segment_data:
-            generated = SmartBotAnswerEngine.generate_simple_answers(
-                question=seg["question"],
-                answers=seg["answers"],
-                question_type=seg["type"],
-                bot_memory=bot_memory,
-                start_time=seg["start_time"],
-                end_time=seg["end_time"] - 8, # TODO: make this not hard coded
-                question_place=question_place, 
+
+        # 🧵 Batch priority: never delays live-question generation in other rooms,
+        # so give up (and drop whatever is still queued) after LLM_BOT_ANSWERS_TIMEOUT
+        deadline = time.time() + getattr(settings, "LLM_BOT_ANSWERS_TIMEOUT", 90)
+        futures = [
+            llm_scheduler.submit(
+                SmartBotAnswerEngine.generate_simple_answers,
+                kwargs={
+                    "question": seg["question"],
+                    "answers": seg["answers"],
+                    "question_type": seg["type"],
+                    "bot_memory": bot_memory,
+                    "start_time": seg["start_time"],
+                    "end_time": seg["end_time"] - 8, # TODO: make this not hard coded
+                    "question_place": question_place,
+                },
+                priority=PRIORITY_PREGEN,
+                org_id=org_id,
+                deadline=deadline,
             )
-            
+            for seg in segment_data
+        ]
+
+        final_answers = []
+        for index, (seg, future) in enumerate(zip(segment_data, futures)):
+            try:
+                generated = future.result(timeout=max(0.0, deadline - time.time()))
+            except (TimeoutError, LLMDeadlineExceeded):
+                for pending in futures[index:]:
+                    pending.cancel()
+                logger.warning(
+                    "⏱️ Bot %s answer generation timed out: %s/%s questions done",
+                    bot.id, len(final_answers), len(segment_data),
+                )
+                # Nothing is saved: the bot keeps its previous answers
+                return JsonResponse({
+                    "error": "Answer generation timed out, try again later",
+                    "bot_id": bot.id,
+                    "answers": final_answers,
+                    "pending": len(segment_data) - index,
+                }, status=503)
+
             if generated["answers"]:
                 final_answers.append({
                     "question_id": seg["id"],
@@ -3518,7 +3361,10 @@ def generate_answers_bot(request, bot_id, org_id, room_name):
         bot.answers = final_answers
         bot.save(update_fields=["answers"])
 
-        print(f"💾 Saved {len(final_answers)} generated answers for bot {bot.id}")
+        logger.info("💾 Saved %s generated answers for bot %s", len(final_answers), bot.id)
+
+        # 📦 Rooms using this bot replay its answers from the bundle
+        PlaybackBundle.rebuild_for(request, org_id, bot_id=bot.id)
 
         return JsonResponse({
             "ok": True,
@@ -3527,10 +3373,10 @@ def generate_answers_bot(request, bot_id, org_id, room_name):
         })
 
     except json.JSONDecodeError:
-        print("❌ JSON decode error — invalid request body")
+        logger.warning("❌ JSON decode error — invalid request body")
         return JsonResponse({"error": "Invalid JSON"}, status=400)
     except Exception as e:
-        print(f"🔥 Exception in generate_answers_bot: {e}")
+        logger.exception("🔥 Exception in generate_answers_bot: %s", e)
         return JsonResponse({"error": "Internal server error"}, status=500)
 
 @csrf_exempt
@@ -3539,10 +3385,10 @@ def get_active_bots_video_name(request, org_id, room_name):
     Fetches the active bots (from cached active meeting)
     and returns a list of {name, video_url}.
     """
-    print(f"🟦 [get_active_bots_video_name] Called for org={org_id}, room={room_name}")
+    logger.debug("🟦 [get_active_bots_video_name] Called for org=%s, room=%s", org_id, room_name)
 
     if request.method != "GET":
-        print("❌ Invalid request method:", request.method)
+        logger.warning("❌ Invalid request method: %s", request.method)
         return JsonResponse({"error": "Only GET allowed"}, status=405)
 
     try:
@@ -3550,45 +3396,42 @@ def get_active_bots_video_name(request, org_id, room_name):
         meeting_data = cache.get(cache_key)
 
         if not meeting_data or "active_bot_ids" not in meeting_data:
-            print(f"⚠️ No active bots found in cache for {cache_key}")
+            logger.debug("⚠️ No active bots found in cache for %s", cache_key)
             return JsonResponse({"bots": []})
 
         bot_ids = meeting_data.get("active_bot_ids", [])
         if not bot_ids:
-            print("⚠️ Empty active_bot_ids list.")
+            logger.debug("⚠️ Empty active_bot_ids list.")
             return JsonResponse({"bots": []})
 
+        # ✅ Same cached, bulk-resolved bots as get_bot_answers
         bots_info = []
-        for bot_id in bot_ids:
-            bot = Bot.objects.filter(id=bot_id, organization__id=org_id).first()
-            if not bot:
-                continue
-
+        for bot in PlaybackBundle.active_bots(request, org_id, room_name, bot_ids):
             # build safe absolute URL for video
             video_url = None
-            if bot.video_url:
-                if not bot.video_url.startswith("http") and not bot.video_url.startswith("/media/"):
+            if bot["video_url"]:
+                if not bot["video_url"].startswith("http") and not bot["video_url"].startswith("/media/"):
                     video_url = request.build_absolute_uri(
-                        os.path.join(settings.MEDIA_URL, bot.video_url)
+                        os.path.join(settings.MEDIA_URL, bot["video_url"])
                     ).replace("\\", "/")
                 else:
-                    video_url = request.build_absolute_uri(bot.video_url).replace("\\", "/")
+                    video_url = request.build_absolute_uri(bot["video_url"]).replace("\\", "/")
 
             bots_info.append({
-                "name": bot.name,
+                "name": bot["name"],
                 "video_url": video_url,
             })
 
-        print(f"✅ Returning {len(bots_info)} bots for org={org_id}, room={room_name}")
+        logger.debug("✅ Returning %s bots for org=%s, room=%s", len(bots_info), org_id, room_name)
         return JsonResponse({"bots": bots_info})
 
     except Exception as e:
-        print(f"🔥 Exception in get_active_bots_video_name: {e}")
+        logger.exception("🔥 Exception in get_active_bots_video_name: %s", e)
         return JsonResponse({"error": "Internal server error"}, status=500)
 
 @csrf_exempt
 def get_bot_answers(request, org_id, room_name):
-    print(f"🟦 [get_bot_answers] Called for org={org_id}, room={room_name}")
+    logger.debug("🟦 [get_bot_answers] Called for org=%s, room=%s", org_id, room_name)
 
     if request.method != "GET":
         return JsonResponse({"error": "Only GET allowed"}, status=405)
@@ -3598,72 +3441,19 @@ def get_bot_answers(request, org_id, room_name):
         meeting_data = cache.get(cache_key)
 
         if not meeting_data or "active_bot_ids" not in meeting_data:
-            print(f"⚠️ No active bots found for {cache_key}")
+            logger.debug("⚠️ No active bots found for %s", cache_key)
             return JsonResponse({"bots": []})
 
         bot_ids = meeting_data.get("active_bot_ids", [])
-        bots_info = []
-
-        def build_absolute_media_url(field):
-            """Convert an ImageField/FileField to a full URL string."""
-            if not field:
-                return None
-            try:
-                url = field.url if hasattr(field, "url") else str(field)
-                absolute = request.build_absolute_uri(url).replace("\\", "/")
-                return absolute
-            except Exception as e:
-                print(f"⚠️ Could not build media URL for {field}: {e}")
-                return None
-
-        for bot_id in bot_ids:
-            bot = Bot.objects.filter(id=bot_id, organization__id=org_id).first()
-            if not bot:
-                print(f"⚠️ Bot {bot_id} not found for org {org_id}")
-                continue
-
-            img_url = build_absolute_media_url(bot.image)
-            print(f"✅ [Bot {bot_id}] image_url={img_url}")
-
-            resolved_answers = []
-            for entry in (bot.answers or []):
-                if not isinstance(entry, dict):
-                    continue
-
-                qid = entry.get("question_id")
-                q_answers = entry.get("answers", [])
-                q_time = entry.get("answer_time")
-
-                if not qid:
-                    continue
-
-                q_obj = QuestionCard.objects.filter(id=qid).first()
-                resolved_answers.append({
-                    "question_id": qid,
-                    "question": q_obj.question if q_obj else None,
-                    "type": q_obj.type if q_obj else None,
-                    "answers": q_answers,
-                    "answer_time": q_time,
-                })
 
-            bots_info.append({
-                "id": bot.id,
-                "name": bot.name,
-                "image_url": img_url,
-                "memory": bot.memory,
-                "answers": resolved_answers,
-                "organization_id": bot.organization.id if bot.organization else None,
-                "meeting_id": bot.meeting.id if bot.meeting else None,
-                "video_url": bot.video_url,
-            })
+        # ✅ Bots + question cards resolved in bulk, cached per (room, bot set, bundle version)
+        bots_info = PlaybackBundle.active_bots(request, org_id, room_name, bot_ids)
 
-        print(f"✅ Returning {len(bots_info)} bots for org={org_id}, room={room_name}")
+        logger.debug("✅ Returning %s bots for org=%s, room=%s", len(bots_info), org_id, room_name)
         return JsonResponse({"bots": bots_info}, status=200)
 
     except Exception as e:
-        print(f"🔥 Exception in get_bot_answers: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("🔥 Exception in get_bot_answers: %s", e)
         return JsonResponse({"error": "Internal server error"}, status=500)
 
 @csrf_exempt
@@ -3697,23 +3487,23 @@ def get_question_by_id(request, question_id):
         return JsonResponse(data, status=200)
 
     except Exception as e:
-        print(f"❌ Error in get_question_by_id: {e}")
+        logger.exception("❌ Error in get_question_by_id: %s", e)
         return JsonResponse({"error": "Internal server error"}, status=500)
 
 @csrf_exempt
-def get_active_meeting(request, org_id, room_name):
-    print(f"🟦 [get_active_meeting] Called for org={org_id}, room={room_name}")
+async def get_active_meeting(request, org_id, room_name):
+    logger.debug("🟦 [get_active_meeting] Called for org=%s, room=%s", org_id, room_name)
 
     if request.method != "GET":
-        print("❌ Invalid request method:", request.method)
+        logger.warning("❌ Invalid request method: %s", request.method)
         return JsonResponse({"error": "Only GET allowed"}, status=405)
 
     cache_key = f"active_meeting:{org_id}:{room_name}"
-    data = cache.get(cache_key)
+    data = await async_cache.get(cache_key)
 
     # ✅ Ensure consistent return structure
     if not isinstance(data, dict):
-        print(f"⚠️ No valid cache found for key={cache_key}")
+        logger.debug("⚠️ No valid cache found for key=%s", cache_key)
         default = {
             "org_id": int(org_id),
             "room_name": str(room_name),
@@ -3722,13 +3512,16 @@ def get_active_meeting(request, org_id, room_name):
             "active_survey_id": None,
             "last_updated": now().isoformat(),
         }
-        cache.set(cache_key, default)
+        await async_cache.set(cache_key, default)
         return JsonResponse({
             "message": "New active meeting cache created",
             "data": default
         })
 
-    print(f"✅ Retrieved cached active meeting for {cache_key}: {data}")
+    # 🤖 Live bot answer pre-generation progress
+    data = await BotAnswerPregenerator.awith_progress(org_id, room_name, data)
+
+    logger.debug("✅ Retrieved cached active meeting for %s: %s", cache_key, data)
     return JsonResponse({
         "message": "Active meeting retrieved successfully",
         "data": data
@@ -3742,7 +3535,7 @@ def update_video_state(request, org_id, room_name):
     Only modifies fields that are explicitly provided in the request body.
     Broadcasts the updated state to all clients in the same WebSocket group.
     """
-    print(f"🟦 [update_video_state] Called for org={org_id}, room={room_name}")
+    logger.debug("🟦 [update_video_state] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         body = json.loads(request.body.decode("utf-8"))
@@ -3756,7 +3549,7 @@ def update_video_state(request, org_id, room_name):
                 "current_time": 0.0,
                 "last_updated": now().isoformat(),
             }
-            print(f"⚠️ No existing video state, initializing new one for {cache_key}")
+            logger.info("⚠️ No existing video state, initializing new one for %s", cache_key)
 
         # Only update keys that are explicitly provided
         updated_state = existing_state.copy()
@@ -3768,13 +3561,12 @@ def update_video_state(request, org_id, room_name):
         updated_state["last_updated"] = now().isoformat()
         cache.set(cache_key, updated_state, timeout=60 * 60 * 10)
 
-        print(f"✅ Updated video state for {cache_key}: {updated_state}")
+        logger.debug("✅ Updated video state for %s: %s", cache_key, updated_state)
 
         # Broadcast update to WebSocket group
-        channel_layer = get_channel_layer()
         group_name = f"meeting_{org_id}_{room_name}"
 
-        async_to_sync(channel_layer.group_send)(
+        outbox.publish(
             group_name,
             {
                 "type": "video_state_update",
@@ -3782,27 +3574,27 @@ def update_video_state(request, org_id, room_name):
             }
         )
 
-        print(f"📡 Broadcasted video_state_update to {group_name}")
+        logger.debug("📡 Broadcasted video_state_update to %s", group_name)
         return JsonResponse({
             "message": "Video state updated successfully",
             "data": updated_state,
         })
 
     except Exception as e:
-        print(f"❌ Error in update_video_state: {e}")
+        logger.exception("❌ Error in update_video_state: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
     
 
 
 @csrf_exempt
 @require_POST
-def reset_video_state(request, org_id, room_name):
+async def reset_video_state(request, org_id, room_name):
     """
     Resets the video playback state for a given org_id and room_name.
     Always sets stopped=True and current_time=0.0, then broadcasts
     the update to all connected WebSocket clients in that group.
     """
-    print(f"🔴 [reset_video_state] Called for org={org_id}, room={room_name}")
+    logger.debug("🔴 [reset_video_state] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         cache_key = f"video_state:{org_id}:{room_name}"
@@ -3815,14 +3607,12 @@ def reset_video_state(request, org_id, room_name):
         }
 
         # Save to cache (overwrite existing)
-        cache.set(cache_key, reset_state, timeout=60 * 60 * 10)
-        print(f"🧹 Reset video state for {cache_key}: {reset_state}")
+        await async_cache.set(cache_key, reset_state, timeout=60 * 60 * 10)
+        logger.info("🧹 Reset video state for %s", cache_key)
 
         # Broadcast to WebSocket group
-        channel_layer = get_channel_layer()
         group_name = f"meeting_{org_id}_{room_name}"
-
-        async_to_sync(channel_layer.group_send)(
+        await outbox.apublish(
             group_name,
             {
                 "type": "video_state_update",
@@ -3830,58 +3620,14 @@ def reset_video_state(request, org_id, room_name):
             }
         )
 
-        print(f"📡 Broadcasted reset video_state_update to {group_name}")
+        logger.debug("📡 Broadcasted reset video_state_update to %s", group_name)
         return JsonResponse({
             "message": "Video state reset successfully",
             "data": reset_state,
         })
 
     except Exception as e:
-        print(f"❌ Error in reset_video_state: {e}")
-        return JsonResponse({"error": str(e)}, status=500)
-    
-@csrf_exempt
-@require_POST
-def pause_video_state(request, org_id, room_name):
-    """
-    Pauses the video playback for the given org_id and room_name.
-    Sets stopped=True but keeps the current time from cache if available.
-    Broadcasts the update to all connected WebSocket clients.
-    """
-    print(f"⏸️ [pause_video_state] Called for org={org_id}, room={room_name}")
-
-    try:
-        cache_key = f"video_state:{org_id}:{room_name}"
-
-        # Get existing state if available
-        existing = cache.get(cache_key)
-        if not isinstance(existing, dict):
-            existing = {"stopped": True, "current_time": 0.0}
-            print(f"⚠️ No existing state found, initializing default for {cache_key}")
-
-        paused_state = {
-            **existing,
-            "stopped": True,
-            "last_updated": now().isoformat(),
-        }
-
-        cache.set(cache_key, paused_state, timeout=60 * 60 * 10)
-        print(f"💾 Cached paused state for {cache_key}: {paused_state}")
-
-        # Broadcast to WebSocket group
-        channel_layer = get_channel_layer()
-        group_name = f"meeting_{org_id}_{room_name}"
-
-        async_to_sync(channel_layer.group_send)(
-            group_name,
-            {"type": "video_state_update", "state": paused_state}
-        )
-
-        print(f"📡 Broadcasted pause_video_state to {group_name}")
-        return JsonResponse({"message": "Video paused successfully", "data": paused_state})
-
-    except Exception as e:
-        print(f"❌ Error in pause_video_state: {e}")
+        logger.exception("❌ Error in reset_video_state: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
@@ -3892,7 +3638,7 @@ def stop_meeting_complete(request, org_id, room_name):
     Sets ended=True and retains the current active_survey_id if available.
     Broadcasts the updated meeting state to all connected WebSocket clients.
     """
-    print(f"🟥 [stop_meeting_complete] Called for org={org_id}, room={room_name}")
+    logger.debug("🟥 [stop_meeting_complete] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         cache_key = f"active_meeting:{org_id}:{room_name}"
@@ -3908,7 +3654,7 @@ def stop_meeting_complete(request, org_id, room_name):
                 "active_survey_id": None,
                 "last_updated": now().isoformat(),
             }
-            print(f"⚠️ No existing meeting found, initializing default for {cache_key}")
+            logger.info("⚠️ No existing meeting found, initializing default for %s", cache_key)
 
         # Mark meeting as ended
         updated_state = {
@@ -3918,25 +3664,24 @@ def stop_meeting_complete(request, org_id, room_name):
         }
 
         cache.set(cache_key, updated_state, timeout=60 * 60 * 10)
-        print(f"💾 Cached ended meeting state for {cache_key}: {updated_state}")
+        logger.info("🟥 Meeting ended for %s", cache_key)
 
         # Broadcast to WebSocket group
-        channel_layer = get_channel_layer()
         group_name = f"meeting_{org_id}_{room_name}"
 
-        async_to_sync(channel_layer.group_send)(
+        outbox.publish(
             group_name,
             {"type": "meeting_state_changed", "state": updated_state}
         )
 
-        print(f"📡 Broadcasted stop_meeting_complete to {group_name}")
+        logger.debug("📡 Broadcasted stop_meeting_complete to %s", group_name)
         return JsonResponse({
             "message": "Meeting ended successfully",
             "data": updated_state,
         })
 
     except Exception as e:
-        print(f"❌ Error in stop_meeting_complete: {e}")
+        logger.exception("❌ Error in stop_meeting_complete: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
     
 @csrf_exempt
@@ -3947,7 +3692,7 @@ def start_meeting_again(request, org_id, room_name):
     Sets ended=False and retains any existing active_survey_id, bots, or video.
     Broadcasts the updated meeting state to all connected WebSocket clients.
     """
-    print(f"🟩 [start_meeting] Called for org={org_id}, room={room_name}")
+    logger.debug("🟩 [start_meeting] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         cache_key = f"active_meeting:{org_id}:{room_name}"
@@ -3963,7 +3708,7 @@ def start_meeting_again(request, org_id, room_name):
                 "active_survey_id": None,
                 "last_updated": now().isoformat(),
             }
-            print(f"⚠️ No existing meeting found, initializing default for {cache_key}")
+            logger.info("⚠️ No existing meeting found, initializing default for %s", cache_key)
 
         # Mark meeting as active (not ended)
         updated_state = {
@@ -3973,73 +3718,72 @@ def start_meeting_again(request, org_id, room_name):
         }
 
         cache.set(cache_key, updated_state, timeout=60 * 60 * 10)
-        print(f"💾 Cached active meeting state for {cache_key}: {updated_state}")
+        logger.info("🟩 Meeting restarted for %s", cache_key)
 
         # Broadcast to WebSocket group
-        channel_layer = get_channel_layer()
         group_name = f"meeting_{org_id}_{room_name}"
 
-        async_to_sync(channel_layer.group_send)(
+        outbox.publish(
             group_name,
             {"type": "meeting_state_changed", "state": updated_state}
         )
 
-        print(f"📡 Broadcasted start_meeting to {group_name}")
+        logger.debug("📡 Broadcasted start_meeting to %s", group_name)
         return JsonResponse({
             "message": "Meeting started successfully",
             "data": updated_state,
         })
 
     except Exception as e:
-        print(f"❌ Error in start_meeting: {e}")
+        logger.exception("❌ Error in start_meeting: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
-def get_meeting_end_state(request, org_id, room_name):
+async def get_meeting_end_state(request, org_id, room_name):
     """
     Returns whether the meeting is currently ended or active.
     Useful for frontend initialization before WebSocket updates arrive.
     """
-    print(f"🟢 [get_meeting_state] Request for org={org_id}, room={room_name}")
+    logger.debug("🟢 [get_meeting_state] Request for org=%s, room=%s", org_id, room_name)
 
     try:
         cache_key = f"active_meeting:{org_id}:{room_name}"
-        existing = cache.get(cache_key)
+        existing = await async_cache.get(cache_key)
 
         if not isinstance(existing, dict):
-            print(f"⚠️ No meeting state found for {cache_key}, returning default ended=True")
+            logger.debug("⚠️ No meeting state found for %s, returning default ended=True", cache_key)
             return JsonResponse({"ended": True, "exists": False})
 
         ended = existing.get("ended", True)
-        print(f"📦 Cached meeting state for {cache_key}: ended={ended}")
+        logger.debug("📦 Cached meeting state for %s: ended=%s", cache_key, ended)
         return JsonResponse({"ended": ended, "exists": True})
 
     except Exception as e:
-        print(f"❌ Error in get_meeting_state: {e}")
+        logger.exception("❌ Error in get_meeting_state: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
     
 @csrf_exempt
-def get_active_survey_id(request, org_id, room_name):
+async def get_active_survey_id(request, org_id, room_name):
     """
     Returns the current active_survey_id for the given org_id and room_name.
     Looks up the cache key 'active_meeting:{org_id}:{room_name}'.
     If not found, returns active_survey_id=None.
     """
-    print(f"🟨 [get_active_survey_id] Called for org={org_id}, room={room_name}")
+    logger.debug("🟨 [get_active_survey_id] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         cache_key = f"active_meeting:{org_id}:{room_name}"
-        state = cache.get(cache_key)
+        state = await async_cache.get(cache_key)
 
         if not isinstance(state, dict):
-            print(f"⚠️ No existing meeting found for {cache_key}")
+            logger.debug("⚠️ No existing meeting found for %s", cache_key)
             return JsonResponse({
                 "message": "No active meeting found",
                 "active_survey_id": None,
             })
 
         active_survey_id = state.get("active_survey_id", None)
-        print(f"✅ Active survey ID for {cache_key}: {active_survey_id}")
+        logger.debug("✅ Active survey ID for %s: %s", cache_key, active_survey_id)
 
         return JsonResponse({
             "message": "Active survey ID retrieved successfully",
@@ -4047,7 +3791,7 @@ def get_active_survey_id(request, org_id, room_name):
         })
 
     except Exception as e:
-        print(f"❌ Error in get_active_survey_id: {e}")
+        logger.exception("❌ Error in get_active_survey_id: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
@@ -4057,7 +3801,7 @@ def update_final_state(request, org_id, room_name):
     Updates the active_survey_id for a given org_id and room_name.
     Broadcasts the updated meeting state to all connected WebSocket clients.
     """
-    print(f"🟦 [update_final_state] Called for org={org_id}, room={room_name}")
+    logger.debug("🟦 [update_final_state] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         body = json.loads(request.body.decode("utf-8"))
@@ -4076,20 +3820,25 @@ def update_final_state(request, org_id, room_name):
                 "active_survey_id": None,
                 "last_updated": None,
             }
-            print(f"⚠️ No existing meeting found, initializing new one for {cache_key}")
+            logger.info("⚠️ No existing meeting found, initializing new one for %s", cache_key)
 
         updated_state = existing_state.copy()
         updated_state["active_survey_id"] = survey_id
         updated_state["last_updated"] = now().isoformat()
         cache.set(cache_key, updated_state, timeout=None)
 
-        print(f"✅ Updated active_survey_id for {cache_key}: {survey_id}")
+        logger.info("✅ Updated active_survey_id for %s: %s", cache_key, survey_id)
+
+        # 📦 Survey is part of the playback bundle
+        try:
+            PlaybackBundle.compile(request, org_id, room_name, updated_state)
+        except Exception as e:
+            logger.warning("⚠️ Failed to compile playback bundle for %s: %s", cache_key, e)
 
         # Broadcast update to WebSocket group
-        channel_layer = get_channel_layer()
         group_name = f"meeting_{org_id}_{room_name}"
 
-        async_to_sync(channel_layer.group_send)(
+        outbox.publish(
             group_name,
             {
                 "type": "meeting_state_changed",
@@ -4097,19 +3846,19 @@ def update_final_state(request, org_id, room_name):
             }
         )
 
-        print(f"📡 Broadcasted meeting_state_changed to {group_name}")
+        logger.debug("📡 Broadcasted meeting_state_changed to %s", group_name)
         return JsonResponse({
             "message": "Survey ID updated successfully",
             "data": updated_state,
         })
 
     except Exception as e:
-        print(f"❌ Error in update_final_state: {e}")
+        logger.exception("❌ Error in update_final_state: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 
 @csrf_exempt
-def get_video_state(request, org_id, room_name):
+async def get_video_state(request, org_id, room_name):
     """
     Retrieves the current video playback state for a given org_id and room_name.
     Returns:
@@ -4118,22 +3867,22 @@ def get_video_state(request, org_id, room_name):
       - last_updated (str, ISO 8601)
     If no cache entry exists, initializes a default state.
     """
-    print(f"🟦 [get_video_state] Called for org={org_id}, room={room_name}")
+    logger.debug("🟦 [get_video_state] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         cache_key = f"video_state:{org_id}:{room_name}"
-        state = cache.get(cache_key)
+        state = await async_cache.get(cache_key)
 
         if not isinstance(state, dict):
-            print(f"⚠️ No video state found for {cache_key}, initializing new one")
+            logger.debug("⚠️ No video state found for %s, initializing new one", cache_key)
             state = {
                 "stopped": True,
                 "current_time": 0.0,
                 "last_updated": now().isoformat(),
             }
-            cache.set(cache_key, state, timeout=60 * 60 * 10)
+            await async_cache.set(cache_key, state, timeout=60 * 60 * 10)
 
-        print(f"✅ Current video state for {cache_key}: {state}")
+        logger.debug("✅ Current video state for %s: %s", cache_key, state)
 
         return JsonResponse({
             "message": "Video state retrieved successfully",
@@ -4141,27 +3890,27 @@ def get_video_state(request, org_id, room_name):
         })
 
     except Exception as e:
-        print(f"❌ Error in get_video_state: {e}")
+        logger.exception("❌ Error in get_video_state: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
 @require_POST
-def start_video_state(request, org_id, room_name):
+async def start_video_state(request, org_id, room_name):
     """
     Starts (resumes) the video playback for the given org_id and room_name.
     Sets stopped=False but keeps the current time from cache if available.
     Broadcasts the update to all connected WebSocket clients.
     """
-    print(f"▶️ [start_video_state] Called for org={org_id}, room={room_name}")
+    logger.debug("▶️ [start_video_state] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         cache_key = f"video_state:{org_id}:{room_name}"
 
         # Get existing state if available
-        existing = cache.get(cache_key)
+        existing = await async_cache.get(cache_key)
         if not isinstance(existing, dict):
             existing = {"stopped": False, "current_time": 0.0}
-            print(f"⚠️ No existing state found, initializing default for {cache_key}")
+            logger.info("⚠️ No existing state found, initializing default for %s", cache_key)
 
         started_state = {
             **existing,
@@ -4169,43 +3918,41 @@ def start_video_state(request, org_id, room_name):
             "last_updated": now().isoformat(),
         }
 
-        cache.set(cache_key, started_state, timeout=60 * 60 * 10)
-        print(f"💾 Cached started state for {cache_key}: {started_state}")
+        await async_cache.set(cache_key, started_state, timeout=60 * 60 * 10)
+        logger.info("▶️ Started video state for %s", cache_key)
 
         # Broadcast to WebSocket group
-        channel_layer = get_channel_layer()
         group_name = f"meeting_{org_id}_{room_name}"
-
-        async_to_sync(channel_layer.group_send)(
+        await outbox.apublish(
             group_name,
             {"type": "video_state_update", "state": started_state}
         )
 
-        print(f"📡 Broadcasted start_video_state to {group_name}")
+        logger.debug("📡 Broadcasted start_video_state to %s", group_name)
         return JsonResponse({"message": "Video started successfully", "data": started_state})
 
     except Exception as e:
-        print(f"❌ Error in start_video_state: {e}")
+        logger.exception("❌ Error in start_video_state: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
 
 @csrf_exempt
 @require_POST
-def pause_video_state(request, org_id, room_name):
+async def pause_video_state(request, org_id, room_name):
     """
     Pauses the video playback for the given org_id and room_name.
     Sets stopped=True but keeps the current time from cache if available.
     Broadcasts the update to all connected WebSocket clients.
     """
-    print(f"⏸️ [pause_video_state] Called for org={org_id}, room={room_name}")
+    logger.debug("⏸️ [pause_video_state] Called for org=%s, room=%s", org_id, room_name)
 
     try:
         cache_key = f"video_state:{org_id}:{room_name}"
 
         # Get existing state if available
-        existing = cache.get(cache_key)
+        existing = await async_cache.get(cache_key)
         if not isinstance(existing, dict):
             existing = {"stopped": True, "current_time": 0.0}
-            print(f"⚠️ No existing state found, initializing default for {cache_key}")
+            logger.info("⚠️ No existing state found, initializing default for %s", cache_key)
 
         paused_state = {
             **existing,
@@ -4213,23 +3960,21 @@ def pause_video_state(request, org_id, room_name):
             "last_updated": now().isoformat(),
         }
 
-        cache.set(cache_key, paused_state, timeout=60 * 60 * 10)
-        print(f"💾 Cached paused state for {cache_key}: {paused_state}")
+        await async_cache.set(cache_key, paused_state, timeout=60 * 60 * 10)
+        logger.info("⏸️ Paused video state for %s", cache_key)
 
         # Broadcast to WebSocket group
-        channel_layer = get_channel_layer()
         group_name = f"meeting_{org_id}_{room_name}"
-
-        async_to_sync(channel_layer.group_send)(
+        await outbox.apublish(
             group_name,
             {"type": "video_state_update", "state": paused_state}
         )
 
-        print(f"📡 Broadcasted pause_video_state to {group_name}")
+        logger.debug("📡 Broadcasted pause_video_state to %s", group_name)
         return JsonResponse({"message": "Video paused successfully", "data": paused_state})
 
     except Exception as e:
-        print(f"❌ Error in pause_video_state: {e}")
+        logger.exception("❌ Error in pause_video_state: %s", e)
         return JsonResponse({"error": str(e)}, status=500)
     
 
@@ -4244,95 +3989,110 @@ def get_active_meeting_with_segments(request, org_id, room_name):
       - last_updated
       - video_url (absolute)
       - all associated video segments (with question card data if any)
+      - active bots with their resolved answers
+    Served from the precompiled playback bundle (see utils/playback_bundle.py)
+    with an ETag; If-None-Match → 304.
     Returns "none found" if no meeting cache exists.
     """
-    print(f"🟦 [get_active_meeting_with_segments] Called for org={org_id}, room={room_name}")
-
     if request.method != "GET":
-        print("❌ Invalid request method:", request.method)
+        logger.warning("❌ Invalid request method: %s", request.method)
         return JsonResponse({"error": "Only GET allowed"}, status=405)
 
     try:
-        cache_key = f"active_meeting:{org_id}:{room_name}"
-        meeting_data = cache.get(cache_key)
+        # ⚡ Conditional request: only the version is read from Redis
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match:
+            version = PlaybackBundle.current_version(org_id, room_name)
+            etag = PlaybackBundle.etag(org_id, room_name, version)
+            if version is not None and if_none_match == etag:
+                response = HttpResponseNotModified()
+                response["ETag"] = etag
+                return response
+
+        version, body = PlaybackBundle.load(org_id, room_name)
+
+        if body is None:
+            # 🧱 No bundle yet (expired / activated before bundles existed) → compile once
+            cache_key = f"active_meeting:{org_id}:{room_name}"
+            meeting_data = cache.get(cache_key)
+            if not isinstance(meeting_data, dict):
+                logger.debug("⚠️ No meeting cache found for key=%s", cache_key)
+                return JsonResponse({"message": "none found", "data": None})
+            version, body = PlaybackBundle.compile(request, org_id, room_name, meeting_data)
+
+        response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = PlaybackBundle.etag(org_id, room_name, version)
+        response["Cache-Control"] = "no-cache"
+        return response
 
-        if not isinstance(meeting_data, dict):
-            print(f"⚠️ No meeting cache found for key={cache_key}")
-            return JsonResponse({"message": "none found", "data": None})
+    except Exception as e:
+        logger.exception("🔥 Exception in get_active_meeting_with_segments: %s", e)
+        return JsonResponse({"error": "Internal server error"}, status=500)
 
-        print(f"✅ Found cached meeting: {meeting_data}")
+@login_required
+def llm_scheduler_stats(request):
+    """Queue depth / in-flight / wait times of this process's LLM scheduler (staff only)."""
+    if request.method != "GET":
+        return JsonResponse({"error": "Only GET allowed"}, status=405)
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
 
-        active_video_id = meeting_data.get("active_video_id")
-        active_survey_id = meeting_data.get("active_survey_id")
-        active_bot_ids = meeting_data.get("active_bot_ids", [])
-        last_updated = meeting_data.get("last_updated")
+    return JsonResponse({"pid": os.getpid(), **llm_scheduler.stats()})
 
-        video_segments_data = []
-        video_url = None
 
-        if active_video_id:
-            try:
-                # 🎥 Fetch video and ensure full absolute URL
-                video_obj = Video.objects.filter(id=active_video_id).first()
-                if video_obj:
-                    video_url = make_absolute_media_url(request, video_obj.url)
-
-                # 🎬 Fetch all segments with question cards
-                segments = (
-                    VideoSegment.objects
-                    .filter(video_id=active_video_id)
-                    .select_related("question_card")
-                    .order_by("source_start")
-                )
+@login_required
+def perf_stats(request):
+    """Per-URL-name latency histograms, DB/cache cost and consumer stats, all processes (staff only)."""
+    if request.method != "GET":
+        return JsonResponse({"error": "Only GET allowed"}, status=405)
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
 
-                for seg in segments:
-                    seg_data = {
-                        "id": seg.id,
-                        "source_start": seg.source_start,
-                        "source_end": seg.source_end,
-                        "question_card": None,
-                    }
-
-                    if seg.question_card:
-                        q = seg.question_card
-                        seg_data["question_card"] = {
-                            "id": q.id,
-                            "question": q.question,
-                            "answers": q.answers,
-                            "difficulty": q.difficulty,
-                            "type": q.type,
-                            "display_type": q.display_type,
-                            "show_winner": q.show_winner,
-                            "live": q.live,
-                            "correct_answers": q.correct_answers,
-                        }
-
-                    video_segments_data.append(seg_data)
-
-                print(f"🎬 Retrieved {len(video_segments_data)} segments for video {active_video_id}")
+    try:
+        return JsonResponse(perf.snapshot())
+    except Exception as e:
+        logger.exception("❌ Error in perf_stats: %s", e)
+        return JsonResponse({"error": "Internal server error"}, status=500)
 
-            except Exception as e:
-                print(f"⚠️ Failed to fetch video or segments for {active_video_id}: {e}")
-                video_segments_data = []
-                video_url = None
 
-        response_data = {
-            "message": "Active meeting data retrieved",
-            "data": {
-                "org_id": int(org_id),
-                "room_name": str(room_name),
-                "active_video_id": active_video_id,
-                "active_survey_id": active_survey_id,
-                "active_bot_ids": active_bot_ids,
-                "last_updated": last_updated,
-                "video_url": video_url,  # ✅ Now absolute URL
-                "video_segments": video_segments_data,
-            },
-        }
+def metrics(request):
+    """Prometheus scrape endpoint: staff session, or `Authorization: Bearer <METRICS_TOKEN>`."""
+    if request.method != "GET":
+        return JsonResponse({"error": "Only GET allowed"}, status=405)
 
-        print(f"✅ Returning active meeting data with absolute video URL: {video_url}")
-        return JsonResponse(response_data, status=200)
+    token = getattr(settings, "METRICS_TOKEN", "")
+    auth = request.headers.get("Authorization", "")
+    has_token = bool(token) and auth.startswith("Bearer ") and constant_time_compare(auth[7:], token)
+    if not has_token and not request.user.is_staff:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
 
+    try:
+        return HttpResponse(perf.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
     except Exception as e:
-        print(f"🔥 Exception in get_active_meeting_with_segments: {e}")
-        return JsonResponse({"error": "Internal server error"}, status=500)
\ No newline at end of file
+        logger.exception("❌ Error in metrics: %s", e)
+        return JsonResponse({"error": "Internal server error"}, status=500)
+
+
+@login_required
+def list_profiles(request):
+    """Stored CPU profiles (.folded) and tracemalloc reports (.txt), newest first (staff only)."""
+    if request.method != "GET":
+        return JsonResponse({"error": "Only GET allowed"}, status=405)
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    profiles = sorted(profiling.list_profiles(), key=lambda entry: -entry["modified"])
+    return JsonResponse({"profiles": profiles})
+
+
+@login_required
+def download_profile(request, name):
+    if request.method != "GET":
+        return JsonResponse({"error": "Only GET allowed"}, status=405)
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    path = profiling.profile_path(name)
+    if path is None:
+        return JsonResponse({"error": "Profile not found"}, status=404)
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=name, content_type="text/plain")
@@ -23,6 +23,39 @@ DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "127.0.0.1,localhost").split(",")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# LLM scheduler (per process): total OpenAI workers, and how many only take live-question jobs
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "6"))
+LLM_LIVE_RESERVED = int(os.getenv("LLM_LIVE_RESERVED", "2"))
+# How long generate_answers_bot holds its (sync) worker waiting for batch-priority generations
+LLM_BOT_ANSWERS_TIMEOUT = int(os.getenv("LLM_BOT_ANSWERS_TIMEOUT", "90"))
+
+# Request/consumer perf counters (authenticator.perf): flush interval, and whether
+# responses carry a Server-Timing header (visible in the browser's network panel)
+PERF_FLUSH_SECONDS = int(os.getenv("PERF_FLUSH_SECONDS", "10"))
+PERF_SERVER_TIMING = os.getenv("PERF_SERVER_TIMING", "True").lower() == "true"
+
+# View broadcasts go through a Redis stream relayed by daphne (authenticator.outbox):
+# stream length cap, and how old an event may be before the relay drops it as stale
+OUTBOX_MAXLEN = int(os.getenv("OUTBOX_MAXLEN", "10000"))
+OUTBOX_MAX_AGE_SECONDS = int(os.getenv("OUTBOX_MAX_AGE_SECONDS", "30"))
+
+# Per-org change feed (authenticator.org_feed): events kept for ?since= replay on reconnect
+ORG_FEED_MAXLEN = int(os.getenv("ORG_FEED_MAXLEN", "1000"))
+
+# Lifetime of the signed websocket tickets join_room hands to participants (authenticator.join_tickets)
+JOIN_TICKET_MAX_AGE = int(os.getenv("JOIN_TICKET_MAX_AGE", str(4 * 60 * 60)))
+
+# Bearer token Prometheus scrapes /auth/metrics/ with (staff sessions work too); unset = staff only
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# On-demand profiling (authenticator.profiling). Off unless a sample rate or a token is set:
+# requests with `X-Profile: <PROFILE_TOKEN>` are always profiled. Output goes to PROFILE_DIR.
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
 CSRF_TRUSTED_ORIGINS = os.getenv(
     "CSRF_TRUSTED_ORIGINS",
     "https://illusion-classroom.com,https://www.illusion-classroom.com"
@@ -63,6 +96,9 @@ INSTALLED_APPS = [
 # Middleware
 # ------------------------------------------------------
 MIDDLEWARE = [
+    "authenticator.middleware.RequestIdMiddleware",  # 👈 first, so every log line carries the id
+    "authenticator.middleware.PerfMiddleware",  # 👈 wall/DB/cache time per URL name + Server-Timing
+    "authenticator.middleware.ProfileMiddleware",  # 👈 no-op unless PROFILE_SAMPLE_RATE / PROFILE_TOKEN
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -114,7 +150,7 @@ WSGI_APPLICATION = "illusion_classroom.wsgi.application"
 # ------------------------------------------------------
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "BACKEND": "authenticator.perf.InstrumentedRedisChannelLayer",  # 👈 channels_redis + group_send timing
         "CONFIG": {
             "hosts": [
                 (
@@ -131,7 +167,7 @@ CHANNEL_LAYERS = {
 # ------------------------------------------------------
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": "authenticator.perf.InstrumentedRedisCache",  # 👈 django-redis + per-request timing
         "LOCATION": f"redis://{os.getenv('REDIS_HOST', 'redis')}:{os.getenv('REDIS_PORT', '6379')}/1",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -153,6 +189,44 @@ DATABASES = {
     }
 }
 
+# ------------------------------------------------------
+# Logging
+# ------------------------------------------------------
+# LOG_FORMAT=json|text. LOG_LEVEL applies to the app; LOG_LEVELS overrides
+# per module, e.g. "authenticator.meeting_timer=DEBUG,django.db.backends=DEBUG".
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text" if DEBUG else "json")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = {
+    name.strip(): level.strip().upper()
+    for name, _, level in (item.partition("=") for item in os.getenv("LOG_LEVELS", "").split(","))
+    if name.strip() and level.strip()
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {"()": "authenticator.log.RequestIdFilter"},
+    },
+    "formatters": {
+        "json": {"()": "authenticator.log.JsonFormatter"},
+        "text": {"()": "authenticator.log.TextFormatter"},
+    },
+    "handlers": {
+        "console": {
+            "()": "authenticator.log.BackgroundStreamHandler",
+            "formatter": LOG_FORMAT,
+            "filters": ["request_id"],
+        },
+    },
+    "root": {"handlers": ["console"], "level": "WARNING"},
+    "loggers": {
+        "django": {"level": "INFO"},
+        "authenticator": {"level": LOG_LEVEL},
+        **{name: {"level": level} for name, level in LOG_LEVELS.items()},
+    },
+}
+
 # ------------------------------------------------------
 # REST Framework
 # ------------------------------------------------------
@@ -5,6 +5,7 @@ import React, {
   useState,
 } from "react";
 import { useParams } from "react-router-dom";
+import { getJoinTicket, JOIN_TICKET_EVENT } from "./joinTicket";
 
 interface MainMeetingWebSocketContextType {
   socket: WebSocket | null;
@@ -35,6 +36,14 @@ export const MainMeetingWebSocketProvider: React.FC<
 
   const [socket, setSocket] = useState<WebSocket | null>(null);
   const [isConnected, setIsConnected] = useState(false);
+  const [ticketVersion, setTicketVersion] = useState(0);
+
+  // 🎟️ Reconnect once join-room hands out a (new) ticket
+  useEffect(() => {
+    const onTicket = () => setTicketVersion((v) => v + 1);
+    window.addEventListener(JOIN_TICKET_EVENT, onTicket);
+    return () => window.removeEventListener(JOIN_TICKET_EVENT, onTicket);
+  }, []);
 
   useEffect(() => {
     if (!resolvedOrgId || !resolvedRoomName) {
@@ -45,8 +54,11 @@ export const MainMeetingWebSocketProvider: React.FC<
     // Determine ws:// or wss:// automatically
     const wsProtocol = window.location.protocol === "https:" ? "wss" : "ws";
 
-    // Build the URL relative to your current domain (goes through Nginx)
-    const socketUrl = `${wsProtocol}://${window.location.host}/ws/meeting/${resolvedOrgId}/${resolvedRoomName}/`;
+    // Build the URL relative to your current domain (goes through Nginx);
+    // participants authenticate with their join ticket, instructors with the session cookie
+    const ticket = getJoinTicket(resolvedOrgId, resolvedRoomName);
+    const query = ticket ? `?ticket=${encodeURIComponent(ticket)}` : "";
+    const socketUrl = `${wsProtocol}://${window.location.host}/ws/meeting/${resolvedOrgId}/${resolvedRoomName}/${query}`;
 
     console.log("🔌 Connecting to:", socketUrl);
     const newSocket = new WebSocket(socketUrl);
@@ -72,7 +84,7 @@ export const MainMeetingWebSocketProvider: React.FC<
       newSocket.close();
       setSocket(null);
     };
-  }, [resolvedOrgId, resolvedRoomName]);
+  }, [resolvedOrgId, resolvedRoomName, ticketVersion]);
 
   return (
     <MainMeetingWebSocketContext.Provider value={{ socket, isConnected }}>
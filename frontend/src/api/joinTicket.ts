@@ -0,0 +1,38 @@
+// Signed websocket tickets handed out by join-room (one per org/room).
+// The meeting socket sends it as ?ticket=; instructors connect with their session instead.
+
+export const JOIN_TICKET_EVENT = "join-ticket-changed";
+
+interface StoredJoinTicket {
+  ticket: string;
+  expiresAt: number; // epoch seconds
+}
+
+const storageKey = (orgId: number | string, roomName: string) =>
+  `join_ticket:${orgId}:${roomName}`;
+
+export const saveJoinTicket = (
+  orgId: number | string,
+  roomName: string,
+  ticket: string,
+  expiresAt: number,
+) => {
+  const value: StoredJoinTicket = { ticket, expiresAt };
+  localStorage.setItem(storageKey(orgId, roomName), JSON.stringify(value));
+  window.dispatchEvent(new Event(JOIN_TICKET_EVENT));
+};
+
+// Unexpired ticket for this room, or null
+export const getJoinTicket = (
+  orgId: number | string,
+  roomName: string,
+): string | null => {
+  const raw = localStorage.getItem(storageKey(orgId, roomName));
+  if (!raw) return null;
+  try {
+    const { ticket, expiresAt } = JSON.parse(raw) as StoredJoinTicket;
+    return expiresAt * 1000 > Date.now() ? ticket : null;
+  } catch {
+    return null;
+  }
+};
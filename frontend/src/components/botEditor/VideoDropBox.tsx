@@ -33,7 +33,7 @@ const VideoDropBox: React.FC<VideoDropBoxProps> = ({
   const [bots, setBots] = useState<Bot[]>([]);
   const [isDragging, setIsDragging] = useState(false);
 
-  const { socket } = useOrgSocketContext();
+  const { subscribe, resyncVersion } = useOrgSocketContext();
   const { org_id, roomName } = useParams<{
     org_id: string;
     roomName: string;
@@ -68,7 +68,7 @@ const VideoDropBox: React.FC<VideoDropBoxProps> = ({
       await loadInitialBots();
     };
     reloadBots();
-  }, [selectedIndex]);
+  }, [selectedIndex, resyncVersion]);
 
   // =======================================================
   // 3️⃣ Load Bots from Backend → Save to IndexedDB
@@ -150,10 +150,7 @@ const VideoDropBox: React.FC<VideoDropBoxProps> = ({
   // 5️⃣ WebSocket Listener
   // =======================================================
   useEffect(() => {
-    if (!socket) return;
-
-    const handleMessage = async (event: MessageEvent) => {
-      const msg = JSON.parse(event.data);
+    const handleMessage = async (msg: any) => {
       if (msg.type !== "org_update" || msg.category !== "bot") return;
 
       const { action, payload } = msg;
@@ -168,8 +165,7 @@ const VideoDropBox: React.FC<VideoDropBoxProps> = ({
 
           case "create":
           case "update": {
-            const botResp = await getBotByIdFromServer(botId);
-            const b = botResp?.bot;
+            const b = msg.data ?? (await getBotByIdFromServer(botId))?.bot;
 
             if (b) {
               const parsedAnswers: BotAnswer[] = Array.isArray(b.answers)
@@ -202,9 +198,9 @@ const VideoDropBox: React.FC<VideoDropBoxProps> = ({
       }
     };
 
-    socket.addEventListener("message", handleMessage);
-    return () => socket.removeEventListener("message", handleMessage);
-  }, [socket, userChecked, orgChecked]);
+    const unsubscribe = subscribe(handleMessage);
+    return unsubscribe;
+  }, [subscribe, userChecked, orgChecked]);
 
   // =======================================================
   // 6️⃣ Drag-and-Drop Upload
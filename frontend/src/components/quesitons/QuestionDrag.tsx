@@ -38,7 +38,7 @@ const QuestionDropZone: React.FC<QuestionDropZoneProps> = ({
     org_id: string;
     roomName: string;
   }>();
-  const { socket } = useOrgSocketContext();
+  const { subscribe, resyncVersion } = useOrgSocketContext();
   const currentMeetingIdRef = useRef<string | null>(null);
 
   // ===============================
@@ -81,7 +81,7 @@ const QuestionDropZone: React.FC<QuestionDropZoneProps> = ({
     };
 
     syncFromBackend();
-  }, [selectedIndex, org_id]);
+  }, [selectedIndex, org_id, resyncVersion]);
 
   // ===============================
   // 2️⃣ Fetch current meeting ID
@@ -129,10 +129,7 @@ const QuestionDropZone: React.FC<QuestionDropZoneProps> = ({
   // 4️⃣ Handle WebSocket updates
   // ===============================
   useEffect(() => {
-    if (!socket) return;
-
-    const handleMessage = async (event: MessageEvent) => {
-      const msg = JSON.parse(event.data);
+    const handleMessage = async (msg: any) => {
       if (msg.type !== "org_update" || msg.category !== "question") return;
 
       const { action, payload } = msg;
@@ -149,7 +146,9 @@ const QuestionDropZone: React.FC<QuestionDropZoneProps> = ({
 
         case "create": {
           console.log("GOT A CREATE ORDER", msg)
-          const q = await getQuestionCardById(questionId);
+          const q = msg.data
+            ? { ...msg.data, correctAnswers: msg.data.correctAnswers ?? [] }
+            : await getQuestionCardById(questionId);
           if (!q) return;
 
           const associatedMeetingId = String(q.meeting_id ?? "");
@@ -196,9 +195,9 @@ const QuestionDropZone: React.FC<QuestionDropZoneProps> = ({
       }
     };
 
-    socket.addEventListener("message", handleMessage);
-    return () => socket.removeEventListener("message", handleMessage);
-  }, [socket, userChecked, orgChecked]);
+    const unsubscribe = subscribe(handleMessage);
+    return unsubscribe;
+  }, [subscribe, userChecked, orgChecked]);
 
   // ===============================
   // 5️⃣ Handle file drop (.txt)
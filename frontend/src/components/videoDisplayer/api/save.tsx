@@ -231,6 +231,21 @@ export const editVideo = async (
   }
 };
 
+// Server video payload (get_video_by_id, org feed events) → VideoMetadata
+export const videoMetadataFromServer = (v: any): VideoMetadata => ({
+  id: String(v.id),
+  videoName: v.videoName,
+  videoTags: v.videoTags,
+  videoLength: v.videoLength,
+  questionCards: v.questionCards,
+  savedAt: v.savedAt,
+  videoUrl: v.videoUrl,
+  organization_id: String(v.organization_id),
+  individual: v.individual,
+  thumbnail_url: v.thumbnail_url ?? null,
+  associated_meeting_id: String(v.associated_meeting_id ?? ""), // ✅ added
+});
+
 export const getVideoByIdFromBackend = async (
   videoId: string,
 ): Promise<VideoMetadata | null> => {
@@ -243,19 +258,7 @@ export const getVideoByIdFromBackend = async (
     const v = response.data.video;
     if (!v) return null;
 
-    const metadata: VideoMetadata = {
-      id: String(v.id),
-      videoName: v.videoName,
-      videoTags: v.videoTags,
-      videoLength: v.videoLength,
-      questionCards: v.questionCards,
-      savedAt: v.savedAt,
-      videoUrl: v.videoUrl,
-      organization_id: String(v.organization_id),
-      individual: v.individual,
-      thumbnail_url: v.thumbnail_url ?? null,
-      associated_meeting_id: String(v.associated_meeting_id ?? ""), // ✅ added
-    };
+    const metadata = videoMetadataFromServer(v);
 
     console.log("✅ Retrieved video metadata:", metadata);
     return metadata;
@@ -793,6 +796,7 @@ export const getMeetingState = async (orgId: number, roomName: string) => {
 export const storeQualtricSurveyAnswers = async (
   orgId: number,
   meetingName: string,
+  participantId: string,
   participantName: string,
   answers: Record<string, any>,
 ): Promise<{ ok: boolean; message: string }> => {
@@ -800,6 +804,7 @@ export const storeQualtricSurveyAnswers = async (
     const response = await axiosClient.post(
       `/api/auth/store_quatric_survey_answers/${encodeURIComponent(orgId)}/${encodeURIComponent(meetingName)}/`,
       {
+        participant_id: participantId,
         participant_name: participantName,
         answers,
       },
@@ -818,6 +823,7 @@ export const getAllQualtricSurveyAnswers = async (
 ): Promise<{
   ok: boolean;
   participants?: Array<{
+    participant_id: string;
     participant: string;
     count: number;
     answers: {
@@ -36,7 +36,7 @@ const SurveyDropZone: React.FC<SurveyDropZoneProps> = ({
     org_id: string;
     roomName: string;
   }>();
-  const { socket } = useOrgSocketContext();
+  const { subscribe, resyncVersion } = useOrgSocketContext();
   const currentMeetingIdRef = useRef<string | null>(null);
   // const { setDraggedItem } = useMouse();
 
@@ -100,7 +100,7 @@ const SurveyDropZone: React.FC<SurveyDropZoneProps> = ({
     };
 
     syncFromBackend();
-  }, [selectedIndex]);
+  }, [selectedIndex, resyncVersion]);
 
   // ===============================
   // 🧠 2. Load meeting ID (once)
@@ -186,10 +186,7 @@ const SurveyDropZone: React.FC<SurveyDropZoneProps> = ({
   // 🧠 4. Listen for WebSocket updates
   // ===============================
   useEffect(() => {
-    if (!socket) return;
-
-    const handleMessage = async (event: MessageEvent) => {
-      const msg = JSON.parse(event.data);
+    const handleMessage = async (msg: any) => {
       if (msg.type !== "org_update" || msg.category !== "survey") return;
 
       const { action, payload } = msg;
@@ -216,11 +213,9 @@ const SurveyDropZone: React.FC<SurveyDropZoneProps> = ({
             break;
 
           case "create": {
-            console.log(
-              `🆕 Fetching newly created Survey ${surveyId} from backend...`,
-            );
-
-            const s = await getSurveyById(surveyId);
+            const s = msg.data
+              ? new Survey(String(msg.data.id), msg.data.items ?? [], msg.data.meeting_id ?? null)
+              : await getSurveyById(surveyId);
             console.log("GOTTEN SURVEY IS", s);
             if (!s) {
               console.warn(`⚠️ No Survey found for ID ${surveyId}`);
@@ -267,9 +262,9 @@ const SurveyDropZone: React.FC<SurveyDropZoneProps> = ({
       }
     };
 
-    socket.addEventListener("message", handleMessage);
-    return () => socket.removeEventListener("message", handleMessage);
-  }, [socket, userChecked, orgChecked]);
+    const unsubscribe = subscribe(handleMessage);
+    return unsubscribe;
+  }, [subscribe, userChecked, orgChecked]);
 
   // ===============================
   // 📥 5. Handle survey file drop
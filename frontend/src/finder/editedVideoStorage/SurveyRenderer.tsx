@@ -32,7 +32,8 @@ const SurveyRenderer: React.FC<SurveyRendererProps> = ({ survey }) => {
   const handleSubmit = async () => {
     if (!org_id || !roomName) return;
 
-    if (!participantName) {
+    const participantId = localStorage.getItem("participant_id");
+    if (!participantName || !participantId) {
       alert("⚠️ You are not a registered participant. Please join the session before submitting.");
       return;
     }
@@ -40,6 +41,7 @@ const SurveyRenderer: React.FC<SurveyRendererProps> = ({ survey }) => {
     const result = await storeQualtricSurveyAnswers(
       parseInt(org_id),
       roomName,
+      participantId,
       participantName,
       answers
     );
@@ -6,7 +6,10 @@ import {
   saveVideoToIndexedDB,
   deleteVideoFromIndexedDB,
 } from "../../indexDB/videoStorage";
-import { getVideoByIdFromBackend } from "../../components/videoDisplayer/api/save";
+import {
+  getVideoByIdFromBackend,
+  videoMetadataFromServer,
+} from "../../components/videoDisplayer/api/save";
 import { useOrgSocketContext } from "../socket/OrgSocketContext";
 import {
   getOrgVideos,
@@ -29,7 +32,7 @@ const VideoTable: React.FC<VideoTableProps> = ({
 }) => {
   const containerRef = useRef<HTMLDivElement>(null);
   const [videos, setVideos] = useState<VideoMetadata[]>([]);
-  const { socket } = useOrgSocketContext(); // 👈 access org websocket
+  const { subscribe, resyncVersion } = useOrgSocketContext(); // 👈 access org websocket
   const { org_id, roomName } = useParams<{
     org_id: string;
     roomName: string;
@@ -93,7 +96,7 @@ const VideoTable: React.FC<VideoTableProps> = ({
     };
 
     loadInitialVideos();
-  }, [selectedIndex]);
+  }, [selectedIndex, resyncVersion]);
 
   // 🧩 Load from IndexedDB initially
   const loadFromIndexedDB = async () => {
@@ -174,10 +177,7 @@ const VideoTable: React.FC<VideoTableProps> = ({
 
   // 📡 Listen for org-level updates
   useEffect(() => {
-    if (!socket) return;
-
-    const handleMessage = async (event: MessageEvent) => {
-      const msg = JSON.parse(event.data);
+    const handleMessage = async (msg: any) => {
       if (msg.type !== "org_update" || msg.category !== "video") return;
 
       const { action, payload } = msg;
@@ -203,8 +203,10 @@ const VideoTable: React.FC<VideoTableProps> = ({
             break;
 
           case "create":
-            console.log(`🆕 Fetching new video ${videoId} from backend...`);
-            const newVideo = await getVideoByIdFromBackend(videoId);
+            // 📦 Events carry the serialized video; fetch only if they don't
+            const newVideo = msg.data
+              ? videoMetadataFromServer(msg.data)
+              : await getVideoByIdFromBackend(videoId);
             if (newVideo) {
               await saveVideoToIndexedDB(newVideo);
               console.log(`✅ Created video ${videoId} in IndexedDB.`);
@@ -216,8 +218,9 @@ const VideoTable: React.FC<VideoTableProps> = ({
             break;
 
           case "update":
-            console.log(`♻️ Updating video ${videoId} from backend...`);
-            const updatedVideo = await getVideoByIdFromBackend(videoId);
+            const updatedVideo = msg.data
+              ? videoMetadataFromServer(msg.data)
+              : await getVideoByIdFromBackend(videoId);
             if (updatedVideo) {
               await saveVideoToIndexedDB(updatedVideo);
               console.log(`✅ Updated video ${videoId} in IndexedDB.`);
@@ -246,13 +249,11 @@ const VideoTable: React.FC<VideoTableProps> = ({
     };
 
     // ✅ Attach listener
-    socket.addEventListener("message", handleMessage);
+    const unsubscribe = subscribe(handleMessage);
 
     // ✅ Cleanup on unmount to prevent multiple active handlers
-    return () => {
-      socket.removeEventListener("message", handleMessage);
-    };
-  }, [socket, userChecked, orgChecked]);
+    return unsubscribe;
+  }, [subscribe, userChecked, orgChecked]);
 
   return (
     <div ref={containerRef} className="video-table">
@@ -1,6 +1,7 @@
 // src/hooks/OrgSocketContext.tsx
 import React, { createContext, useContext } from "react";
 import { useOrgSocket } from "./useorgSocket";
+import type { OrgMessageHandler } from "./useorgSocket";
 
 interface OrgSocketProviderProps {
   orgId: string;
@@ -10,6 +11,9 @@ interface OrgSocketProviderProps {
 interface OrgSocketContextValue {
   socket: WebSocket | null;
   connected: boolean;
+  resyncVersion: number; // bumped when a reconnect missed events the feed no longer has
+  // Parsed frames from whichever socket is current (incl. replays right after a reconnect)
+  subscribe: (handler: OrgMessageHandler) => () => void;
 }
 
 const OrgSocketContext = createContext<OrgSocketContextValue | undefined>(
@@ -20,9 +24,9 @@ export const OrgSocketProvider: React.FC<OrgSocketProviderProps> = ({
   orgId,
   children,
 }) => {
-  const { socket, connected } = useOrgSocket(orgId);
+  const { socket, connected, resyncVersion, subscribe } = useOrgSocket(orgId);
   return (
-    <OrgSocketContext.Provider value={{ socket, connected }}>
+    <OrgSocketContext.Provider value={{ socket, connected, resyncVersion, subscribe }}>
       {children}
     </OrgSocketContext.Provider>
   );
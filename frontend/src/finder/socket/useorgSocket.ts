@@ -3,45 +3,140 @@ import { useEffect, useRef, useState, useCallback } from "react";
 
 export interface OrgUpdateMessage {
   type: "org_update";
+  seq: number | null; // position in the org feed (null from older servers)
   category: string; // e.g. "video", "survey", etc.
   action: string; // e.g. "create", "delete", "update"
-  payload: any; // e.g. { video_id: "123" }
+  payload: any; // e.g. { id: "123" }
+  data: any | null; // serialized object (as the org list endpoint returns it); null for deletes
 }
 
+// Sent after connect (and after replaying missed events on reconnect)
+export interface OrgFeedStateMessage {
+  type: "org_feed_state";
+  seq: number;
+  resync: boolean; // missed events could not be replayed → refetch lists
+}
+
+export type OrgMessageHandler = (msg: any) => void;
+
+const RECONNECT_BASE_MS = 1000;
+const RECONNECT_MAX_MS = 15000;
+
 export const useOrgSocket = (orgId: string) => {
   const socketRef = useRef<WebSocket | null>(null);
+  const lastSeqRef = useRef<number | null>(null);
+  // Subscribers outlive socket instances, so frames replayed right after a
+  // reconnect reach them; frames arriving with no subscriber wait in `pending`
+  const subscribersRef = useRef(new Set<OrgMessageHandler>());
+  const pendingRef = useRef<any[]>([]);
   const [connected, setConnected] = useState(false);
+  const [resyncVersion, setResyncVersion] = useState(0);
+
+  // Hand one frame to every subscriber, then record it as seen (?since= on the next reconnect)
+  const deliver = useCallback((msg: any) => {
+    subscribersRef.current.forEach((handler) => {
+      try {
+        handler(msg);
+      } catch (err) {
+        console.error("❌ Org WebSocket subscriber failed:", err);
+      }
+    });
+
+    if (msg.type === "org_update" && typeof msg.seq === "number") {
+      lastSeqRef.current = Math.max(lastSeqRef.current ?? 0, msg.seq);
+    } else if (msg.type === "org_feed_state" && msg.resync) {
+      if (msg.since !== null) {
+        console.warn(`⚠️ Org feed gap after seq ${msg.since}, refetching lists`);
+        setResyncVersion((v) => v + 1);
+      }
+      lastSeqRef.current = msg.seq; // the server's feed restarted or was trimmed: follow its head
+    } else if (msg.type === "org_feed_state") {
+      lastSeqRef.current = Math.max(lastSeqRef.current ?? 0, msg.seq);
+    }
+  }, []);
+
+  const flushPending = useCallback(() => {
+    while (pendingRef.current.length && subscribersRef.current.size) {
+      deliver(pendingRef.current.shift());
+    }
+  }, [deliver]);
+
+  const subscribe = useCallback(
+    (handler: OrgMessageHandler) => {
+      subscribersRef.current.add(handler);
+      // Next tick: every component mounting in this commit has subscribed by then
+      if (pendingRef.current.length) setTimeout(flushPending, 0);
+      return () => {
+        subscribersRef.current.delete(handler);
+      };
+    },
+    [flushPending],
+  );
 
   useEffect(() => {
     if (!orgId) return;
 
+    let closedByUs = false;
+    let attempts = 0;
+    let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+    lastSeqRef.current = null;
+    pendingRef.current = [];
+
     // Automatically pick ws:// or wss:// based on current protocol
     const wsProtocol = window.location.protocol === "https:" ? "wss" : "ws";
 
-    // Build socket URL relative to current host (Nginx proxy)
-    const socketUrl = `${wsProtocol}://${window.location.host}/ws/org/${orgId}/`;
-    const ws = new WebSocket(socketUrl);
+    const connect = () => {
+      // Build socket URL relative to current host (Nginx proxy);
+      // ?since= replays whatever we missed while disconnected
+      const since = lastSeqRef.current;
+      const query = since !== null ? `?since=${since}` : "";
+      const socketUrl = `${wsProtocol}://${window.location.host}/ws/org/${orgId}/${query}`;
+      const ws = new WebSocket(socketUrl);
 
-    socketRef.current = ws;
+      socketRef.current = ws;
 
-    ws.onopen = () => {
-      console.log(`✅ Org WebSocket connected to org ${orgId}`);
-      setConnected(true);
-    };
+      ws.onopen = () => {
+        console.log(`✅ Org WebSocket connected to org ${orgId} (since=${since})`);
+        attempts = 0;
+        setConnected(true);
+      };
 
-    ws.onclose = () => {
-      console.log(`🔌 Org WebSocket disconnected from org ${orgId}`);
-      setConnected(false);
-    };
+      ws.onmessage = (event: MessageEvent) => {
+        const msg = JSON.parse(event.data);
+        if (msg.type === "org_feed_state") msg.since = since; // which reconnect this answers
 
-    ws.onerror = (err) => {
-      console.error("❌ Org WebSocket error:", err);
+        // Keep order: nothing overtakes frames still waiting for a subscriber
+        if (pendingRef.current.length || !subscribersRef.current.size) {
+          pendingRef.current.push(msg);
+          flushPending();
+        } else {
+          deliver(msg);
+        }
+      };
+
+      ws.onclose = () => {
+        console.log(`🔌 Org WebSocket disconnected from org ${orgId}`);
+        setConnected(false);
+        if (closedByUs) return;
+
+        const delay = Math.min(RECONNECT_BASE_MS * 2 ** attempts, RECONNECT_MAX_MS);
+        attempts += 1;
+        reconnectTimer = setTimeout(connect, delay);
+      };
+
+      ws.onerror = (err) => {
+        console.error("❌ Org WebSocket error:", err);
+      };
     };
 
+    connect();
+
     return () => {
-      ws.close();
+      closedByUs = true;
+      if (reconnectTimer) clearTimeout(reconnectTimer);
+      socketRef.current?.close();
     };
-  }, [orgId]);
+  }, [orgId, deliver, flushPending]);
 
   const sendMessage = useCallback((msg: any) => {
     const ws = socketRef.current;
@@ -52,5 +147,5 @@ export const useOrgSocket = (orgId: string) => {
     }
   }, []);
 
-  return { socket: socketRef.current, connected, sendMessage };
+  return { socket: socketRef.current, connected, resyncVersion, subscribe, sendMessage };
 };
@@ -263,7 +263,7 @@ export const joinRoom = async (
     },
   );
 
-  return response.data; // { ok, message, participant_id, created }
+  return response.data; // { ok, message, participant_id, created, ticket, ticket_expires_at }
 };
 
 
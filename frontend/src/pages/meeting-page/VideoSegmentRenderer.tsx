@@ -20,6 +20,7 @@ import {
   getSurveyById,
 } from "../../components/videoDisplayer/api/save";
 import { useMainMeetingWebSocket } from "../../api/MainSocket";
+import { getJoinTicket } from "../../api/joinTicket";
 import { getMeetingState } from "../../components/videoDisplayer/api/save";
 import type { GetBotAnswersResponse } from "../../components/videoDisplayer/api/save";
 import { getBotAnswers } from "../../components/videoDisplayer/api/save";
@@ -46,7 +47,8 @@ const VideoSegmentRenderer: React.FC = () => {
   const { roomName, org_id } = useParams();
   const [adminAccess, setAdminAccess] = useState<boolean | null>(null);
   const [participantAccess, setParticipantAccess] = useState(
-    !!localStorage.getItem("participant_id") // ⭐ auto detect
+    // ⭐ auto detect: the meeting socket only lets participants in with an unexpired ticket
+    !!localStorage.getItem("participant_id") && !!getJoinTicket(org_id ?? "", roomName ?? "")
   );
   const [activeSurvey, setActiveSurvey] = useState<Survey | null>(null);
 
@@ -171,7 +173,7 @@ const VideoSegmentRenderer: React.FC = () => {
           } else {
             console.log("🟩 Meeting resumed — returning to video view");
             const pid = localStorage.getItem("participant_id");
-            if (!pid) {
+            if (!pid || !getJoinTicket(org_id!, roomName!)) {
               console.log("⚠️ No participant_id found — requiring rejoin.");
               setParticipantAccess(false);   // ⛔ Force join gate
             } else {
@@ -1,6 +1,7 @@
 import React, { useState, useRef, useEffect } from "react";
 import { useParams } from "react-router-dom";
 import { joinRoom } from "../../api/meetingApi";
+import { saveJoinTicket } from "../../../api/joinTicket";
 import { Box, TextField, Typography, Alert, Button, Paper } from "@mui/material";
 
 const NoAccessJoinGate: React.FC<{ orgId: number; onAccessGranted?: () => void }> = ({
@@ -75,12 +76,15 @@ const NoAccessJoinGate: React.FC<{ orgId: number; onAccessGranted?: () => void }
 
     try {
       // ⭐ Call updated backend joinRoom
-      await joinRoom(orgId, roomName, {
+      const joined = await joinRoom(orgId, roomName, {
         ownerEmail,
         name,
         participantId,
       });
 
+      // 🎟️ Ticket for the meeting websocket
+      saveJoinTicket(orgId, roomName, joined.ticket, joined.ticket_expires_at);
+
       // ⭐ Store locally for display
       localStorage.setItem("participantName", name);
 